@@ -1,271 +1,381 @@
-import argparse
-import copy
-import aStar
-import block as b
-import math
-import time
-
-
-# Function to setup/initialize the block world.
-# The initial and goal states will be read from a file passed into the script
-# ArgumentParser enforces that a value is passed in for each required parameter
-# NOTE: I am not explicitly validating that the files exist, downstream file
-#       operations will fail if they are not valid
-def setup(initial_state_data, goal_state_data):
-    parser = argparse.ArgumentParser(description='CS540: Programming Assignment #1 - Block world using A* search')
-    required_args = parser.add_argument_group('required named arguments')
-    required_args.add_argument('-i', '--initial_state', help='Initial state file name', required=True)
-    required_args.add_argument('-g', '--goal_state', help='Goal state file name', required=True)
-    args = parser.parse_args()
-
-    # Get initial and goal state data from files and store explicit information in corresponding variables.
-    # Next, post process the state and fill in all implied relationships.
-    b.get_state_from_file(args.initial_state, initial_state_data)
-    b.gen_relationships(initial_state_data)
-    b.get_state_from_file(args.goal_state, goal_state_data)
-    b.gen_relationships(goal_state_data)
-
-    # Make sure initial and goal state blocks have the same colors
-    for blk in initial_state:
-        if initial_state[blk].color is not None:
-            goal_state[blk].color = initial_state[blk].color
-        elif goal_state[blk].color is not None:
-            initial_state[blk].color = goal_state[blk].color
-
-
-# Function to determine if a given state is the goal state
-def block_world_goal_test(state, goal):
-    return state == goal
-
-
-
-# Function to determine all possible moves/commands for a given state.
-def block_world_actions(state):
-    step_cost = 1
-    actions = []
-
-    # stack command
-    # The preconditions are that either|neither block has a block on top of it
-    # Put id1 on top of id2 (command stack block-id1 block-id2).
-    # Put id1 on table (command stack block-id1 table).
-    for blk in list(state):
-        # 'stack' only possible for top block (i.e. below == None)
-        if state[blk].below is None:
-            # If this block has neighbors, use table to separate
-            if state[blk].height > 0 or len(state[blk].side_by_side) > 0:
-                actions.append(('(command stack {} table)'.format(blk), step_cost))
-
-            # Find all other blocks that this one can be stacked on
-            for inner_blk in list(state):
-                if blk == inner_blk:
-                    continue
-                if state[inner_blk].below is None:
-                    actions.append(('(command stack {} {})'.format(blk, inner_blk), step_cost))
-
-    # slide-to command
-    # Its preconditions are
-    # (1) that both blocks have height 0
-    # (2) the second block has fewer than four other blocks side-by-side with it.
-    for blk in list(state):
-        # Move next to another box
-        if state[blk].height == 0:
-            for inner_blk in list(state):
-                if blk == inner_blk:
-                    continue
-                if state[inner_blk].height == 0:
-                    if blk not in state[inner_blk].side_by_side:
-                        if len(state[inner_blk].side_by_side) < 4:
-                            actions.append(('(command slide-to {} {})'.format(blk, inner_blk), step_cost))
-
-    return actions
-
-
-# Function used to apply a command to a specific state.
-# The original state is copied and left unmodified.  A copy
-# of the modified state will be returned.
-def block_world_take_actions(state, command):
-    # command is a string of the form '(command action param1 param2)'
-    tmp_state = copy.deepcopy(state)
-    tmp_command = copy.copy(command[0])
-    tmp_command = tmp_command.replace('(', '')
-    tmp_command = tmp_command.replace(')', '')
-    sub_string = tmp_command.split()
-    cmd = sub_string[0].lower()
-    action = sub_string[1].lower()
-    source = sub_string[2].lower()
-    destination = sub_string[3].lower()
-
-    if cmd != 'command':
-        print("ERROR: block_world_take_actions - bad command({})".format(command))
-        return
-
-    if action == 'slide-to':
-        # The preconditions are
-        # (1) that both blocks have height 0 and
-        # (2) the second block has fewer than four other blocks side-by-side with it.
-        # The post-conditions are
-        # (1) the first block is side-by-side with the second block
-        # (2) the first block is no longer side by side with any block except the second.
-        if tmp_state[source].height == 0 and tmp_state[destination].height == 0 and \
-           len(tmp_state[destination].side_by_side) < 4:
-                # Add first block as neighbor of second block
-                tmp_state[destination].side_by_side.append(source)
-
-                # Remove SOURCE block from SOURCEs neighbors
-                for blk in tmp_state[source].side_by_side:
-                    tmp_state[blk].side_by_side.remove(source)
-
-                # Remove neighbors vertically
-                below_src = tmp_state[source].below
-                while below_src is not None:
-                    # Remove SOURCE block from SOURCEs neighbors
-                    for blk in tmp_state[below_src].side_by_side:
-                        tmp_state[blk].side_by_side.remove(below_src)
-                    tmp_state[below_src].side_by_side.clear()
-                    below_src = tmp_state[below_src].below
-
-                # First block is only side-by-side with second block
-                tmp_state[source].side_by_side.clear()
-                tmp_state[source].side_by_side.append(destination)
-
-                # vertical neighbors
-                below_src = tmp_state[source].below
-                below_dst = tmp_state[destination].below
-                while below_src is not None and below_dst is not None:
-                    tmp_state[below_src].side_by_side.append(below_dst)
-                    tmp_state[below_dst].side_by_side.append(below_src)
-                    below_src = tmp_state[below_src].below
-                    below_dst = tmp_state[below_dst].below
-
-    elif action == 'stack':
-        # The preconditions
-        # (1) neither block has any other block on top of it.
-        # The precondition
-        # (1) The first block is now on-top-of the second block
-        # (2) The first block is no longer on-top-of any other block
-        if destination == 'table':
-            # Can only move top block
-            if tmp_state[source].below is None:
-                # If on top of another block, update the lower block
-                if tmp_state[source].on_top_of is not None:
-                    lower_blk = tmp_state[source].on_top_of
-                    tmp_state[lower_blk].below = None
-
-                # If SOURCE block has neighbors, remove SOURCE from neighbors
-                for neighbor in tmp_state[source].side_by_side:
-                    tmp_state[neighbor].side_by_side.remove(source)
-
-                # SOURCE block is on table and has no neighbors
-                tmp_state[source].on_top_of = None
-                tmp_state[source].height = 0
-                tmp_state[source].side_by_side.clear()
-
-        # stack SOURCE block on top of DESTINATION block
-        else:
-            # Can only manipulate top blocks
-            if tmp_state[source].below is None and tmp_state[destination].below is None:
-                # If SOURCE block has neighbors, remove SOURCE from neighbors
-                for neighbor in tmp_state[source].side_by_side:
-                    tmp_state[neighbor].side_by_side.remove(source)
-
-                # Clear all neighbors from SOURCE
-                tmp_state[source].side_by_side.clear()
-
-                # If on top of another block, update the lower block
-                if tmp_state[source].on_top_of is not None:
-                    lower_blk = tmp_state[source].on_top_of
-                    tmp_state[lower_blk].below = None
-
-                # Apply changes for moving block to destination
-                tmp_state[source].on_top_of = destination
-                tmp_state[source].height = tmp_state[destination].height + 1
-                tmp_state[destination].below = source
-
-                # Neighbors of DESTINATION
-                for blk in tmp_state[destination].side_by_side:
-                    if tmp_state[blk].below is not None:
-                        upper_blk = tmp_state[blk].below
-                        if len(tmp_state[upper_blk].side_by_side) < 4:
-                            tmp_state[source].side_by_side.append(upper_blk)
-                            tmp_state[upper_blk].side_by_side.append(source)
-
-    return tmp_state, command[1]
-
-def block_world_heuristic(state, goal):
-    height_diff = 0
-    neighbor_diff = 0
-
-    # Same blocks must be in both input structures
-    for blk in state:
-        if state[blk].height != goal[blk].height:
-            height_diff += 1
-        elif goal[blk].height > 0 and state[blk].on_top_of != goal[blk].on_top_of:
-            height_diff += 1
-
-        if goal[blk].height == 0 and state[blk].side_by_side != goal[blk].side_by_side:
-            neighbor_diff += 1
-
-    #if neighbor_diff > 0:
-    #    neighbor_diff = math.ceil(neighbor_diff / 2.0)
-
-    return height_diff + neighbor_diff
-
-
-def block_world_heuristic_fast_and_sloppy(state, goal):
-    height_diff = 0
-    neighbor_diff = 0
-
-    # Same blocks must be in both input structures
-    for blk in state:
-        if state[blk].height != goal[blk].height:
-            height_diff += 1
-        elif goal[blk].height > 0 and state[blk].on_top_of != goal[blk].on_top_of:
-            height_diff += 1
-
-        if goal[blk].height == 0 and state[blk].side_by_side != goal[blk].side_by_side:
-        #if state[blk].side_by_side != goal[blk].side_by_side:
-            neighbor_diff += 1
-
-    #if neighbor_diff > 0:
-    #    neighbor_diff = math.ceil(neighbor_diff / 2.0)
-
-    neighbor_diff *= 2.5
-
-    return height_diff + neighbor_diff
-
-
-if __name__ == "__main__":
-    print_time = False
-
-    # Local variables to store state data
-    initial_state = {}
-    goal_state = {}
-
-    # Populate local variables
-    setup(initial_state, goal_state)
-
-    # Get current time before A*
-    start = time.time()
-
-    if (len(initial_state) < 13):
-        h = block_world_heuristic
-    else:
-        h = block_world_heuristic_fast_and_sloppy
-        h = block_world_heuristic
-
-    # Perform the A* search and store the results
-    path = aStar.a_star_search(initial_state, block_world_actions, block_world_take_actions,
-                               lambda s: block_world_goal_test(s, goal_state),
-                               lambda s: h(s, goal_state),
-                               return_path=False)
-
-    # Get current time after A* search
-    end = time.time()
-
-    # Print results
-    for result in path[0]:
-        if result is not None:
-            print(result[0])
-
-    if print_time:
-        print("Processing Time - {}".format(end - start))
+import argparse
+import copy
+import aStar
+import block as b
+import commands as c
+import cProfile
+import packed_state as ps
+import pattern_db as pdb
+import profiler
+import search
+import math
+import time
+
+
+# Function to setup/initialize the block world.
+# The initial and goal states will be read from a file passed into the script
+# ArgumentParser enforces that a value is passed in for each required parameter
+# NOTE: I am not explicitly validating that the files exist, downstream file
+#       operations will fail if they are not valid
+def setup(initial_state_data, goal_state_data):
+    parser = argparse.ArgumentParser(description='CS540: Programming Assignment #1 - Block world using A* search')
+    parser.add_argument('-t', '--transposition_size', type=int, default=0,
+                        help='Number of states remembered to prune repeated states (0 disables the table), '
+                             'only used by rbfs (-a rbfs)')
+    parser.add_argument('-a', '--algorithm', choices=['auto'] + sorted(search.ALGORITHMS), default='auto',
+                        help='Search algorithm, auto selects the algorithm based on the number of blocks')
+    parser.add_argument('-w', '--weight', type=float, default=search.DEFAULT_WEIGHT,
+                        help='Heuristic weight used by weighted A* (wastar)')
+    parser.add_argument('-b', '--beam_width', type=int, default=search.DEFAULT_BEAM_WIDTH,
+                        help='Number of nodes kept at each level by beam search (beam)')
+    parser.add_argument('-e', '--heuristic', choices=['default', 'sloppy', 'pdb'], default='default',
+                        help='Heuristic, pdb is the admissible pattern database heuristic')
+    parser.add_argument('-k', '--group_size', type=int, default=pdb.DEFAULT_GROUP_SIZE,
+                        help='Number of blocks in each pattern database group (pdb)')
+    parser.add_argument('-c', '--heuristic_cache', type=int, default=0,
+                        help='Number of heuristic values cached during the search (0 disables the cache)')
+    parser.add_argument('-s', '--stats', action='store_true',
+                        help='Print the number of expanded nodes and the processing time (used by bench/bench.py)')
+    parser.add_argument('-p', '--profile', metavar='JSON_FILE',
+                        help='Time and count the search callbacks and nodes, and write the report to a JSON file')
+    parser.add_argument('--pstats', metavar='PSTATS_FILE',
+                        help='Run the search under cProfile and write the statistics to a .pstats file')
+    required_args = parser.add_argument_group('required named arguments')
+    required_args.add_argument('-i', '--initial_state', help='Initial state file name', required=True)
+    required_args.add_argument('-g', '--goal_state', help='Goal state file name', required=True)
+    args = parser.parse_args()
+
+    # The transposition table is part of the RBFS search (see aStar.py), the other algorithms keep their own
+    # closed sets, so the option would be silently ignored
+    if args.transposition_size != 0 and args.algorithm != 'rbfs':
+        print("ERROR - transposition_size({}) is only used by the rbfs algorithm (-a rbfs), not by algorithm({})"
+              .format(args.transposition_size, args.algorithm))
+        exit(1)
+
+    load_states(args.initial_state, args.goal_state, initial_state_data, goal_state_data)
+    return args
+
+
+# Function to read the initial and goal states from files.
+# Get initial and goal state data from files and store explicit information in corresponding variables.
+# Next, post process the state and fill in all implied relationships.
+def load_states(initial_file, goal_file, initial_state_data, goal_state_data):
+    b.get_state_from_file(initial_file, initial_state_data)
+    b.gen_relationships(initial_state_data)
+    b.get_state_from_file(goal_file, goal_state_data)
+    b.gen_relationships(goal_state_data)
+
+    # Make sure initial and goal state blocks have the same colors
+    for blk in initial_state_data:
+        if initial_state_data[blk].color is not None:
+            goal_state_data[blk].color = initial_state_data[blk].color
+        elif goal_state_data[blk].color is not None:
+            initial_state_data[blk].color = goal_state_data[blk].color
+
+
+# Function to select the search algorithm for a problem
+# Small problems are solved optimally with A*.  The state space of larger problems is
+# too big to close, so weighted A* is used to find a (bounded suboptimal) solution quickly.
+# The threshold was measured on random problems (goals are random walks of 5 commands per block,
+# 20 second limit): A* solved every problem of up to 13 blocks in under 0.5 seconds, with 14 blocks
+# it did not finish 2 of 4 problems and with 16 blocks one took 15.5 seconds.  Weighted A* solved
+# all of them in under 3 seconds.
+# NOTE: The goals of initial1/goal1 and initial3/goal3 can not be reached (see
+#       packed_state.find_unreachable_goal), no algorithm solves them and they are reported without searching.
+def select_algorithm(num_blocks):
+    if num_blocks < 13:
+        return 'astar'
+    else:
+        return 'wastar'
+
+
+# Function to determine if a given state is the goal state
+def block_world_goal_test(state, goal):
+    return state == goal
+
+
+
+# Function to determine all possible moves/commands for a given state.
+def block_world_actions(state):
+    step_cost = 1
+    actions = []
+
+    # stack command
+    # The preconditions are that either|neither block has a block on top of it
+    # Put id1 on top of id2 (command stack block-id1 block-id2).
+    # Put id1 on table (command stack block-id1 table).
+    for blk in list(state):
+        # 'stack' only possible for top block (i.e. below == None)
+        if state[blk].below is None:
+            # If this block has neighbors, use table to separate
+            if state[blk].height > 0 or len(state[blk].side_by_side) > 0:
+                actions.append((c.Stack(blk, 'table'), step_cost))
+
+            # Find all other blocks that this one can be stacked on
+            for inner_blk in list(state):
+                if blk == inner_blk:
+                    continue
+                if state[inner_blk].below is None:
+                    actions.append((c.Stack(blk, inner_blk), step_cost))
+
+    # slide-to command
+    # Its preconditions are
+    # (1) that both blocks have height 0
+    # (2) the second block has fewer than four other blocks side-by-side with it.
+    for blk in list(state):
+        # Move next to another box
+        if state[blk].height == 0:
+            for inner_blk in list(state):
+                if blk == inner_blk:
+                    continue
+                if state[inner_blk].height == 0:
+                    if blk not in state[inner_blk].side_by_side:
+                        if len(state[inner_blk].side_by_side) < 4:
+                            actions.append((c.SlideTo(blk, inner_blk), step_cost))
+
+    return actions
+
+
+# Function used to apply a command to a specific state.
+# The original state is copied and left unmodified.  A copy
+# of the modified state will be returned.
+def block_world_take_actions(state, command):
+    # command is a (commands.Stack|commands.SlideTo, cost) pair
+    tmp_state = copy.deepcopy(state)
+    action = command[0].name
+    source = command[0].source
+    destination = command[0].destination
+
+    if action == 'slide-to':
+        # The preconditions are
+        # (1) that both blocks have height 0 and
+        # (2) the second block has fewer than four other blocks side-by-side with it.
+        # The post-conditions are
+        # (1) the first block is side-by-side with the second block
+        # (2) the first block is no longer side by side with any block except the second.
+        if tmp_state[source].height == 0 and tmp_state[destination].height == 0 and \
+           len(tmp_state[destination].side_by_side) < 4:
+                # Add first block as neighbor of second block
+                tmp_state[destination].side_by_side.append(source)
+
+                # Remove SOURCE block from SOURCEs neighbors
+                for blk in tmp_state[source].side_by_side:
+                    tmp_state[blk].side_by_side.remove(source)
+
+                # Remove neighbors vertically
+                below_src = tmp_state[source].below
+                while below_src is not None:
+                    # Remove SOURCE block from SOURCEs neighbors
+                    for blk in tmp_state[below_src].side_by_side:
+                        tmp_state[blk].side_by_side.remove(below_src)
+                    tmp_state[below_src].side_by_side.clear()
+                    below_src = tmp_state[below_src].below
+
+                # First block is only side-by-side with second block
+                tmp_state[source].side_by_side.clear()
+                tmp_state[source].side_by_side.append(destination)
+
+                # vertical neighbors
+                below_src = tmp_state[source].below
+                below_dst = tmp_state[destination].below
+                while below_src is not None and below_dst is not None:
+                    tmp_state[below_src].side_by_side.append(below_dst)
+                    tmp_state[below_dst].side_by_side.append(below_src)
+                    below_src = tmp_state[below_src].below
+                    below_dst = tmp_state[below_dst].below
+
+    elif action == 'stack':
+        # The preconditions
+        # (1) neither block has any other block on top of it.
+        # The precondition
+        # (1) The first block is now on-top-of the second block
+        # (2) The first block is no longer on-top-of any other block
+        if destination == 'table':
+            # Can only move top block
+            if tmp_state[source].below is None:
+                # If on top of another block, update the lower block
+                if tmp_state[source].on_top_of is not None:
+                    lower_blk = tmp_state[source].on_top_of
+                    tmp_state[lower_blk].below = None
+
+                # If SOURCE block has neighbors, remove SOURCE from neighbors
+                for neighbor in tmp_state[source].side_by_side:
+                    tmp_state[neighbor].side_by_side.remove(source)
+
+                # SOURCE block is on table and has no neighbors
+                tmp_state[source].on_top_of = None
+                tmp_state[source].height = 0
+                tmp_state[source].side_by_side.clear()
+
+        # stack SOURCE block on top of DESTINATION block
+        else:
+            # Can only manipulate top blocks
+            if tmp_state[source].below is None and tmp_state[destination].below is None:
+                # If SOURCE block has neighbors, remove SOURCE from neighbors
+                for neighbor in tmp_state[source].side_by_side:
+                    tmp_state[neighbor].side_by_side.remove(source)
+
+                # Clear all neighbors from SOURCE
+                tmp_state[source].side_by_side.clear()
+
+                # If on top of another block, update the lower block
+                if tmp_state[source].on_top_of is not None:
+                    lower_blk = tmp_state[source].on_top_of
+                    tmp_state[lower_blk].below = None
+
+                # Apply changes for moving block to destination
+                tmp_state[source].on_top_of = destination
+                tmp_state[source].height = tmp_state[destination].height + 1
+                tmp_state[destination].below = source
+
+                # Neighbors of DESTINATION
+                for blk in tmp_state[destination].side_by_side:
+                    if tmp_state[blk].below is not None:
+                        upper_blk = tmp_state[blk].below
+                        if len(tmp_state[upper_blk].side_by_side) < 4:
+                            tmp_state[source].side_by_side.append(upper_blk)
+                            tmp_state[upper_blk].side_by_side.append(source)
+
+    return tmp_state, command[1]
+
+def block_world_heuristic(state, goal):
+    height_diff = 0
+    neighbor_diff = 0
+
+    # Same blocks must be in both input structures
+    for blk in state:
+        if state[blk].height != goal[blk].height:
+            height_diff += 1
+        elif goal[blk].height > 0 and state[blk].on_top_of != goal[blk].on_top_of:
+            height_diff += 1
+
+        if goal[blk].height == 0 and state[blk].side_by_side != goal[blk].side_by_side:
+            neighbor_diff += 1
+
+    #if neighbor_diff > 0:
+    #    neighbor_diff = math.ceil(neighbor_diff / 2.0)
+
+    return height_diff + neighbor_diff
+
+
+def block_world_heuristic_fast_and_sloppy(state, goal):
+    height_diff = 0
+    neighbor_diff = 0
+
+    # Same blocks must be in both input structures
+    for blk in state:
+        if state[blk].height != goal[blk].height:
+            height_diff += 1
+        elif goal[blk].height > 0 and state[blk].on_top_of != goal[blk].on_top_of:
+            height_diff += 1
+
+        if goal[blk].height == 0 and state[blk].side_by_side != goal[blk].side_by_side:
+        #if state[blk].side_by_side != goal[blk].side_by_side:
+            neighbor_diff += 1
+
+    #if neighbor_diff > 0:
+    #    neighbor_diff = math.ceil(neighbor_diff / 2.0)
+
+    neighbor_diff *= 2.5
+
+    return height_diff + neighbor_diff
+
+
+if __name__ == "__main__":
+    print_time = False
+
+    # Local variables to store state data
+    initial_state = {}
+    goal_state = {}
+
+    # Populate local variables
+    args = setup(initial_state, goal_state)
+
+    # Convert the block dictionaries into immutable packed states.
+    # The search never deep copies the packed states, children share the static block data.
+    block_index = ps.from_block_dict(initial_state).block_index
+    initial_packed = ps.from_block_dict(initial_state, block_index)
+    goal_packed = ps.from_block_dict(goal_state, block_index)
+
+    # Get current time before A*
+    start = time.time()
+
+    # The pattern database is built once per goal (or loaded from its cache) before the search
+    if args.heuristic == 'pdb':
+        heuristic = pdb.PatternDatabase(goal_packed, args.group_size)
+    elif args.heuristic == 'sloppy':
+        heuristic = lambda s: ps.block_world_heuristic_fast_and_sloppy(s, goal_packed)
+    else:
+        heuristic = lambda s: ps.block_world_heuristic(s, goal_packed)
+    if args.heuristic_cache > 0:
+        heuristic = aStar.HeuristicCache(heuristic, args.heuristic_cache)
+
+    algorithm = args.algorithm
+    if algorithm == 'auto':
+        algorithm = select_algorithm(len(initial_state))
+
+    options = {'transposition_size': args.transposition_size}
+
+    # Every call to the actions function is one node expansion
+    actions = ps.block_world_actions
+    take_actions = ps.block_world_take_actions
+    goal_test = lambda s: ps.block_world_goal_test(s, goal_packed)
+    if args.stats:
+        print_time = True
+        actions = counter = search.ActionsCounter(actions)
+
+    # The profile times every callback, the A* engines (rbfs) also record the depth of the expanded nodes
+    profile = None
+    if args.profile:
+        profile = profiler.SearchProfile()
+        actions, take_actions, goal_test, heuristic = profile.wrap_callbacks(actions, take_actions, goal_test,
+                                                                             heuristic)
+        if algorithm == 'rbfs':
+            options['profile'] = profile
+
+    code_profile = None
+    if args.pstats:
+        code_profile = cProfile.Profile()
+        code_profile.enable()
+
+    # Perform the search and store the results.
+    # A goal that can not be reached is reported without searching, the search would only fail
+    # after visiting every reachable state.
+    unreachable = ps.find_unreachable_goal(initial_packed, goal_packed)
+    if unreachable is not None:
+        print("Goal can not be reached - {}".format(unreachable))
+        path = ("failure", float('inf'))
+    else:
+        path = search.search(initial_packed, actions, take_actions,
+                             goal_test,
+                             heuristic,
+                             algorithm=algorithm,
+                             return_path=False,
+                             weight=args.weight,
+                             beam_width=args.beam_width,
+                             **options)
+
+    # Get current time after A* search
+    end = time.time()
+
+    if code_profile is not None:
+        code_profile.disable()
+        code_profile.dump_stats(args.pstats)
+
+    # Print results
+    if path[0] == "failure":
+        print("No solution found")
+        path = [[], path[1]]
+
+    for result in path[0]:
+        if result is not None:
+            print(c.format_command(result[0]))
+
+    if profile is not None:
+        profile.solution_depth = sum(1 for result in path[0] if result is not None)
+        profile.write_json(args.profile, end - start)
+
+    if args.stats:
+        print("Nodes Expanded - {}".format(counter.expanded))
+    if print_time:
+        print("Processing Time - {}".format(end - start))
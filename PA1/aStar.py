@@ -1,85 +1,331 @@
-# A structure used to store A* search data
-class Node:
-    # Function used to initialize object
-    def __init__(self, state, action=None, f=0, g=0, h=0):
-        self.state = state      # A specific state in the search space
-        self.action = action    # An action used to get to this state
-        self.g = g              # Cost to get to current state
-        self.h = h              # Heuristic value, estimated cost to goal
-        self.f = f              # Estimated total path cost (f = g + h)
-
-    # Function to display the contents of the structure when printed
-    def __repr__(self):
-        return "Node[" + \
-                "\n\tState " + repr(self.state) + \
-                "\n\tAction(" + repr(self.action) + ")" + \
-                "\n\tg(" + repr(self.g) + ")" + \
-                "\n\th(" + repr(self.h) + ")" + \
-                "\n\tf(" + repr(self.f) + ")]"
-
-
-# Defines a function to recursively process a parent node
-def a_star_recursive(parent_node, actions_func, take_action_func, goal_test_func, heuristic_func, return_path, f_max):
-    # Check for goal state
-    if goal_test_func(parent_node.state):
-        if return_path:
-            return [parent_node.state], parent_node.g
-        else:
-            return [parent_node.action], parent_node.g
-
-    # Get all actions for the current state
-    actions = actions_func(parent_node.state)
-
-    # Return if there are no actions for the current state
-    if not actions:
-        return "failure", float('inf')
-
-    # For each action, apply to current state, determine new path info and store
-    children = []
-    for action in actions:
-        (child_state, step_cost) = take_action_func(parent_node.state, action)
-        g = parent_node.g + step_cost
-        h = heuristic_func(child_state)
-        f = max(h+g, parent_node.f)
-        #f = h + g
-        child_node = Node(state=child_state, action=action, f=f, g=g, h=h)
-        children.append(child_node)
-
-    # Process each child state discovered from previous step
-    while True:
-        # Sort 'children' in ascending order of estimated total path cost (f)
-        children.sort(key=lambda n: n.f)
-
-        # Get best child from sorted list
-        best_child = children[0]
-        if best_child.f > f_max:
-            return "failure", best_child.f
-
-        # Get next best child from sorted list
-        # Use 'inf' if there is not a next best child
-        next_best_child = children[1].f if len(children) > 1 else float('inf')
-
-        # Process the best child and update its estimated total path cost (f) with the result
-        result, best_child.f = a_star_recursive(best_child, actions_func, take_action_func, goal_test_func,
-                                                heuristic_func, return_path, min(f_max, next_best_child))
-        if result is not "failure":
-            # The return value behavior determined by input parameter
-            if return_path:
-                result.insert(0, parent_node.state)
-            else:
-                result.insert(0, parent_node.action)
-            return result, best_child.f
-
-
-# This is the entry point for the A* search.  It bundles the input data in the format
-# expected by the recursive a* search function
-def a_star_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func, return_path=True):
-    h = heuristic_func(start_state)
-    start_node = Node(state=start_state, action=None, f=0+h, g=0, h=h)
-    return a_star_recursive(start_node,
-                            actions_func,
-                            take_action_func,
-                            goal_test_func,
-                            heuristic_func,
-                            return_path,
-                            float('inf'))
+import heapq
+from collections import OrderedDict
+
+
+# A structure used to store A* search data
+class Node:
+    # Function used to initialize object
+    def __init__(self, state, action=None, f=0, g=0, h=0):
+        self.state = state      # A specific state in the search space
+        self.action = action    # An action used to get to this state
+        self.g = g              # Cost to get to current state
+        self.h = h              # Heuristic value, estimated cost to goal
+        self.f = f              # Estimated total path cost (f = g + h)
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "Node[" + \
+                "\n\tState " + repr(self.state) + \
+                "\n\tAction(" + repr(self.action) + ")" + \
+                "\n\tg(" + repr(self.g) + ")" + \
+                "\n\th(" + repr(self.h) + ")" + \
+                "\n\tf(" + repr(self.f) + ")]"
+
+
+# A bounded transposition table used to detect states that are reached more than once.
+# For each state it stores the best cost found so far to reach the state (g) and the
+# backed-up estimate of the total path cost through the state (f).
+# When the table is full, the least recently used state is evicted.
+# NOTE: states are used as dictionary keys, they must be hashable (e.g. packed_state.PackedState)
+class TranspositionTable:
+    # Function used to initialize object
+    def __init__(self, max_size):
+        self.max_size = max_size        # Maximum number of states stored in the table
+        self.entries = OrderedDict()    # state -> [g, f]
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Function to get the [g, f] entry for a state, None if the state is not in the table
+    def lookup(self, state):
+        entry = self.entries.get(state)
+        if entry is not None:
+            self.entries.move_to_end(state)
+        return entry
+
+    # Function to store the cost and estimate for a state.
+    # An entry reached with a higher cost never replaces an entry reached with a lower cost.
+    def store(self, state, g, f):
+        entry = self.entries.get(state)
+        if entry is None:
+            self.entries[state] = [g, f]
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(state)
+            if g < entry[0]:
+                entry[0] = g
+                entry[1] = f
+            elif g == entry[0]:
+                entry[1] = max(entry[1], f)
+
+
+# Defines a bounded cache of heuristic values that wraps a heuristic callable.
+# RBFS regenerates the same states many times when it re-expands a subtree, the cache returns
+# the stored estimate instead of calling the heuristic again.  When the cache is full the least
+# recently used entry is removed.  Pass the cache as the heuristic of a_star_search.
+class HeuristicCache:
+    # Function used to initialize object
+    def __init__(self, heuristic_func, max_size, key_func=None):
+        self.heuristic_func = heuristic_func    # Heuristic being cached
+        self.max_size = max_size                # Maximum number of states stored in the cache
+        self.key_func = key_func                # state -> hashable key, the state itself is used if None
+        self.entries = OrderedDict()            # key -> heuristic value
+        self.hits = 0                           # Number of calls answered from the cache
+        self.misses = 0                         # Number of calls to the heuristic
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "HeuristicCache[" + \
+               "\n\tsize(" + repr(len(self.entries)) + ")" + \
+               "\n\thits(" + repr(self.hits) + ")" + \
+               "\n\tmisses(" + repr(self.misses) + ")]"
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Function to get the heuristic value of a state
+    def __call__(self, state):
+        key = state if self.key_func is None else self.key_func(state)
+        value = self.entries.get(key)
+        if value is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self.heuristic_func(state)
+        self.entries[key] = value
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return value
+
+    # Function to get the fraction of calls answered from the cache
+    def hit_rate(self):
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+# Defines a function to generate the child nodes of a parent node
+# Returns None if there are no actions for the parent state.
+# If 'table' is provided, children that were already reached with a lower cost are pruned
+# and children reached with the same cost start with their previously backed-up estimate.
+def generate_children(parent_node, actions_func, take_action_func, heuristic_func, table=None):
+    # Get all actions for the current state
+    actions = actions_func(parent_node.state)
+
+    # Return if there are no actions for the current state
+    if not actions:
+        return None
+
+    # For each action, apply to current state, determine new path info and store
+    children = []
+    for action in actions:
+        (child_state, step_cost) = take_action_func(parent_node.state, action)
+        g = parent_node.g + step_cost
+
+        # Skip states that have already been reached with a lower cost
+        entry = None
+        if table is not None:
+            entry = table.lookup(child_state)
+            if entry is not None and entry[0] < g:
+                continue
+
+        h = heuristic_func(child_state)
+        f = max(h+g, parent_node.f)
+        #f = h + g
+
+        # Same state reached with the same cost, reuse the backed-up estimate
+        if entry is not None and entry[0] == g:
+            f = max(f, entry[1])
+        if table is not None:
+            table.store(child_state, g, f)
+
+        child_node = Node(state=child_state, action=action, f=f, g=g, h=h)
+        children.append(child_node)
+
+    return children
+
+
+# Defines a function to recursively process a parent node
+# profile: profiler.SearchProfile that records the depth of the expanded nodes, depth is the depth of parent_node
+def a_star_recursive(parent_node, actions_func, take_action_func, goal_test_func, heuristic_func, return_path, f_max,
+                     table=None, profile=None, depth=0):
+    # Check for goal state
+    if goal_test_func(parent_node.state):
+        if return_path:
+            return [parent_node.state], parent_node.g
+        else:
+            return [parent_node.action], parent_node.g
+
+    # Get the children of the current state
+    if profile is not None:
+        profile.record_depth(depth)
+    children = generate_children(parent_node, actions_func, take_action_func, heuristic_func, table)
+
+    # Return if there are no actions for the current state, or every child was pruned by the transposition table
+    if not children:
+        return "failure", float('inf')
+
+    # Process each child state discovered from previous step
+    while True:
+        # Sort 'children' in ascending order of estimated total path cost (f)
+        children.sort(key=lambda n: n.f)
+
+        # Get best child from sorted list
+        best_child = children[0]
+        if best_child.f > f_max:
+            return "failure", best_child.f
+
+        # Get next best child from sorted list
+        # Use 'inf' if there is not a next best child
+        next_best_child = children[1].f if len(children) > 1 else float('inf')
+
+        # Process the best child and update its estimated total path cost (f) with the result
+        result, best_child.f = a_star_recursive(best_child, actions_func, take_action_func, goal_test_func,
+                                                heuristic_func, return_path, min(f_max, next_best_child),
+                                                table, profile, depth + 1)
+        if table is not None:
+            table.store(best_child.state, best_child.g, best_child.f)
+        if result != "failure":
+            # The return value behavior determined by input parameter
+            if return_path:
+                result.insert(0, parent_node.state)
+            else:
+                result.insert(0, parent_node.action)
+            return result, best_child.f
+
+
+# A structure used to store one level of the iterative RBFS search.
+# This replaces a call frame of a_star_recursive.
+class Frame:
+    __slots__ = ('node', 'f_max', 'children', 'current', 'first')
+
+    # Function used to initialize object
+    def __init__(self, node, f_max, children):
+        self.node = node            # The expanded node
+        self.f_max = f_max          # Cost limit for this level
+        self.children = children    # Heap of (f, sequence number, child node)
+        self.current = None         # Child node currently being processed
+        self.first = 0              # Lowest sequence number in the heap
+
+
+# Defines a function to process the start node with an explicit stack instead of recursion.
+# This performs the same RBFS search as a_star_recursive, and returns the same results, but
+# is not limited by the interpreter recursion limit.  Each level keeps its children in a heap
+# so only the updated child is re-ordered after it is processed.
+# The heap is ordered by (f, sequence number) in the same order as the stable sort of a_star_recursive:
+# the children start with their index in the list, and a processed child is pushed back with a number
+# below every other child, so it stays ahead of the children it ties with.
+# profile: profiler.SearchProfile that records the depth of the expanded nodes (the number of levels on the stack)
+def a_star_iterative(start_node, actions_func, take_action_func, goal_test_func, heuristic_func, return_path,
+                     table=None, profile=None):
+    stack = []
+    node = start_node
+    f_max = float('inf')
+
+    while True:
+        # Process 'node'.  'result' is None while the node still has children to explore
+        result = None
+        if goal_test_func(node.state):
+            result = [node.state] if return_path else [node.action]
+            value = node.g
+        else:
+            if profile is not None:
+                profile.record_depth(len(stack))
+            children = generate_children(node, actions_func, take_action_func, heuristic_func, table)
+            if not children:
+                result = "failure"
+                value = float('inf')
+            else:
+                heap = [(child.f, i, child) for i, child in enumerate(children)]
+                heapq.heapify(heap)
+                stack.append(Frame(node, f_max, heap))
+
+        # Pass results up the stack until a level selects the next child to process
+        while True:
+            if result is None:
+                frame = stack[-1]
+
+                # Get best child from the heap
+                best_child = frame.children[0][2]
+                if best_child.f > frame.f_max:
+                    stack.pop()
+                    result = "failure"
+                    value = best_child.f
+                    continue
+
+                # Get next best child from the heap
+                # Use 'inf' if there is not a next best child
+                best_child = heapq.heappop(frame.children)[2]
+                next_best_child = frame.children[0][0] if frame.children else float('inf')
+
+                # Process the best child
+                frame.current = best_child
+                node = best_child
+                f_max = min(frame.f_max, next_best_child)
+                break
+
+            # The start node has been processed
+            if not stack:
+                if result != "failure":
+                    # Path was collected from the goal back to the start
+                    result.reverse()
+                return result, value
+
+            # Update the estimated total path cost (f) of the processed child with the result
+            frame = stack[-1]
+            best_child = frame.current
+            best_child.f = value
+            if table is not None:
+                table.store(best_child.state, best_child.g, best_child.f)
+
+            if result != "failure":
+                # The return value behavior determined by input parameter
+                if return_path:
+                    result.append(frame.node.state)
+                else:
+                    result.append(frame.node.action)
+                stack.pop()
+                continue
+
+            frame.first -= 1
+            heapq.heappush(frame.children, (best_child.f, frame.first, best_child))
+            result = None
+
+
+# This is the entry point for the A* search.  It bundles the input data in the format
+# expected by the a* search functions
+# transposition_size: Maximum number of states remembered to prune repeated states, 0 to disable.
+#                     States must be hashable to use the transposition table.
+# recursive: Use the recursive search instead of the iterative (explicit stack) search
+# profile: profiler.SearchProfile that records the depth of the expanded nodes, None to disable
+def a_star_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func, return_path=True,
+                  transposition_size=0, recursive=False, profile=None):
+    h = heuristic_func(start_state)
+    start_node = Node(state=start_state, action=None, f=0+h, g=0, h=h)
+
+    table = None
+    if transposition_size > 0:
+        table = TranspositionTable(transposition_size)
+        table.store(start_state, start_node.g, start_node.f)
+
+    if recursive:
+        return a_star_recursive(start_node,
+                                actions_func,
+                                take_action_func,
+                                goal_test_func,
+                                heuristic_func,
+                                return_path,
+                                float('inf'),
+                                table,
+                                profile)
+
+    return a_star_iterative(start_node,
+                            actions_func,
+                            take_action_func,
+                            goal_test_func,
+                            heuristic_func,
+                            return_path,
+                            table,
+                            profile)
@@ -0,0 +1,193 @@
+import argparse
+import time
+import aStar
+import commands as c
+import PA1
+import packed_state as ps
+import pattern_db as pdb
+
+
+# Default problems used by the benchmark (initial state file, goal state file)
+DEFAULT_PROBLEMS = [('initial1.txt', 'goal1.txt'),
+                    ('initial2.txt', 'goal2.txt'),
+                    ('initial3.txt', 'goal3.txt')]
+
+
+# Exception raised to stop a search once the benchmark time limit is reached
+class BudgetExhausted(Exception):
+    pass
+
+
+# Defines a wrapper around an 'actions' callback that counts expanded nodes.
+# Every call to the actions callback is one node expansion.
+class ExpansionCounter:
+    # Function used to initialize object
+    def __init__(self, actions_func, time_limit):
+        self.actions_func = actions_func
+        self.time_limit = time_limit
+        self.expanded = 0
+        self.start_time = None
+
+    def __call__(self, state):
+        if time.time() - self.start_time > self.time_limit:
+            raise BudgetExhausted()
+        self.expanded += 1
+        return self.actions_func(state)
+
+
+# Function to run one search and return (nodes expanded, elapsed seconds, solved)
+def run_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func, time_limit,
+               transposition_size=0):
+    counter = ExpansionCounter(actions_func, time_limit)
+    solved = True
+    counter.start_time = time.time()
+    try:
+        aStar.a_star_search(start_state, counter, take_action_func, goal_test_func, heuristic_func,
+                            return_path=False, transposition_size=transposition_size)
+    except BudgetExhausted:
+        solved = False
+    return counter.expanded, time.time() - counter.start_time, solved
+
+
+# Function to benchmark the dictionary (deepcopy) states against the packed states for a single problem
+def benchmark_problem(initial_file, goal_file, time_limit, transposition_size=100000):
+    initial_state = {}
+    goal_state = {}
+    PA1.load_states(initial_file, goal_file, initial_state, goal_state)
+
+    results = []
+
+    # Before - dictionary of block.Block objects, deep copied for every child
+    results.append(('dict',) + run_search(initial_state,
+                                          PA1.block_world_actions,
+                                          PA1.block_world_take_actions,
+                                          lambda s: PA1.block_world_goal_test(s, goal_state),
+                                          lambda s: PA1.block_world_heuristic(s, goal_state),
+                                          time_limit))
+
+    # After - immutable packed states
+    block_index = ps.from_block_dict(initial_state).block_index
+    initial_packed = ps.from_block_dict(initial_state, block_index)
+    goal_packed = ps.from_block_dict(goal_state, block_index)
+    results.append(('packed',) + run_search(initial_packed,
+                                            ps.block_world_actions,
+                                            ps.block_world_take_actions,
+                                            lambda s: ps.block_world_goal_test(s, goal_packed),
+                                            lambda s: ps.block_world_heuristic(s, goal_packed),
+                                            time_limit))
+
+    # Packed states with a transposition table to prune repeated states
+    results.append(('packed+tt',) + run_search(initial_packed,
+                                               ps.block_world_actions,
+                                               ps.block_world_take_actions,
+                                               lambda s: ps.block_world_goal_test(s, goal_packed),
+                                               lambda s: ps.block_world_heuristic(s, goal_packed),
+                                               time_limit,
+                                               transposition_size))
+
+    # Packed states with the admissible pattern database heuristic
+    results.append(('packed+pdb',) + run_search(initial_packed,
+                                                ps.block_world_actions,
+                                                ps.block_world_take_actions,
+                                                lambda s: ps.block_world_goal_test(s, goal_packed),
+                                                pdb.PatternDatabase(goal_packed),
+                                                time_limit))
+    return results
+
+
+# Function to check that the recursive and the iterative RBFS engines return exactly the same
+# commands and cost for a problem (packed states, with and without the transposition table).
+# Returns 'match', 'DIFF' or 'timeout' (an engine did not finish within the time limit)
+def compare_engines(initial_file, goal_file, time_limit, transposition_size=100000):
+    initial_state = {}
+    goal_state = {}
+    PA1.load_states(initial_file, goal_file, initial_state, goal_state)
+    block_index = ps.from_block_dict(initial_state).block_index
+    initial_packed = ps.from_block_dict(initial_state, block_index)
+    goal_packed = ps.from_block_dict(goal_state, block_index)
+
+    for size in (0, transposition_size):
+        plans = []
+        for recursive in (True, False):
+            counter = ExpansionCounter(ps.block_world_actions, time_limit)
+            counter.start_time = time.time()
+            try:
+                plans.append(aStar.a_star_search(initial_packed, counter, ps.block_world_take_actions,
+                                                 lambda s: ps.block_world_goal_test(s, goal_packed),
+                                                 lambda s: ps.block_world_heuristic(s, goal_packed),
+                                                 return_path=False, transposition_size=size,
+                                                 recursive=recursive))
+            except (BudgetExhausted, RecursionError):
+                return 'timeout'
+        if plans[0] != plans[1]:
+            return 'DIFF'
+    return 'match'
+
+
+# Function to time one expansion (generate the actions and apply each of them) of the initial state.
+# Compares applying the command objects directly against formatting every command to the
+# '(command ...)' text and parsing it back, which is what the planners used to do.
+# Returns (typed seconds per expansion, text seconds per expansion)
+def benchmark_commands(initial_file, goal_file, repeat):
+    initial_state = {}
+    goal_state = {}
+    PA1.load_states(initial_file, goal_file, initial_state, goal_state)
+    state = ps.from_block_dict(initial_state)
+
+    start_time = time.time()
+    for _ in range(repeat):
+        for command in ps.block_world_actions(state):
+            ps.block_world_take_actions(state, command)
+    typed = (time.time() - start_time) / repeat
+
+    start_time = time.time()
+    for _ in range(repeat):
+        for command in ps.block_world_actions(state):
+            ps.block_world_take_actions(state, (c.parse_command(c.format_command(command[0])), command[1]))
+    text = (time.time() - start_time) / repeat
+    return typed, text
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='CS540: PA1 benchmark - nodes expanded per second')
+    parser.add_argument('-l', '--time_limit', help='Time limit in seconds for each search', type=float,
+                        default=10.0)
+    parser.add_argument('-t', '--transposition_size', help='Transposition table size for the packed+tt search',
+                        type=int, default=100000)
+    parser.add_argument('-m', '--micro', help='Only time the command handling of a single expansion',
+                        action='store_true')
+    parser.add_argument('-r', '--repeat', help='Number of expansions timed by --micro', type=int, default=2000)
+    parser.add_argument('-C', '--check', help='Check that the recursive and iterative RBFS engines return the same '
+                                              'plans (exits with 1 if a plan differs)',
+                        action='store_true')
+    args = parser.parse_args()
+
+    if args.check:
+        status = 0
+        print("{:<14} {:>8}".format('problem', 'engines'))
+        for initial_file, goal_file in DEFAULT_PROBLEMS:
+            engines = compare_engines(initial_file, goal_file, args.time_limit, args.transposition_size)
+            print("{:<14} {:>8}".format(initial_file, engines))
+            if engines == 'DIFF':
+                status = 1
+        exit(status)
+
+    if args.micro:
+        print("{:<14} {:>14} {:>14} {:>8}".format('problem', 'typed usec', 'text usec', 'saved'))
+        for initial_file, goal_file in DEFAULT_PROBLEMS:
+            typed, text = benchmark_commands(initial_file, goal_file, args.repeat)
+            print("{:<14} {:>14.1f} {:>14.1f} {:>7.0f}%".format(initial_file, typed * 1e6, text * 1e6,
+                                                               100.0 * (text - typed) / text))
+        exit(0)
+
+    print("{:<14} {:<10} {:>10} {:>10} {:>12} {:>8}".format('problem', 'state', 'expanded', 'seconds',
+                                                           'nodes/sec', 'solved'))
+    for initial_file, goal_file in DEFAULT_PROBLEMS:
+        speeds = {}
+        for name, expanded, elapsed, solved in benchmark_problem(initial_file, goal_file, args.time_limit,
+                                                                    args.transposition_size):
+            speeds[name] = expanded / elapsed if elapsed > 0 else 0.0
+            print("{:<14} {:<10} {:>10} {:>10.3f} {:>12.1f} {:>8}".format(initial_file, name, expanded, elapsed,
+                                                                         speeds[name], str(solved)))
+        if speeds['dict'] > 0:
+            print("{:<14} speedup {:.1f}x".format(initial_file, speeds['packed'] / speeds['dict']))
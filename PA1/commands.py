@@ -0,0 +1,58 @@
+from collections import namedtuple
+
+
+# Typed block world commands.
+# The planners create and apply these objects directly, the '(command ...)' text format
+# is only built when a plan is printed (str(command) or format_command) and only parsed
+# when a plan is read back (parse_command).
+# Each command is an immutable namedtuple, 'name' is the command name used in the text format.
+
+
+# (command stack block-id1 block-id2|table) - Put block-id1 on top of block-id2 or the table
+class Stack(namedtuple('Stack', ['source', 'destination'])):
+    __slots__ = ()
+    name = 'stack'
+
+    def __str__(self):
+        return '(command stack {} {})'.format(self.source, self.destination)
+
+
+# (command slide-to block-id1 block-id2) - Slide block-id1 next to block-id2
+class SlideTo(namedtuple('SlideTo', ['source', 'destination'])):
+    __slots__ = ()
+    name = 'slide-to'
+
+    def __str__(self):
+        return '(command slide-to {} {})'.format(self.source, self.destination)
+
+
+# Command name -> (command class, number of integer parameters at the end of the command)
+COMMANDS = {
+    Stack.name: (Stack, 0),
+    SlideTo.name: (SlideTo, 0),
+}
+
+
+# Function to convert a command into the '(command ...)' text format
+def format_command(command):
+    return str(command)
+
+
+# Function to convert a '(command ...)' string into a command object
+# Returns None if the string is not a valid command
+def parse_command(text):
+    sub_string = text.replace('(', '').replace(')', '').split()
+    if len(sub_string) < 3 or sub_string[0].lower() != 'command':
+        return None
+
+    name = sub_string[1].lower()
+    if name not in COMMANDS:
+        return None
+
+    command_class, num_int_params = COMMANDS[name]
+    params = [param.lower() for param in sub_string[2:]]
+    if len(params) != len(command_class._fields):
+        return None
+    if num_int_params:
+        params[-num_int_params:] = [int(param) for param in params[-num_int_params:]]
+    return command_class(*params)
@@ -0,0 +1,451 @@
+import block as b
+import commands as c
+import zobrist as zb
+
+
+# Value used in the packed arrays when a relation is not set (the 'None' of block.Block)
+NO_BLOCK = -1
+
+
+# Function to count the number of neighbors stored in a neighbor bitmask
+def num_neighbors(mask):
+    return bin(mask).count('1')
+
+
+# Function to iterate over the block indexes stored in a neighbor bitmask
+def neighbor_indexes(mask):
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+# Defines the static information shared by every packed state of a single problem.
+# Block names and colors never change during a search, so they are stored once
+# and the packed states only hold the block indexes.
+class BlockIndex:
+    # Function used to initialize object
+    def __init__(self, block_ids, colors=None):
+        self.block_ids = tuple(block_ids)                                   # Block name for each index
+        self.index = {blk: i for i, blk in enumerate(self.block_ids)}      # Block name -> index
+        self.colors = tuple(colors) if colors else (None,) * len(block_ids)  # Color for each index
+
+        # Zobrist keys (see zobrist.py).  on_top_of_keys[i][j] is the key of block i on top of block j,
+        # the last entry (index NO_BLOCK) is the key of block i on the table.  neighbor_keys[i][j] is
+        # the key of block j in the neighbors of block i.
+        self.on_top_of_keys = [[zb.get_key(blk, 'on_top_of', other) for other in self.block_ids + ('table',)]
+                               for blk in self.block_ids]
+        self.neighbor_keys = [[zb.get_key(blk, 'side_by_side', other) for other in self.block_ids]
+                              for blk in self.block_ids]
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "BlockIndex[" + \
+               "\n\tblock_ids(" + repr(self.block_ids) + ")" + \
+               "\n\tcolors(" + repr(self.colors) + ")]"
+
+    def __len__(self):
+        return len(self.block_ids)
+
+
+# Defines an immutable, hashable block world state.
+# Each block is identified by its index in the shared BlockIndex and the state is stored as
+# four tuples indexed by block:
+#   on_top_of - index of the block underneath, NO_BLOCK if on the table
+#   below     - index of the block on top, NO_BLOCK if this is the top block
+#   height    - height of the block, table has height = 0
+#   neighbors - bitmask of the side-by-side blocks (bit i set if block i is a neighbor)
+# Two bitmasks are derived from the tuples and kept up to date as actions are applied:
+#   clear     - blocks with no block on top of them (bit i set if block i is a top block)
+#   table     - blocks on the table (bit i set if block i has height 0)
+# The fingerprint is the Zobrist hash of the on_top_of and neighbors tuples (below and height follow
+# from on_top_of), it is updated by block_world_take_actions for the blocks a command changes.
+class PackedState:
+    __slots__ = ('block_index', 'on_top_of', 'below', 'height', 'neighbors', 'clear', 'table', 'fingerprint')
+
+    # Function used to initialize object
+    # If 'clear', 'table' or 'fingerprint' is not provided, it is computed from the tuples
+    def __init__(self, block_index, on_top_of, below, height, neighbors, clear=None, table=None,
+                 fingerprint=None):
+        self.block_index = block_index
+        self.on_top_of = tuple(on_top_of)
+        self.below = tuple(below)
+        self.height = tuple(height)
+        self.neighbors = tuple(neighbors)
+        if clear is None:
+            clear = sum(1 << i for i, upper in enumerate(self.below) if upper == NO_BLOCK)
+        if table is None:
+            table = sum(1 << i for i, blk_height in enumerate(self.height) if blk_height == 0)
+        self.clear = clear
+        self.table = table
+        if fingerprint is None:
+            fingerprint = compute_fingerprint(block_index, self.on_top_of, self.neighbors)
+        self.fingerprint = fingerprint
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "PackedState[" + \
+               "\n\ton_top_of(" + repr(self.on_top_of) + ")" + \
+               "\n\tbelow(" + repr(self.below) + ")" + \
+               "\n\theight(" + repr(self.height) + ")" + \
+               "\n\tneighbors(" + repr(self.neighbors) + ")]"
+
+    # Override object comparison operator '=='
+    # NOTE: States are only compared against states of the same problem (same BlockIndex)
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            return self.fingerprint == other.fingerprint and \
+                   self.on_top_of == other.on_top_of and \
+                   self.below == other.below and \
+                   self.height == other.height and \
+                   self.neighbors == other.neighbors
+        else:
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return self.fingerprint
+
+
+# Function to get the XOR of the neighbor keys of block i for the blocks in a neighbor bitmask.
+# When the neighbors of block i change from 'old' to 'new' the fingerprint changes by neighbor_key(old ^ new)
+def neighbor_key(block_index, i, mask):
+    key = 0
+    keys = block_index.neighbor_keys[i]
+    for j in neighbor_indexes(mask):
+        key ^= keys[j]
+    return key
+
+
+# Function to compute the fingerprint of a state from its on_top_of and neighbors tuples
+def compute_fingerprint(block_index, on_top_of, neighbors):
+    fingerprint = 0
+    for i in range(len(on_top_of)):
+        fingerprint ^= block_index.on_top_of_keys[i][on_top_of[i]] ^ neighbor_key(block_index, i, neighbors[i])
+    return fingerprint
+
+
+# Function to build a packed state from the dictionary of block.Block objects
+# created by block.get_state_from_file and block.gen_relationships.
+# If 'block_index' is not provided, one is created from the blocks in 'state_data'.
+# Pass the same block_index when converting the initial and goal states so they
+# can be compared against each other.
+def from_block_dict(state_data, block_index=None):
+    if block_index is None:
+        block_index = BlockIndex(list(state_data), [state_data[blk].color for blk in state_data])
+
+    index = block_index.index
+    num_blocks = len(block_index)
+    on_top_of = [NO_BLOCK] * num_blocks
+    below = [NO_BLOCK] * num_blocks
+    height = [0] * num_blocks
+    neighbors = [0] * num_blocks
+
+    for blk, i in index.items():
+        block = state_data[blk]
+        if block.on_top_of is not None:
+            on_top_of[i] = index[block.on_top_of]
+        if block.below is not None:
+            below[i] = index[block.below]
+        height[i] = int(block.height)
+        for neighbor in block.side_by_side:
+            neighbors[i] |= 1 << index[neighbor]
+
+    return PackedState(block_index, on_top_of, below, height, neighbors)
+
+
+# Function to convert a packed state back into a dictionary of block.Block objects
+def to_block_dict(state):
+    block_ids = state.block_index.block_ids
+    state_data = {}
+    for i, blk in enumerate(block_ids):
+        block = b.Block(blk)
+        block.color = state.block_index.colors[i]
+        block.on_top_of = block_ids[state.on_top_of[i]] if state.on_top_of[i] != NO_BLOCK else None
+        block.below = block_ids[state.below[i]] if state.below[i] != NO_BLOCK else None
+        block.height = state.height[i]
+        block.side_by_side = [block_ids[n] for n in neighbor_indexes(state.neighbors[i])]
+        state_data[blk] = block
+
+    return state_data
+
+
+# Function to determine if a given state is the goal state
+def block_world_goal_test(state, goal):
+    return state == goal
+
+
+# Function to determine all possible moves/commands for a given state.
+# Actions are returned as (commands.Stack|commands.SlideTo, cost) tuples, in the same order
+# as PA1.block_world_actions.
+# Only the clear (top) blocks and the table blocks are visited, these sets are maintained
+# by block_world_take_actions so they do not have to be rebuilt for every expansion.
+def block_world_actions(state):
+    step_cost = 1
+    actions = []
+    block_ids = state.block_index.block_ids
+    neighbors = state.neighbors
+    clear_blocks = list(neighbor_indexes(state.clear))
+    table_blocks = list(neighbor_indexes(state.table))
+
+    # stack command
+    # Only top blocks can be stacked, and only on other top blocks
+    for i in clear_blocks:
+        source = block_ids[i]
+        # If this block has neighbors, use table to separate
+        if state.height[i] > 0 or neighbors[i]:
+            actions.append((c.Stack(source, 'table'), step_cost))
+
+        # Find all other blocks that this one can be stacked on
+        for j in clear_blocks:
+            if i != j:
+                actions.append((c.Stack(source, block_ids[j]), step_cost))
+
+    # slide-to command
+    # Both blocks must be on the table and the second block must have fewer than four neighbors
+    open_blocks = [j for j in table_blocks if num_neighbors(neighbors[j]) < 4]
+    for i in table_blocks:
+        source = block_ids[i]
+        i_bit = 1 << i
+        for j in open_blocks:
+            if i != j and not neighbors[j] & i_bit:
+                actions.append((c.SlideTo(source, block_ids[j]), step_cost))
+
+    return actions
+
+
+# Function used to apply a command to a specific state.
+# Packed states are immutable, a new state is returned and the original is left unmodified.
+# Applies the same pre/post conditions as PA1.block_world_take_actions without deep copying.
+# command is a (command, cost) pair as returned by block_world_actions
+def block_world_take_actions(state, command):
+    action = command[0].name
+    source = command[0].source
+    destination = command[0].destination
+
+    index = state.block_index.index
+    on_top_of = list(state.on_top_of)
+    below = list(state.below)
+    height = list(state.height)
+    neighbors = list(state.neighbors)
+    clear = state.clear
+    table = state.table
+    src = index[source]
+    src_bit = 1 << src
+    changed = 0     # Bitmask of the blocks whose neighbors may change
+
+    if action == 'slide-to':
+        dst = index[destination]
+        if height[src] == 0 and height[dst] == 0 and num_neighbors(neighbors[dst]) < 4:
+            # Add first block as neighbor of second block
+            neighbors[dst] |= src_bit
+            changed |= src_bit | (1 << dst) | neighbors[src]
+
+            # Remove SOURCE block from SOURCEs neighbors
+            for n in neighbor_indexes(neighbors[src]):
+                neighbors[n] &= ~src_bit
+
+            # Remove neighbors vertically
+            upper = below[src]
+            while upper != NO_BLOCK:
+                changed |= (1 << upper) | neighbors[upper]
+                for n in neighbor_indexes(neighbors[upper]):
+                    neighbors[n] &= ~(1 << upper)
+                neighbors[upper] = 0
+                upper = below[upper]
+
+            # First block is only side-by-side with second block
+            neighbors[src] = 1 << dst
+
+            # vertical neighbors
+            upper_src = below[src]
+            upper_dst = below[dst]
+            while upper_src != NO_BLOCK and upper_dst != NO_BLOCK:
+                changed |= (1 << upper_src) | (1 << upper_dst)
+                neighbors[upper_src] |= 1 << upper_dst
+                neighbors[upper_dst] |= 1 << upper_src
+                upper_src = below[upper_src]
+                upper_dst = below[upper_dst]
+
+    elif action == 'stack':
+        if destination == 'table':
+            # Can only move top block
+            if below[src] == NO_BLOCK:
+                # If on top of another block, update the lower block
+                if on_top_of[src] != NO_BLOCK:
+                    below[on_top_of[src]] = NO_BLOCK
+                    clear |= 1 << on_top_of[src]
+
+                # If SOURCE block has neighbors, remove SOURCE from neighbors
+                changed |= src_bit | neighbors[src]
+                for n in neighbor_indexes(neighbors[src]):
+                    neighbors[n] &= ~src_bit
+
+                # SOURCE block is on table and has no neighbors
+                on_top_of[src] = NO_BLOCK
+                height[src] = 0
+                neighbors[src] = 0
+                table |= src_bit
+
+        # stack SOURCE block on top of DESTINATION block
+        else:
+            dst = index[destination]
+            # Can only manipulate top blocks
+            if below[src] == NO_BLOCK and below[dst] == NO_BLOCK:
+                # If SOURCE block has neighbors, remove SOURCE from neighbors
+                changed |= src_bit | neighbors[src]
+                for n in neighbor_indexes(neighbors[src]):
+                    neighbors[n] &= ~src_bit
+                neighbors[src] = 0
+
+                # If on top of another block, update the lower block
+                if on_top_of[src] != NO_BLOCK:
+                    below[on_top_of[src]] = NO_BLOCK
+                    clear |= 1 << on_top_of[src]
+
+                # Apply changes for moving block to destination
+                on_top_of[src] = dst
+                height[src] = height[dst] + 1
+                below[dst] = src
+                clear &= ~(1 << dst)
+                table &= ~src_bit
+
+                # Neighbors of DESTINATION
+                for n in neighbor_indexes(neighbors[dst]):
+                    upper = below[n]
+                    if upper != NO_BLOCK and num_neighbors(neighbors[upper]) < 4:
+                        neighbors[src] |= 1 << upper
+                        neighbors[upper] |= src_bit
+                        changed |= 1 << upper
+
+    else:
+        print("ERROR: block_world_take_actions - bad command({})".format(command))
+        return
+
+    # Fingerprint - XOR out the old keys and XOR in the new keys of the blocks the command changed
+    block_index = state.block_index
+    fingerprint = state.fingerprint
+    if on_top_of[src] != state.on_top_of[src]:
+        keys = block_index.on_top_of_keys[src]
+        fingerprint ^= keys[state.on_top_of[src]] ^ keys[on_top_of[src]]
+    old_neighbors = state.neighbors
+    for k in neighbor_indexes(changed):
+        diff = neighbors[k] ^ old_neighbors[k]
+        if diff:
+            keys = block_index.neighbor_keys[k]
+            for j in neighbor_indexes(diff):
+                fingerprint ^= keys[j]
+
+    return PackedState(block_index, on_top_of, below, height, neighbors, clear, table, fingerprint), command[1]
+
+
+# Function to determine if the heights of a state follow from its on_top_of relations.
+# A block on the table has height 0 and a block on top of another block is one higher than that block.
+def has_consistent_heights(state):
+    height = state.height
+    for i, lower in enumerate(state.on_top_of):
+        if height[i] != (0 if lower == NO_BLOCK else height[lower] + 1):
+            return False
+    return True
+
+
+# Function to get the side-by-side relations between the blocks on the table.
+# Returns a set of (i, j) block index pairs with i < j, or None if the relations are not symmetric
+def table_neighbor_pairs(state):
+    pairs = set()
+    for i in neighbor_indexes(state.table):
+        for j in neighbor_indexes(state.neighbors[i] & state.table):
+            if not state.neighbors[j] & (1 << i):
+                return None
+            pairs.add((min(i, j), max(i, j)))
+    return pairs
+
+
+# Function to determine if two blocks are connected by side-by-side relations, without the relation (i, j).
+# pairs is a set of relations as returned by table_neighbor_pairs
+def is_connected_without(pairs, i, j):
+    adjacent = {}
+    for (a, b) in pairs:
+        if (a, b) != (min(i, j), max(i, j)):
+            adjacent.setdefault(a, []).append(b)
+            adjacent.setdefault(b, []).append(a)
+
+    visited = {i}
+    stack = [i]
+    while stack:
+        for n in adjacent.get(stack.pop(), []):
+            if n == j:
+                return True
+            if n not in visited:
+                visited.add(n)
+                stack.append(n)
+    return False
+
+
+# Function to find a reason why no sequence of commands can reach 'goal' from 'state'.
+# The commands keep two properties of a state:
+#   - The heights follow from the on_top_of relations, a moved block is one higher than its new support.
+#   - Side-by-side relations between table blocks are only added by slide-to, and the first block loses
+#     all of its other neighbors first.  A new relation never closes a cycle, so every cycle of table
+#     blocks in a reachable state is made of relations the start state already had.
+# If the start state has these properties and the goal does not, the goal can not be reached.  The search
+# would only fail after visiting every reachable state, which can take longer than any time limit.
+# Returns a description of the property the goal breaks, or None if the goal may be reachable
+def find_unreachable_goal(state, goal):
+    block_ids = state.block_index.block_ids
+    if has_consistent_heights(state) and not has_consistent_heights(goal):
+        for i, lower in enumerate(goal.on_top_of):
+            if goal.height[i] != (0 if lower == NO_BLOCK else goal.height[lower] + 1):
+                support = 'the table' if lower == NO_BLOCK else block_ids[lower]
+                return "{} is on {} but has height({})".format(block_ids[i], support, goal.height[i])
+
+    start_pairs = table_neighbor_pairs(state)
+    goal_pairs = table_neighbor_pairs(goal)
+    if start_pairs is None or goal_pairs is None or not has_consistent_heights(state):
+        return None
+    for (i, j) in sorted(goal_pairs - start_pairs):
+        if is_connected_without(goal_pairs, i, j):
+            return "side-by-side blocks {} and {} are on a cycle of table blocks".format(block_ids[i], block_ids[j])
+    return None
+
+
+# Function used to estimate the remaining steps from state to goal.
+# Same estimate as PA1.block_world_heuristic
+def block_world_heuristic(state, goal):
+    height_diff = 0
+    neighbor_diff = 0
+    height = state.height
+    goal_height = goal.height
+
+    for i in range(len(height)):
+        if height[i] != goal_height[i]:
+            height_diff += 1
+        elif goal_height[i] > 0 and state.on_top_of[i] != goal.on_top_of[i]:
+            height_diff += 1
+
+        if goal_height[i] == 0 and state.neighbors[i] != goal.neighbors[i]:
+            neighbor_diff += 1
+
+    return height_diff + neighbor_diff
+
+
+# Same as block_world_heuristic, but the neighbor differences are weighted
+# Same estimate as PA1.block_world_heuristic_fast_and_sloppy
+def block_world_heuristic_fast_and_sloppy(state, goal):
+    height_diff = 0
+    neighbor_diff = 0
+    height = state.height
+    goal_height = goal.height
+
+    for i in range(len(height)):
+        if height[i] != goal_height[i]:
+            height_diff += 1
+        elif goal_height[i] > 0 and state.on_top_of[i] != goal.on_top_of[i]:
+            height_diff += 1
+
+        if goal_height[i] == 0 and state.neighbors[i] != goal.neighbors[i]:
+            neighbor_diff += 1
+
+    return height_diff + neighbor_diff * 2.5
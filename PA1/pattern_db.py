@@ -0,0 +1,174 @@
+import hashlib
+import os
+import pickle
+import packed_state as ps
+
+
+# Default number of blocks in each pattern (group of blocks)
+DEFAULT_GROUP_SIZE = 4
+
+# Directory where the pattern databases are saved, one file per goal state and group size
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdb_cache')
+
+# Changing the abstraction invalidates the saved databases
+CACHE_VERSION = 1
+
+
+# Function to split the blocks of the goal state into disjoint groups.
+# The goal towers are walked from the table up, so blocks that are stacked on each
+# other in the goal end up in the same group (their interactions are counted exactly).
+def goal_groups(goal, group_size):
+    order = []
+    for i in ps.neighbor_indexes(goal.table):
+        blk = i
+        while blk != ps.NO_BLOCK:
+            order.append(blk)
+            blk = goal.below[blk]
+
+    # Blocks that are not reachable from the table (should not happen in a valid goal)
+    order += [i for i in range(len(goal.height)) if i not in order]
+    return [tuple(order[k:k + group_size]) for k in range(0, len(order), group_size)]
+
+
+# Function to build the support code table of a group.
+# In the abstract state each group block only records what it is on top of:
+#   0 .. k-1 - the group block with that position in the group
+#   k        - the table
+#   k + 1    - any block outside of the group
+# The returned list maps a block index (NO_BLOCK is the last entry) to its support code.
+def support_codes(group, num_blocks):
+    k = len(group)
+    codes = [k + 1] * num_blocks + [k]
+    for position, blk in enumerate(group):
+        codes[blk] = position
+    return codes
+
+
+# Function to compute the exact cost from every abstract state of a group to the abstract goal.
+# Only the 'stack' commands of the group blocks cost 1.  Commands of the other blocks and
+# 'slide-to' commands do not change the abstract state, so the sum of the group costs is
+# an admissible estimate of the number of commands.
+# Abstract moves are reversible with the same cost, so a breadth first search from the goal
+# gives the distance of every abstract state that can reach the goal.
+def abstract_distances(goal_supports, has_other):
+    k = len(goal_supports)
+    destinations = list(range(k + 1))
+    if has_other:
+        destinations.append(k + 1)
+
+    distances = {goal_supports: 0}
+    frontier = [goal_supports]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for supports in frontier:
+            # Group blocks with a group block on top of them
+            covered = set(supports)
+            for x in range(k):
+                # Can only move top blocks
+                if x in covered:
+                    continue
+                for destination in destinations:
+                    if destination == x or destination == supports[x]:
+                        continue
+                    # Can only stack on top blocks, the table and outside blocks are always available
+                    if destination < k and destination in covered:
+                        continue
+                    child = supports[:x] + (destination,) + supports[x + 1:]
+                    if child not in distances:
+                        distances[child] = depth
+                        next_frontier.append(child)
+        frontier = next_frontier
+
+    return distances
+
+
+# Defines an additive pattern database heuristic for the packed block world states.
+# The blocks are split into disjoint groups, and for each group the exact number of
+# 'stack' commands needed to put the group blocks on their goal supports is precomputed.
+# The estimate is the sum of the group costs (each command moves a single block, so it is
+# only counted by one group) and is admissible.
+# The object is callable and can be passed directly as the heuristic of a search.
+class PatternDatabase:
+    # Function used to initialize object
+    # The databases are loaded from 'cache_dir' if they were already built for this goal,
+    # otherwise they are built and saved.  Set cache_dir to None to disable the cache.
+    def __init__(self, goal, group_size=DEFAULT_GROUP_SIZE, cache_dir=DEFAULT_CACHE_DIR):
+        self.goal = goal
+        self.group_size = group_size
+        num_blocks = len(goal.height)
+        self.groups = goal_groups(goal, group_size)
+        self.codes = [support_codes(group, num_blocks) for group in self.groups]
+        self.goal_supports = [self.abstract_state(goal, i) for i in range(len(self.groups))]
+
+        cache_file = None
+        if cache_dir is not None:
+            cache_file = os.path.join(cache_dir, 'pdb_{}.pickle'.format(self.cache_key()))
+
+        self.tables = None
+        if cache_file is not None and os.path.exists(cache_file):
+            self.tables = self.load(cache_file)
+
+        if self.tables is None:
+            self.tables = [abstract_distances(goal_supports, num_blocks > len(group))
+                           for group, goal_supports in zip(self.groups, self.goal_supports)]
+            if cache_file is not None:
+                self.save(cache_file)
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "PatternDatabase[" + \
+               "\n\tgroups(" + repr(self.groups) + ")" + \
+               "\n\tsizes(" + repr([len(table) for table in self.tables]) + ")]"
+
+    # Function to estimate the remaining steps from state to goal
+    def __call__(self, state):
+        estimate = 0
+        on_top_of = state.on_top_of
+        for i, group in enumerate(self.groups):
+            codes = self.codes[i]
+            supports = tuple(codes[on_top_of[blk]] for blk in group)
+            distance = self.tables[i].get(supports)
+            if distance is None:
+                # Goal is not reachable in the abstract space, every misplaced block must move at least once
+                distance = sum(1 for s, g in zip(supports, self.goal_supports[i]) if s != g)
+            estimate += distance
+
+        # Commands that only change neighbors are free in the abstract space,
+        # but at least one command is needed if this is not the goal
+        if estimate == 0 and state != self.goal:
+            return 1
+        return estimate
+
+    # Function to get the abstract state of a group
+    def abstract_state(self, state, group_index):
+        codes = self.codes[group_index]
+        return tuple(codes[state.on_top_of[blk]] for blk in self.groups[group_index])
+
+    # Function to build the key used to name the cache file.
+    # Python's hash() of strings changes between runs, so a digest of the goal is used.
+    def cache_key(self):
+        goal_data = (CACHE_VERSION, self.group_size, self.goal.block_index.block_ids, self.goal.on_top_of)
+        return hashlib.sha1(repr(goal_data).encode('utf-8')).hexdigest()
+
+    # Function to load the saved databases, returns None if the file can not be used
+    def load(self, cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                groups, tables = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, ValueError):
+            return None
+
+        if groups != self.groups:
+            return None
+        return tables
+
+    # Function to save the databases, the search still works if the cache can not be written
+    def save(self, cache_file):
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump((self.groups, self.tables), f)
+        except OSError as e:
+            print("ERROR: PatternDatabase - unable to save cache file({}): {}".format(cache_file, e))
@@ -1,785 +1,1120 @@
-import argparse
-import copy
-import aStar
-import relation as r
-# import math
-import time
-from constants import *
-
-
-# Global flag to determine if the processing time will be
-# printed or not.  This functionality is disabled by default.
-# Use the '-t' command line option to enable (see the 'setup' function)
-print_time_flag = False
-print_debug_flag = False
-validate_flag = False
-
-
-# Function to setup/initialize the block world.
-# The initial and goal states will be read from a file passed into the script
-# ArgumentParser enforces that a value is passed in for each required parameter
-# NOTE: I am not explicitly validating that the files exist, downstream file
-#       operations will fail if they are not valid
-def setup(initial_state_relation, goal_state_relation):
-    # Get parameters from command line
-    parser = argparse.ArgumentParser(description='CS540: Programming Assignment #2 - NEED TO UPDATE')
-    parser.add_argument('-t', '--time', help='Flag to indicate if processing time will be printed or not',
-                        action="store_true")
-    parser.add_argument('-d', '--debug', help='Flag to enable additional debug messages', action="store_true")
-    parser.add_argument('-v', '--validate', help='Flag to enable initial|goal states', action="store_true")
-    required_args = parser.add_argument_group('required named arguments')
-    required_args.add_argument('-i', '--initial_state', help='Initial state file name', required=True)
-    required_args.add_argument('-g', '--goal_state', help='Goal state file name', required=True)
-
-    args = parser.parse_args()
-
-    # Define global variables so this function can update them
-    global print_time_flag
-    global print_debug_flag
-    global validate_flag
-
-    if args.time:
-        print_time_flag = True
-
-    if args.debug:
-        print_time_flag = True
-        print_debug_flag = True
-
-    if args.validate:
-        validate_flag = True
-
-    # Initialize the relations with information from command line arguments
-    initial_state_relation.get_state_from_file(args.initial_state)
-    goal_state_relation.get_state_from_file(args.goal_state, initial_state_relation)
-
-
-# Function to determine if a given state is the goal state
-def block_world_goal_test(state, goal):
-    return state == goal
-
-
-# Function to determine if a given state is the goal state
-def route_planner_goal_test(state, goal):
-    if state == goal:
-        return True
-
-    for blk in state.state_data:
-        if state.state_data[blk] == goal.state_data[blk]:
-            continue
-
-        if not goal.state_data[blk].is_location_valid():
-            if goal.state_data[blk].get_below() != state.state_data[blk].get_below():
-                return False
-            if goal.state_data[blk].get_on_top_of() != state.state_data[blk].get_on_top_of():
-                return False
-            if set(goal.state_data[blk].get_neighbors()) != set(state.state_data[blk].get_neighbors()):
-                return False
-        continue
-
-    # Can't find anything wrong
-    return True
-
-
-# Function to determine all possible moves/commands for a given state.
-def route_planner_actions(relation):
-    actions = []
-
-    # look for floating blocks
-    for blk in list(relation.state_data):
-        # Get the current block location
-        blk_x, blk_y, blk_z = relation.state_data[blk].get_location()
-        if blk_z > 0 and relation.state_data[blk].get_on_top_of() is None:
-            # Block is floating, we can only operate on this one for now
-            for x_move in all_moves_one_dim:
-                for y_move in all_moves_one_dim:
-                    for z_move in all_moves_one_dim:
-                        occupied = False
-                        tmp_x = blk_x + x_move
-                        tmp_y = blk_y + y_move
-                        tmp_z = blk_z + z_move
-
-                        # Check for move off of board
-                        if not (BOARD_MIN_X <= tmp_x <= BOARD_MAX_X and
-                                BOARD_MIN_Y <= tmp_y <= BOARD_MAX_Y and tmp_z >= BOARD_MIN_Z):
-                            continue
-
-                        # Make sure new space is not occupied
-                        for inner_blk in list(relation.state_data):
-                            if blk == inner_blk:
-                                continue
-
-                            iblk_x, iblk_y, iblk_z = relation.state_data[inner_blk].get_location()
-                            if tmp_z == iblk_z and tmp_x == iblk_x and tmp_y == iblk_y:
-                                occupied = True
-                                break
-
-                        if not occupied:
-                            cost = 1
-                            actions.append(('(command move {} {} {} {})'.format(blk, tmp_x, tmp_y, tmp_z), cost))
-
-            # Return now
-            return actions
-
-    # stack command
-    # The preconditions are that either|neither block has a block on top of it
-    # Put id1 on top of id2 (command stack block-id1 block-id2).
-    # Put id1 on table (command stack block-id1 table).
-    for blk in list(relation.state_data):
-        # 'stack' only possible for top block (i.e. below == None)
-        if relation.state_data[blk].get_below() is None:
-            # Get the current block location
-            blk_x, blk_y, blk_z = relation.state_data[blk].get_location()
-
-            # Find all other blocks that this one can be stacked on
-            for inner_blk in list(relation.state_data):
-                if blk == inner_blk:
-                    continue
-                if relation.state_data[inner_blk].get_below() is None:
-                    iblk_x, iblk_y, iblk_z = relation.state_data[inner_blk].get_location()
-                    if abs(iblk_x - blk_x) <= 1 and abs(iblk_y - blk_y) <= 1:
-                        height_change = abs(iblk_z + 1 - blk_z)
-                        # +2 for 'grab' and 'release'
-                        # cost = height_change + 2
-                        # NOTE: A cost of one seems to work better for some reason?!
-                        cost = height_change + 1
-                        actions.append(('(command move {} {} {} {})'.format(blk, iblk_x, iblk_y, (iblk_z + 1)), cost))
-
-            # If height > 0, try to stack on table
-            # NOTE: This might be too much, maybe just find the first open slot?
-            if blk_z > 0:
-                found = False
-                loop_count = 1
-                while not found:
-                    for move in all_moves:
-                        occupied = False
-                        tmp_x = blk_x + (move[0] * loop_count)
-                        tmp_y = blk_y + (move[1] * loop_count)
-                        tmp_z = blk_z - 1
-
-                        # Check for move off of board
-                        if not (BOARD_MIN_X <= tmp_x <= BOARD_MAX_X and BOARD_MIN_Y <= tmp_y <= BOARD_MAX_Y):
-                            continue
-
-                        for inner_blk in list(relation.state_data):
-                            if blk == inner_blk:
-                                continue
-
-                            iblk_x, iblk_y, iblk_z = relation.state_data[inner_blk].get_location()
-                            if tmp_z == iblk_z and tmp_x == iblk_x and tmp_y == iblk_y:
-                                occupied = True
-                                break
-
-                        if not occupied:
-                            found = True
-                            # cost = blk_z + 2
-                            # actions.append(('(command move {} {} {} {})'.format(blk, tmp_x, tmp_y, 0), cost))
-                            cost = 1
-                            actions.append(('(command move {} {} {} {})'.format(blk, tmp_x, tmp_y, tmp_z), cost))
-
-                    loop_count += 1
-                    if loop_count >= 10:
-                        print("LOOP COUNT ERROR")
-                        exit(1)
-
-    # slide-to command
-    # Its preconditions are
-    # (1) that both blocks have height 0
-    # (2) the second block has fewer than four other blocks side-by-side with it.
-    for blk in list(relation.state_data):
-        # Get the current block location
-        blk_x, blk_y, blk_z = relation.state_data[blk].get_location()
-
-        # Can only slide blocks that are on the table (height = 0)
-        if blk_z == 0:
-            for move in all_moves:
-                occupied = False
-                tmp_x = blk_x + move[0]
-                tmp_y = blk_y + move[1]
-
-                # Make sure new position is on the board
-                if BOARD_MIN_X <= tmp_x <= BOARD_MAX_X and BOARD_MIN_Y <= tmp_y <= BOARD_MAX_Y:
-                    # Make sure new position does not collide with any other block
-                    for inner_blk in list(relation.state_data):
-                        if blk == inner_blk:
-                            continue
-
-                        iblk_x, iblk_y, iblk_z = relation.state_data[inner_blk].get_location()
-                        if tmp_x == iblk_x and tmp_y == iblk_y:
-                            occupied = True
-                            break
-
-                    if not occupied:
-                        actions.append(('(command move {} {} {} {})'.format(blk, tmp_x, tmp_y, 0), 1))
-
-    return actions
-
-
-# Function used to apply a command to a specific state.
-# The original state is copied and left unmodified.  A copy
-# of the modified state will be returned.
-def route_planner_take_actions(relation, command):
-    # command is a string of the form '(command move blk x, y, z)'
-    tmp_relation = copy.deepcopy(relation)
-    tmp_command = copy.copy(command[0])
-    tmp_command = tmp_command.replace('(', '')
-    tmp_command = tmp_command.replace(')', '')
-    sub_string = tmp_command.split()
-    cmd = sub_string[0].lower()
-    action = sub_string[1].lower()
-    block = sub_string[2].lower()
-
-    if cmd != 'command':
-        print("ERROR: block_world_take_actions - bad command({})".format(command))
-        return
-
-    if action == 'move':
-        # Get current location
-        blk_x, blk_y, blk_z = tmp_relation.state_data[block].get_location()
-
-        # Get new locations
-        new_x = int(sub_string[3])
-        new_y = int(sub_string[4])
-        new_z = int(sub_string[5])
-
-        # Check for slide or stack moves
-        if blk_z == new_z == 0:
-            # SLIDE - old and new location is on the table
-            upper_block = tmp_relation.state_data[block].get_below()
-            while upper_block is not None:
-                # Set new X,Y location for blocks in this stack
-                ub_height = tmp_relation.state_data[upper_block].get_height()
-                tmp_relation.state_data[upper_block].set_location(new_x, new_y, ub_height)
-                upper_block = tmp_relation.state_data[upper_block].get_below()
-
-            # Set new X,Y location for this block
-            tmp_relation.state_data[block].set_location(new_x, new_y, new_z)
-        else:
-            # STACK - old and/or new location is not on the table
-            # Can only move the top block
-            if tmp_relation.state_data[block].get_below() is not None:
-                print("route_planner_take_actions - stack error: not top block")
-                exit(1)
-
-            # If we're moving the top block, update the block below
-            below_block = tmp_relation.state_data[block].get_on_top_of()
-            if below_block is not None:
-                tmp_relation.state_data[below_block].set_below(None)
-
-            tmp_relation.state_data[block].set_on_top_of(None)
-            if new_z == 0:
-                tmp_relation.state_data[block].set_on_top_of(None)
-            else:
-                # Find the top block of the stack this is going on
-                for inner_blk in list(tmp_relation.state_data):
-                    if inner_blk == block:
-                        continue
-
-                    iblk_x, iblk_y, iblk_z = tmp_relation.state_data[inner_blk].get_location()
-                    if (iblk_x == new_x) and (iblk_y == new_y):
-                        top_block = inner_blk
-                        test_block = tmp_relation.state_data[top_block].get_below()
-                        while test_block is not None:
-                            top_block = test_block
-                            test_block = tmp_relation.state_data[top_block].get_below()
-
-                        tmp_relation.state_data[top_block].set_below(block)
-                        tmp_relation.state_data[block].set_on_top_of(top_block)
-                        break
-
-            # Set new location
-            tmp_relation.state_data[block].set_location(new_x, new_y, new_z)
-    else:
-        print("ERROR - UNKNOWN action({})".format(command[0]))
-        exit(1)
-
-    # If we get here, we must have moved a piece.  Rather than try to surgically update the neighbors,
-    # remove them all and regenerate for the new configuration.
-    for blk in list(tmp_relation.state_data):
-        tmp_relation.state_data[blk].remove_all_neighbors()
-
-    for blk in list(tmp_relation.state_data):
-        blk_x, blk_y, blk_z = tmp_relation.state_data[blk].get_location()
-        for inner_blk in list(tmp_relation.state_data):
-            if inner_blk == blk:
-                continue
-            if tmp_relation.state_data[inner_blk].is_location_valid():
-                iblk_x, iblk_y, iblk_z = tmp_relation.state_data[inner_blk].get_location()
-                if iblk_x == blk_x and iblk_y == blk_y and iblk_z == blk_z:
-                    print("ERROR - find_all_neighbors: 2 blocks at exact same location")
-                    exit(1)
-
-                if iblk_z == blk_z and \
-                        ((iblk_x == blk_x and (abs(iblk_y - blk_y) == 1)) or
-                         (iblk_y == blk_y and (abs(iblk_x - blk_x) == 1))):
-                    tmp_relation.state_data[blk].add_neighbor(inner_blk)
-                    tmp_relation.state_data[inner_blk].add_neighbor(blk)
-            else:
-                print("ERROR - find_all_neighbors: inner block location is invalid")
-
-    return tmp_relation, command[1]
-
-
-# Function used to estimate the remaining steps from state to goal
-def route_planner_heuristic(state, goal):
-    diff = 0
-    for blk in state.state_data:
-        # Check to see if block in it's goal state
-        if state.state_data[blk] == goal.state_data[blk]:
-            continue
-
-        # Get block location from state data
-        sblk_x, sblk_y, sblk_z = state.state_data[blk].get_location()
-
-        # Next step based on goal block being set
-        if goal.state_data[blk].is_location_valid():
-            gblk_x, gblk_y, gblk_z = goal.state_data[blk].get_location()
-
-            # Check for block on table
-            if sblk_z == 0:
-                # Block is on the table, add street distance to destination
-                diff += abs(gblk_x - sblk_x) + abs(gblk_y - sblk_y) + abs(gblk_z - sblk_z)
-                # diff += max(abs(gblk_x - sblk_x), abs(gblk_y - sblk_y), abs(gblk_z - sblk_z))
-            else:
-                # Block is on another block.
-                # Find the bottom block, then get the distance from it's goal to block goal
-                block = blk
-                lower_block = state.state_data[blk].get_on_top_of()
-                while lower_block is not None:
-                    block = lower_block
-                    lower_block = state.state_data[block].get_on_top_of()
-
-                lblk_sx, lblk_sy, lblk_sz = state.state_data[block].get_location()
-                lblk_gx, lblk_gy, lblk_gz = goal.state_data[block].get_location()
-                if block == blk or (lblk_gx == lblk_sx and lblk_gy == lblk_sy):
-                    diff += abs(gblk_x - sblk_x) + abs(gblk_y - sblk_y) + abs(gblk_z - sblk_z)
-                    # diff += max(abs(gblk_x - sblk_x), abs(gblk_y - sblk_y), abs(gblk_z - sblk_z))
-                else:
-                    diff += abs(gblk_x - lblk_gx) + abs(gblk_y - lblk_gy) + abs(gblk_z - lblk_gz)
-                    # diff += max(abs(gblk_x - lblk_gx), abs(gblk_y - lblk_gy), abs(gblk_z - lblk_gz))
-        else:
-            # Destination is not set
-            top_block = goal.state_data[blk].get_on_top_of()
-            if top_block:
-                if goal.state_data[top_block].is_location_valid():
-                    gx, gy, gz = goal.state_data[top_block].get_location()
-                    gz -= 1  # Subtract 1 since we're below this box
-                    diff += abs(gx - sblk_x) + abs(gy - sblk_y) + abs(gz - sblk_z)
-                    continue
-
-            bottom_block = goal.state_data[blk].get_on_top_of()
-            if bottom_block:
-                if goal.state_data[bottom_block].is_location_valid():
-                    gx, gy, gz = goal.state_data[top_block].get_location()
-                    gz += 1  # Add 1 since we're above this box
-                    diff += abs(gx - sblk_x) + abs(gy - sblk_y) + abs(gz - sblk_z)
-                    continue
-
-            neighbors = goal.state_data[blk].get_neighbors()
-            if neighbors:
-                occupied = dict()
-                for neighbor in neighbors:
-                    if goal.state_data[neighbor].is_location_valid():
-                        gx, gy, gz = goal.state_data[neighbor].get_location()
-                        if not (gx, gy, gz) in occupied:
-                            occupied[(gx, gy, gz)] = True
-
-                # If we have at least one valid location, look for neighbor
-                # NOTE: This can be improved if we have more than one neighbor
-                if len(occupied):
-                    adjacent_moves = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-                    for move in adjacent_moves:
-                        new_x = sblk_x + move[0]
-                        new_y = sblk_y + move[1]
-                        new_z = sblk_z
-
-                        # Skip if move is off the board
-                        if not (0 <= new_x <= 10 and 0 <= new_y <= 10):
-                            continue
-
-                        if not (new_x, new_y, new_z) in occupied:
-                            diff += abs(new_x - sblk_x) + abs(new_y - sblk_y) + abs(new_z - sblk_z)
-                            continue
-
-                # If we get here, we haven't been able to find anything out
-                # Since two blocks need to be side by side, lets use the distance between
-                # NOTE: this can be improved if we have more than one neighbor to find the better one
-                occupied = dict()
-                for inner_blk in goal.state_data:
-                    if goal.state_data[inner_blk].is_location_valid():
-                        ix, iy, iz = goal.state_data[inner_blk].get_location()
-                        if not (ix, iy, iz) in occupied:
-                            occupied[(ix, iy, iz)] = True
-
-                # Let's just put them on the table
-                for move in all_moves:
-                    new_x = sblk_x + move[0]
-                    new_y = sblk_y + move[1]
-                    new_z = 0
-
-                    # Skip if move is off the board
-                    if not (0 <= new_x <= 10 and 0 <= new_y <= 10):
-                        continue
-
-                    if not (new_x, new_y, new_z) in occupied:
-                        occupied[(new_x, new_y, new_z)] = True
-                        # Found this block location, now find neigbor
-                        for a_move in all_moves:
-                            new_2x = new_x + a_move[0]
-                            new_2y = new_y + a_move[1]
-                            new_2z = 0
-
-                            # Skip if move is off the board
-                            if not (0 <= new_2x <= 10 and 0 <= new_2y <= 10):
-                                continue
-
-                            if not (new_2x, new_2y, new_2z) in occupied:
-                                diff += abs(new_x - new_2x) + abs(new_y - new_2y) + abs(new_z - new_2z)
-                                break
-
-    return diff
-
-
-# Function to determine all possible moves/commands for a given state.
-def block_world_actions(relation):
-    actions = []
-
-    grbd_block = relation.get_grabbed_block()
-
-    for blk in list(relation.state_data):
-        blk_x, blk_y, blk_z = relation.state_data[blk].get_location()
-
-        for x_move in all_moves_one_dim:
-            for y_move in all_moves_one_dim:
-                for z_move in all_moves_one_dim:
-
-                    # Check for no change
-                    if x_move == 0 and y_move == 0 and z_move == 0:
-                        continue
-
-                    # Calculate new position (X,Y,Z)
-                    new_x = blk_x + x_move
-                    new_y = blk_y + y_move
-                    new_z = blk_z + z_move
-
-                    # Check for move off of board
-                    if not (BOARD_MIN_X <= new_x <= BOARD_MAX_X and
-                            BOARD_MIN_Y <= new_y <= BOARD_MAX_Y and new_z >= 0):
-                        continue
-
-                    # Initialize variables
-                    slide = blk_z == 0 and new_z == 0
-                    stack = False
-                    table = relation.state_data[blk].get_below() is None
-
-                    # Check the new position against all other blocks for collision and stack
-                    for inner_blk in list(relation.state_data):
-                        if inner_blk == blk:
-                            continue
-
-                        # Get inner block's location
-                        iblk_x, iblk_y, iblk_z = relation.state_data[inner_blk].get_location()
-
-                        # Check for slide collision, exact same X,Y
-                        # Don't care about Z because we assume a stack has block(s) under it
-                        if iblk_x == new_x and iblk_y == new_y:
-                            # Same X, Y means slide collision
-                            slide = False
-                            table = False
-
-                            if iblk_z == new_z:
-                                # Same X, Y and Z
-                                stack = False
-                                break
-
-                            # Same X, Y AND inner_blk immediately below means we can stack
-                            if iblk_z == (new_z - 1) and relation.state_data[blk].get_below() is None:
-                                stack = True
-
-                        # If we found a slide collision AND a valid stack, no need to look further
-                        # Else keep checking because another block may change the overall result
-
-                        # bstaab - debugging
-                        # if not slide and stack:
-                        #     break
-
-                    # If no block is grabbed, potential moves are:
-                    # - slide
-                    # - grab + carry
-                    if grbd_block is None:
-                        if slide:
-                            actions.append([('(command slide {} {} {})'.format(blk, x_move, y_move), 1)])
-
-                        if stack or table:
-                            action = []
-                            if grbd_block is None:
-                                action.append(('(command grab {})'.format(blk), 1))
-
-                            action.append(('(command carry {} {} {} {})'.format(blk, x_move, y_move, z_move), 1))
-                            actions.append(action)
-
-                    # If the current block is grabbed, the only move is
-                    # - carry
-                    elif grbd_block == blk:
-                        if stack or table:
-                            actions.append([('(command carry {} {} {} {})'.format(blk, x_move, y_move, z_move), 1)])
-
-                    # Someother block is grabbed, the potential moves are
-                    # - release_old + slide_new
-                    # - release_old + grab_new + carry_new
-                    else:
-                        if slide:
-                            action = list()
-                            action.append(('(command release {})'.format(grbd_block), 1))
-                            action.append(('(command slide {} {} {})'.format(blk, x_move, y_move), 1))
-                            actions.append(action)
-
-                        if stack or table:
-                            action = list()
-                            action.append(('(command release {})'.format(grbd_block), 1))
-                            action.append(('(command grab {})'.format(blk), 1))
-                            action.append(('(command carry {} {} {} {})'.format(blk, x_move, y_move, z_move), 1))
-                            actions.append(action)
-
-    return actions
-
-
-# Function used to apply a command to a specific state.
-# The original state is copied and left unmodified.  A copy
-# of the modified state will be returned.
-def block_world_take_actions(relation, actions):
-    # Make a copy of the relation
-    tmp_relation = copy.deepcopy(relation)
-    cost = 0
-    update_relation = False
-
-    for command in actions:
-        # command is a string of the form '(command action param1 param2)'
-        tmp_command = copy.copy(command[0])
-        tmp_command = tmp_command.replace('(', '')
-        tmp_command = tmp_command.replace(')', '')
-        sub_string = tmp_command.split()
-        if len(sub_string) < 3:
-            print("ERROR")
-        cmd = sub_string[0].lower()
-        action = sub_string[1].lower()
-        source = sub_string[2].lower()
-
-        if cmd != 'command':
-            print("ERROR: block_world_take_actions - bad command({})".format(command))
-            return
-
-        if action == 'grab':
-            # (command grab block-id)
-            # The pre-conditions are
-            # 1) No block is on top of this block, this is the top block
-            # 2) No other block is grabbed
-            # The post-condition
-            # 1) block-id is grabbed
-            cost += 1
-            grbd_block = tmp_relation.get_grabbed_block()
-            if grbd_block is not None:
-                print("ERROR: Can't grab block({}), block({}) already grabbed".format(source, grbd_block))
-                exit(1)
-
-            source = sub_string[2].lower()
-            if source not in tmp_relation.state_data:
-                print("ERROR: grab block({}) NOT in relation".format(source))
-                exit(1)
-
-            top_block = tmp_relation.state_data[source].get_below()
-            if top_block is not None:
-                print("ERROR: grab block({}) NOT the top block, is below({})".format(source, top_block))
-                exit(1)
-
-            tmp_relation.grab_block(source)
-            continue
-
-        elif action == 'release':
-            # (command release block-id)
-            # The pre-conditions are
-            # 1) Block-id is currently grabbed
-            # The post-condition
-            # that it is no longer grabbed
-            cost += 1
-            if source != tmp_relation.get_grabbed_block():
-                print("ERROR: release block({}) NOT grabbed".format(source))
-                exit(1)
-
-            tmp_relation.release_block(source)
-            continue
-
-        elif action == 'slide':
-            # (command slide block-id deltaX deltaY)
-            # The pre-conditions are
-            # 1) The new location is unoccupied (Not going to verify...to expensive)
-            # 2) The block has height 0
-            # 3) No block currently grabbed
-            # The post-conditions are
-            # 1) The location of block-id is (x+deltax, y+deltay, z)
-            # 2) The blocks with the same initial X,Y are also incrementd
-            #     i.e. if blocks are stacked, the whole stack slides
-            cost += 1
-            update_relation = True
-            grbd_block = tmp_relation.get_grabbed_block()
-            if grbd_block is not None:
-                print("ERROR: Can't SLIDE because block({}) is grabbed".format(grbd_block))
-                exit(1)
-
-            height = tmp_relation.state_data[source].get_height()
-            if height != 0:
-                print("ERROR: Can't SLIDE because block({}) height({}) != 0".format(grbd_block, height))
-                exit(1)
-
-            blk_x, blk_y, blk_z = tmp_relation.state_data[source].get_location()
-            new_x = blk_x + int(sub_string[3])
-            new_y = blk_y + int(sub_string[4])
-            tmp_relation.state_data[source].set_location(new_x, new_y, blk_z)
-
-            top_block = tmp_relation.state_data[source].get_below()
-            while top_block is not None:
-                tblk_x, tblk_y, tblk_z = tmp_relation.state_data[top_block].get_location()
-                if tblk_x != blk_x or tblk_y != blk_y:
-                    print("ERROR - SLIDE on_top_block XY != current block XY")
-                    exit(1)
-
-                tmp_relation.state_data[top_block].set_location(new_x, new_y, tblk_z)
-                top_block = tmp_relation.state_data[top_block].get_below()
-
-        elif action == 'carry':
-            # (command carry block-id deltaX deltaY deltaZ)
-            # The pre-conditions
-            # 1) block-id is currently grabbed
-            # 1) The destination location is empty (Not going to verify...to expensive)
-            # The post-conditions
-            # 1) block-id is now at (x+deltaX, y+deltaY, z+deltaZ)
-            cost += 1
-            update_relation = True
-            if tmp_relation.get_grabbed_block() != source:
-                print("ERROR - CARRY: block({}) not grabbed".format(source))
-                exit(1)
-
-            blk_x, blk_y, blk_z = tmp_relation.state_data[source].get_location()
-            new_x = blk_x + int(sub_string[3])
-            new_y = blk_y + int(sub_string[4])
-            new_z = blk_z + int(sub_string[5])
-            tmp_relation.state_data[source].set_location(new_x, new_y, new_z)
-
-    if update_relation:
-        tmp_relation.remove_all_block_relationships()
-        tmp_relation.find_all_block_relationships()
-
-    return tmp_relation, cost
-
-
-# Function used to estimate the remaining steps from state to goal
-# NOTE: This function calculates the number of incorrect blocks
-#       and assumes they can reach the correct state in one step
-def block_world_heuristic(state, goal):
-    dist_diff = 0
-    neighbor_diff = 0
-
-    # Same blocks must be in both input structures
-    for blk in state.state_data:
-        if state.state_data[blk].get_on_top_of() != goal.state_data[blk].get_on_top_of():
-            neighbor_diff += 1
-
-        if state.state_data[blk].get_neighbors() != goal.state_data[blk].get_neighbors():
-            neighbor_diff += 1
-
-        sblk_x, sblk_y, sblk_z = state.state_data[blk].get_location()
-        gblk_x, gblk_y, gblk_z = goal.state_data[blk].get_location()
-        dist_diff += abs(gblk_x - sblk_x) + abs(gblk_y - sblk_y) + abs(gblk_z - sblk_z)
-
-    return dist_diff + neighbor_diff
-
-
-if __name__ == "__main__":
-    # Local variables to store state data
-    initial_state = r.Relation('initial_state')
-    goal_state = r.Relation('goal_state')
-
-    # Populate local variables
-    setup(initial_state, goal_state)
-
-    # Conditionally print debug information
-    if print_debug_flag:
-        print("-------- INITIAL STATE --------")
-        print(initial_state)
-        print("\n\n-------- GOAL STATE --------")
-        print(goal_state)
-
-    # Verify initial and goal states if flag indicates to do so
-    if validate_flag:
-        # Verify initial state
-        if not initial_state.is_valid_state():
-            exit(1)
-
-        # Verify goal state
-        if not goal_state.is_valid_state():
-            exit(1)
-
-    # Get current time before A*
-    start_time = time.time()
-
-    # Conditionally print debug information
-    if print_debug_flag:
-        print("\n\n-------------------------------")
-        print("Runing Route Planner")
-
-    # Route planner - Perform the A* search and store the results
-    path = aStar.a_star_search(initial_state,
-                               route_planner_actions,
-                               route_planner_take_actions,
-                               # lambda s: route_planner_goal_test(s, goal_state),
-                               lambda s: block_world_goal_test(s, goal_state),
-                               lambda s: route_planner_heuristic(s, goal_state),
-                               start_time,
-                               return_path=True)
-
-    # Conditionally print debug information
-    if print_debug_flag:
-        route_planner_time = time.time()
-        print("Route Planner Finished - steps({}) time({})".format(len(path[0]), (route_planner_time - start_time)))
-        for p in path[0]:
-            print(p)
-        print("-------------------------------")
-        print("\n\nRunning Low Level Search")
-
-    # This is the lower level search
-    lpath = list()
-    num_steps = len(path[0])
-    grabbed_block = path[0][0].grabbed_block
-    for i in range(0, num_steps - 1, 1):
-        # Level 2 planner - Perform the A* search and store the results
-        path[0][i].grabbed_block = grabbed_block
-        ipath = aStar.a_star_search(path[0][i],
-                                    block_world_actions,
-                                    block_world_take_actions,
-                                    lambda s: block_world_goal_test(s, path[0][i+1]),
-                                    lambda s: block_world_heuristic(s, path[0][i+1]),
-                                    start_time,
-                                    return_path=False)
-        lpath.append(ipath)
-        grabbed_block = ipath[1]
-
-    # Get current time after low-level search
-    end_time = time.time()
-
-    # Conditionally print debug information
-    if print_debug_flag:
-        print("Low Level search finished")
-        for lp in lpath:
-            print(lp)
-        print("-------------------------------")
-        print("\nPATH")
-
-    # ALWAYS print low level commands
-    for step_path in lpath:
-        for steps in step_path[0]:
-            if type(steps) is list:
-                for step in steps:
-                    print(step[0])
-
-    # Conditionally print total processing time
-    if print_time_flag:
-        print("Processing Time - {}".format(end_time - start_time))
+import argparse
+import aStar
+import board as bd
+import commands as c
+import cProfile
+import goal as gl
+import low_level as ll
+import profiler
+import relation as r
+import search
+import state_cache as sc
+import sys
+# import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from constants import *
+
+
+# Global flag to determine if the processing time will be
+# printed or not.  This functionality is disabled by default.
+# Use the '-t' command line option to enable (see the 'setup' function)
+print_time_flag = False
+print_debug_flag = False
+validate_flag = False
+
+# Profile of the searches, set by the '-p' command line option (see profiler.py).
+# The low level searches of the worker processes (--jobs) are not in the profile.
+search_profile = None
+
+# With --budget, the time kept for the low level planner is this many times the
+# measured time of one low level search, for each step of the route
+LOW_LEVEL_BUDGET_MARGIN = 2.0
+
+# Low level planners, 'grid' searches the grid positions of the moving block (see low_level.py) and
+# uses 'astar' when it can not plan a step, 'astar' always searches over whole relations
+LOW_LEVEL_PLANNERS = ['grid', 'astar']
+
+
+# Function to setup/initialize the block world.
+# The initial and goal states will be read from a file passed into the script
+# ArgumentParser enforces that a value is passed in for each required parameter
+# NOTE: I am not explicitly validating that the files exist, downstream file
+#       operations will fail if they are not valid
+def setup(initial_state_relation, goal_state_relation):
+    # Get parameters from command line
+    parser = argparse.ArgumentParser(description='CS540: Programming Assignment #2 - NEED TO UPDATE')
+    parser.add_argument('-t', '--time', help='Flag to indicate if processing time will be printed or not',
+                        action="store_true")
+    parser.add_argument('-d', '--debug', help='Flag to enable additional debug messages', action="store_true")
+    parser.add_argument('-v', '--validate', help='Flag to enable initial|goal states', action="store_true")
+    parser.add_argument('-a', '--algorithm', help='Search algorithm used by the route planner',
+                        choices=sorted(search.ALGORITHMS), default='rbfs')
+    parser.add_argument('-w', '--weight', help='Heuristic weight used by weighted A* (wastar)', type=float,
+                        default=search.DEFAULT_WEIGHT)
+    parser.add_argument('-b', '--beam_width', help='Number of nodes kept at each level by beam search (beam)',
+                        type=int, default=search.DEFAULT_BEAM_WIDTH)
+    parser.add_argument('-c', '--heuristic_cache', help='Number of route planner heuristic values cached (0 disables)',
+                        type=int, default=aStar.DEFAULT_HEURISTIC_CACHE_SIZE)
+    parser.add_argument('-B', '--budget', help='Time budget in seconds, the route planner keeps improving the plan '
+                                               'until the budget is spent (anytime weighted A*), the planners fail '
+                                               'if they can not find a plan within the budget', type=float)
+    parser.add_argument('-l', '--low_level', help='Low level planner (grid falls back to astar when needed)',
+                        choices=LOW_LEVEL_PLANNERS, default='grid')
+    parser.add_argument('-n', '--no_cache', help='Always infer the relations from the state files, do not use or '
+                                                 'update the cache of inferred relations', action='store_true')
+    parser.add_argument('-j', '--jobs', help='Number of processes used by the low level planner (1 is sequential)',
+                        type=int, default=1)
+    parser.add_argument('-s', '--stats', help='Print the number of expanded nodes and the processing time (used by '
+                                              'bench/bench.py)', action='store_true')
+    parser.add_argument('-p', '--profile', help='Time and count the search callbacks and nodes, and write the '
+                                                'report to a JSON file (only with --jobs 1)', metavar='JSON_FILE')
+    parser.add_argument('-S', '--board_size', help='Number of columns of the board along X and Y, only the occupied '
+                                                   'locations are stored so large boards cost nothing extra',
+                        type=int, nargs=2, metavar=('X', 'Y'), default=bd.DEFAULT_BOARD.get_size())
+    parser.add_argument('--pstats', help='Run the planners under cProfile and write the statistics to a .pstats file',
+                        metavar='PSTATS_FILE')
+    required_args = parser.add_argument_group('required named arguments')
+    required_args.add_argument('-i', '--initial_state', help='Initial state file name', required=True)
+    required_args.add_argument('-g', '--goal_state', help='Goal state file name', required=True)
+
+    args = parser.parse_args()
+
+    # Define global variables so this function can update them
+    global print_time_flag
+    global print_debug_flag
+    global validate_flag
+
+    if args.time:
+        print_time_flag = True
+
+    if args.debug or args.stats:
+        print_time_flag = True
+
+    if args.debug:
+        print_debug_flag = True
+
+    if args.validate:
+        validate_flag = True
+
+    if args.budget is not None and args.budget <= 0:
+        print("ERROR - budget({}) must be greater than 0".format(args.budget))
+        exit(1)
+
+    if args.jobs < 1:
+        print("ERROR - jobs({}) must be at least 1".format(args.jobs))
+        exit(1)
+
+    # The callbacks of the worker processes would be timed and counted in their own copy of the profile
+    if args.profile and args.jobs > 1:
+        print("ERROR - profile({}) can not be used with jobs({}), the worker processes are not profiled".format(
+            args.profile, args.jobs))
+        exit(1)
+
+    if min(args.board_size) < 1:
+        print("ERROR - board_size({} {}) must be at least 1 by 1".format(*args.board_size))
+        exit(1)
+
+    # Both relations are on the same board, it has to be set before the blocks are loaded
+    board = bd.Board(*args.board_size)
+    initial_state_relation.board = board
+    goal_state_relation.board = board
+
+    # Initialize the relations with information from command line arguments
+    cache_dir = None if args.no_cache else sc.DEFAULT_CACHE_DIR
+    from_cache = sc.get_states_from_files(initial_state_relation, goal_state_relation, args.initial_state,
+                                          args.goal_state, cache_dir)
+    if print_debug_flag and from_cache:
+        print("Relations loaded from the cache")
+
+    return args
+
+
+# Function to determine if a given state is the goal state
+# compiled_goal: goal.CompiledGoal(goal), compares against the precomputed goal values if provided
+def block_world_goal_test(state, goal, compiled_goal=None):
+    if compiled_goal is not None:
+        return compiled_goal.is_goal(state)
+    return state == goal
+
+
+# Function to determine if a given state is the goal state
+# compiled_goal: goal.CompiledGoal(goal), built here if it is not provided
+def route_planner_goal_test(state, goal, compiled_goal=None):
+    if compiled_goal is None:
+        compiled_goal = gl.CompiledGoal(goal)
+
+    if compiled_goal.is_goal(state):
+        return True
+
+    for blk in state.state_data:
+        block = state.state_data[blk]
+        if compiled_goal.block_matches(blk, block):
+            continue
+
+        if not compiled_goal.valid[blk]:
+            if compiled_goal.below[blk] != block.get_below():
+                return False
+            if compiled_goal.on_top_of[blk] != block.get_on_top_of():
+                return False
+            if compiled_goal.neighbor_sets[blk] != set(block.get_neighbors()):
+                return False
+        continue
+
+    # Can't find anything wrong
+    return True
+
+
+# Function to determine all possible moves/commands for a given state.
+def route_planner_actions(relation):
+    actions = []
+
+    # look for floating blocks
+    for blk in list(relation.state_data):
+        # Get the current block location
+        blk_x, blk_y, blk_z = relation.state_data[blk].get_location()
+        if blk_z > 0 and relation.state_data[blk].get_on_top_of() is None:
+            # Block is floating, we can only operate on this one for now
+            for x_move in all_moves_one_dim:
+                for y_move in all_moves_one_dim:
+                    for z_move in all_moves_one_dim:
+                        occupied = False
+                        tmp_x = blk_x + x_move
+                        tmp_y = blk_y + y_move
+                        tmp_z = blk_z + z_move
+
+                        # Check for move off of board
+                        if not relation.board.is_valid(tmp_x, tmp_y, tmp_z):
+                            continue
+
+                        # Make sure new space is not occupied
+                        occupant = relation.get_block_at(tmp_x, tmp_y, tmp_z)
+                        if occupant is not None and occupant != blk:
+                            occupied = True
+
+                        if not occupied:
+                            cost = 1
+                            actions.append((c.Move(blk, tmp_x, tmp_y, tmp_z), cost))
+
+            # Return now
+            return actions
+
+    # stack command
+    # The preconditions are that either|neither block has a block on top of it
+    # Put id1 on top of id2 (command stack block-id1 block-id2).
+    # Put id1 on table (command stack block-id1 table).
+    for blk in list(relation.state_data):
+        # 'stack' only possible for top block (i.e. below == None)
+        if relation.state_data[blk].get_below() is None:
+            # Get the current block location
+            blk_x, blk_y, blk_z = relation.state_data[blk].get_location()
+
+            # Find all other blocks that this one can be stacked on, only the blocks in the columns
+            # around this one are close enough.  They are visited in state_data order.
+            nearby_blocks = []
+            for x_move in all_moves_one_dim:
+                for y_move in all_moves_one_dim:
+                    nearby_blocks.extend(relation.get_column(blk_x + x_move, blk_y + y_move))
+            nearby_blocks.sort(key=relation.block_order.get)
+
+            for inner_blk in nearby_blocks:
+                if blk == inner_blk:
+                    continue
+                if relation.state_data[inner_blk].get_below() is None:
+                    iblk_x, iblk_y, iblk_z = relation.state_data[inner_blk].get_location()
+                    if abs(iblk_x - blk_x) <= 1 and abs(iblk_y - blk_y) <= 1:
+                        height_change = abs(iblk_z + 1 - blk_z)
+                        # +2 for 'grab' and 'release'
+                        # cost = height_change + 2
+                        # NOTE: A cost of one seems to work better for some reason?!
+                        cost = height_change + 1
+                        actions.append((c.Move(blk, iblk_x, iblk_y, (iblk_z + 1)), cost))
+
+            # If height > 0, try to stack on table
+            # NOTE: This might be too much, maybe just find the first open slot?
+            if blk_z > 0:
+                found = False
+                loop_count = 1
+                while not found:
+                    for move in all_moves:
+                        occupied = False
+                        tmp_x = blk_x + (move[0] * loop_count)
+                        tmp_y = blk_y + (move[1] * loop_count)
+                        tmp_z = blk_z - 1
+
+                        # Check for move off of board
+                        if not relation.board.is_on_board(tmp_x, tmp_y):
+                            continue
+
+                        occupant = relation.get_block_at(tmp_x, tmp_y, tmp_z)
+                        if occupant is not None and occupant != blk:
+                            occupied = True
+
+                        if not occupied:
+                            found = True
+                            # cost = blk_z + 2
+                            # actions.append((c.Move(blk, tmp_x, tmp_y, 0), cost))
+                            cost = 1
+                            actions.append((c.Move(blk, tmp_x, tmp_y, tmp_z), cost))
+
+                    loop_count += 1
+                    if loop_count >= 10:
+                        print("LOOP COUNT ERROR")
+                        exit(1)
+
+    # slide-to command
+    # Its preconditions are
+    # (1) that both blocks have height 0
+    # (2) the second block has fewer than four other blocks side-by-side with it.
+    for blk in list(relation.state_data):
+        # Get the current block location
+        blk_x, blk_y, blk_z = relation.state_data[blk].get_location()
+
+        # Can only slide blocks that are on the table (height = 0)
+        if blk_z == 0:
+            for move in all_moves:
+                occupied = False
+                tmp_x = blk_x + move[0]
+                tmp_y = blk_y + move[1]
+
+                # Make sure new position is on the board
+                if relation.board.is_on_board(tmp_x, tmp_y):
+                    # Make sure new position does not collide with any other block
+                    # (the moves never stay in the same column, so every block in the column is another block)
+                    if relation.get_column_height(tmp_x, tmp_y) > 0:
+                        occupied = True
+
+                    if not occupied:
+                        actions.append((c.Move(blk, tmp_x, tmp_y, 0), 1))
+
+    return actions
+
+
+# Function to copy a state before a command is applied to it.
+# The copy shares the unchanged blocks with the original state (see Relation.copy),
+# only the blocks changed by the command are copied.
+def copy_relation(relation):
+    return relation.copy()
+
+
+# Function used to apply a command to a specific state.
+# The original state is copied and left unmodified.  A copy
+# of the modified state will be returned.
+def route_planner_take_actions(relation, command):
+    # command is a (commands.Move, cost) pair
+    tmp_relation = copy_relation(relation)
+    action = command[0].name
+    block = command[0].block
+
+    if action == 'move':
+        # Get current location
+        blk_x, blk_y, blk_z = tmp_relation.state_data[block].get_location()
+
+        # Get new locations
+        new_x = command[0].x
+        new_y = command[0].y
+        new_z = command[0].z
+
+        # Check for slide or stack moves
+        if blk_z == new_z == 0:
+            # SLIDE - old and new location is on the table
+            moved_blocks = [block]
+            upper_block = tmp_relation.state_data[block].get_below()
+            while upper_block is not None:
+                # Set new X,Y location for blocks in this stack
+                ub_height = tmp_relation.state_data[upper_block].get_height()
+                check_location_is_free(tmp_relation, upper_block, new_x, new_y, ub_height)
+                tmp_relation.set_location(upper_block, new_x, new_y, ub_height)
+                moved_blocks.append(upper_block)
+                upper_block = tmp_relation.state_data[upper_block].get_below()
+
+            # Set new X,Y location for this block
+            check_location_is_free(tmp_relation, block, new_x, new_y, new_z)
+            tmp_relation.set_location(block, new_x, new_y, new_z)
+        else:
+            # STACK - old and/or new location is not on the table
+            # Can only move the top block
+            if tmp_relation.state_data[block].get_below() is not None:
+                print("route_planner_take_actions - stack error: not top block")
+                exit(1)
+
+            # If we're moving the top block, update the block below
+            below_block = tmp_relation.state_data[block].get_on_top_of()
+            if below_block is not None:
+                tmp_relation.get_block_for_write(below_block).set_below(None)
+
+            tmp_relation.get_block_for_write(block).set_on_top_of(None)
+            if new_z == 0:
+                tmp_relation.get_block_for_write(block).set_on_top_of(None)
+            else:
+                # Find the top block of the stack this is going on, starting from the first block
+                # of the column in state_data order
+                for inner_blk in sorted(tmp_relation.get_column(new_x, new_y), key=tmp_relation.block_order.get):
+                    if inner_blk == block:
+                        continue
+
+                    top_block = inner_blk
+                    test_block = tmp_relation.state_data[top_block].get_below()
+                    while test_block is not None:
+                        top_block = test_block
+                        test_block = tmp_relation.state_data[top_block].get_below()
+
+                    # A floating block is only on top of the stack if it is right above the top block
+                    if tmp_relation.state_data[top_block].get_height() == new_z - 1:
+                        tmp_relation.get_block_for_write(top_block).set_below(block)
+                        tmp_relation.get_block_for_write(block).set_on_top_of(top_block)
+                    break
+
+            # Set new location
+            check_location_is_free(tmp_relation, block, new_x, new_y, new_z)
+            tmp_relation.set_location(block, new_x, new_y, new_z)
+            moved_blocks = [block]
+    else:
+        print("ERROR - UNKNOWN action({})".format(command[0]))
+        exit(1)
+
+    # If we get here, we must have moved a piece.  Only the moved blocks and the blocks
+    # side by side with their old and new locations have new neighbors.
+    for blk in moved_blocks:
+        tmp_relation.update_neighbors(blk)
+
+    return tmp_relation, command[1]
+
+
+# Function to make sure no other block is at the location a block is moved to
+def check_location_is_free(relation, block, x_pos, y_pos, z_pos):
+    occupant = relation.get_block_at(x_pos, y_pos, z_pos)
+    if occupant is not None and occupant != block:
+        print("ERROR - find_all_neighbors: 2 blocks at exact same location")
+        exit(1)
+
+
+# Function used to estimate the remaining steps from state to goal
+# compiled_goal: goal.CompiledGoal(goal), built here if it is not provided
+def route_planner_heuristic(state, goal, compiled_goal=None):
+    if compiled_goal is None:
+        compiled_goal = gl.CompiledGoal(goal)
+    goal_locations = compiled_goal.locations
+    goal_valid = compiled_goal.valid
+    board = state.board
+
+    diff = 0
+    for blk in state.state_data:
+        # Check to see if block in it's goal state
+        if compiled_goal.block_matches(blk, state.state_data[blk]):
+            continue
+
+        # Get block location from state data
+        sblk_x, sblk_y, sblk_z = state.state_data[blk].get_location()
+
+        # Next step based on goal block being set
+        if goal_valid[blk]:
+            gblk_x, gblk_y, gblk_z = goal_locations[blk]
+
+            # Check for block on table
+            if sblk_z == 0:
+                # Block is on the table, add street distance to destination
+                diff += abs(gblk_x - sblk_x) + abs(gblk_y - sblk_y) + abs(gblk_z - sblk_z)
+                # diff += max(abs(gblk_x - sblk_x), abs(gblk_y - sblk_y), abs(gblk_z - sblk_z))
+            else:
+                # Block is on another block.
+                # Find the bottom block, then get the distance from it's goal to block goal
+                block = blk
+                lower_block = state.state_data[blk].get_on_top_of()
+                while lower_block is not None:
+                    block = lower_block
+                    lower_block = state.state_data[block].get_on_top_of()
+
+                lblk_sx, lblk_sy, lblk_sz = state.state_data[block].get_location()
+                lblk_gx, lblk_gy, lblk_gz = goal_locations[block]
+                if block == blk or (lblk_gx == lblk_sx and lblk_gy == lblk_sy):
+                    diff += abs(gblk_x - sblk_x) + abs(gblk_y - sblk_y) + abs(gblk_z - sblk_z)
+                    # diff += max(abs(gblk_x - sblk_x), abs(gblk_y - sblk_y), abs(gblk_z - sblk_z))
+                else:
+                    diff += abs(gblk_x - lblk_gx) + abs(gblk_y - lblk_gy) + abs(gblk_z - lblk_gz)
+                    # diff += max(abs(gblk_x - lblk_gx), abs(gblk_y - lblk_gy), abs(gblk_z - lblk_gz))
+        else:
+            # Destination is not set
+            top_block = compiled_goal.on_top_of[blk]
+            if top_block:
+                if goal_valid[top_block]:
+                    gx, gy, gz = goal_locations[top_block]
+                    gz -= 1  # Subtract 1 since we're below this box
+                    diff += abs(gx - sblk_x) + abs(gy - sblk_y) + abs(gz - sblk_z)
+                    continue
+
+            bottom_block = compiled_goal.on_top_of[blk]
+            if bottom_block:
+                if goal_valid[bottom_block]:
+                    gx, gy, gz = goal_locations[top_block]
+                    gz += 1  # Add 1 since we're above this box
+                    diff += abs(gx - sblk_x) + abs(gy - sblk_y) + abs(gz - sblk_z)
+                    continue
+
+            neighbors = compiled_goal.neighbors[blk]
+            if neighbors:
+                occupied = compiled_goal.neighbor_locations[blk]
+
+                # If we have at least one valid location, look for neighbor
+                # NOTE: This can be improved if we have more than one neighbor
+                if len(occupied):
+                    adjacent_moves = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+                    for move in adjacent_moves:
+                        new_x = sblk_x + move[0]
+                        new_y = sblk_y + move[1]
+                        new_z = sblk_z
+
+                        # Skip if move is off the board
+                        if not board.is_on_board(new_x, new_y):
+                            continue
+
+                        if not (new_x, new_y, new_z) in occupied:
+                            diff += abs(new_x - sblk_x) + abs(new_y - sblk_y) + abs(new_z - sblk_z)
+                            continue
+
+                # If we get here, we haven't been able to find anything out
+                # Since two blocks need to be side by side, lets use the distance between
+                # NOTE: this can be improved if we have more than one neighbor to find the better one
+                # The locations taken here are kept apart from the goal locations, so the goal
+                # locations are not copied for every block
+                occupied = compiled_goal.occupied
+                taken = set()
+
+                # Let's just put them on the table
+                for move in all_moves:
+                    new_x = sblk_x + move[0]
+                    new_y = sblk_y + move[1]
+                    new_z = 0
+
+                    # Skip if move is off the board
+                    if not board.is_on_board(new_x, new_y):
+                        continue
+
+                    if not ((new_x, new_y, new_z) in occupied or (new_x, new_y, new_z) in taken):
+                        taken.add((new_x, new_y, new_z))
+                        # Found this block location, now find neigbor
+                        for a_move in all_moves:
+                            new_2x = new_x + a_move[0]
+                            new_2y = new_y + a_move[1]
+                            new_2z = 0
+
+                            # Skip if move is off the board
+                            if not board.is_on_board(new_2x, new_2y):
+                                continue
+
+                            if not ((new_2x, new_2y, new_2z) in occupied or (new_2x, new_2y, new_2z) in taken):
+                                diff += abs(new_x - new_2x) + abs(new_y - new_2y) + abs(new_z - new_2z)
+                                break
+
+    return diff
+
+
+# Function to determine all possible moves/commands for a given state.
+def block_world_actions(relation):
+    actions = []
+
+    grbd_block = relation.get_grabbed_block()
+
+    for blk in list(relation.state_data):
+        blk_x, blk_y, blk_z = relation.state_data[blk].get_location()
+
+        for x_move in all_moves_one_dim:
+            for y_move in all_moves_one_dim:
+                for z_move in all_moves_one_dim:
+
+                    # Check for no change
+                    if x_move == 0 and y_move == 0 and z_move == 0:
+                        continue
+
+                    # Calculate new position (X,Y,Z)
+                    new_x = blk_x + x_move
+                    new_y = blk_y + y_move
+                    new_z = blk_z + z_move
+
+                    # Check for move off of board
+                    if not relation.board.is_valid(new_x, new_y, new_z):
+                        continue
+
+                    # Initialize variables
+                    slide = blk_z == 0 and new_z == 0
+                    stack = False
+                    table = relation.state_data[blk].get_below() is None
+
+                    # Check the new position against all other blocks for collision and stack
+                    # Check for slide collision, any other block with the exact same X,Y
+                    # Don't care about Z because we assume a stack has block(s) under it
+                    column_height = relation.get_column_height(new_x, new_y)
+                    if x_move == 0 and y_move == 0:
+                        # This block is in the column, it does not collide with itself
+                        column_height -= 1
+
+                    if column_height > 0:
+                        # Same X, Y means slide collision
+                        slide = False
+                        table = False
+
+                        occupant = relation.get_block_at(new_x, new_y, new_z)
+                        lower_block = relation.get_block_at(new_x, new_y, new_z - 1)
+                        if occupant is not None:
+                            # Same X, Y and Z
+                            stack = False
+                        elif lower_block is not None and lower_block != blk and \
+                                relation.state_data[blk].get_below() is None:
+                            # Same X, Y AND another block immediately below means we can stack
+                            stack = True
+
+                    # If no block is grabbed, potential moves are:
+                    # - slide
+                    # - grab + carry
+                    if grbd_block is None:
+                        if slide:
+                            actions.append([(c.Slide(blk, x_move, y_move), 1)])
+
+                        if stack or table:
+                            action = []
+                            if grbd_block is None:
+                                action.append((c.Grab(blk), 1))
+
+                            action.append((c.Carry(blk, x_move, y_move, z_move), 1))
+                            actions.append(action)
+
+                    # If the current block is grabbed, the only move is
+                    # - carry
+                    elif grbd_block == blk:
+                        if stack or table:
+                            actions.append([(c.Carry(blk, x_move, y_move, z_move), 1)])
+
+                    # Someother block is grabbed, the potential moves are
+                    # - release_old + slide_new
+                    # - release_old + grab_new + carry_new
+                    else:
+                        if slide:
+                            action = list()
+                            action.append((c.Release(grbd_block), 1))
+                            action.append((c.Slide(blk, x_move, y_move), 1))
+                            actions.append(action)
+
+                        if stack or table:
+                            action = list()
+                            action.append((c.Release(grbd_block), 1))
+                            action.append((c.Grab(blk), 1))
+                            action.append((c.Carry(blk, x_move, y_move, z_move), 1))
+                            actions.append(action)
+
+    return actions
+
+
+# Function used to apply a command to a specific state.
+# The original state is copied and left unmodified.  A copy
+# of the modified state will be returned.
+def block_world_take_actions(relation, actions):
+    # Make a copy of the relation
+    tmp_relation = copy_relation(relation)
+    cost = 0
+
+    for command in actions:
+        # command is a (commands.Grab|Release|Slide|Carry, cost) pair
+        action = command[0].name
+        source = command[0].block
+
+        if action == 'grab':
+            # (command grab block-id)
+            # The pre-conditions are
+            # 1) No block is on top of this block, this is the top block
+            # 2) No other block is grabbed
+            # The post-condition
+            # 1) block-id is grabbed
+            cost += 1
+            grbd_block = tmp_relation.get_grabbed_block()
+            if grbd_block is not None:
+                print("ERROR: Can't grab block({}), block({}) already grabbed".format(source, grbd_block))
+                exit(1)
+
+            if source not in tmp_relation.state_data:
+                print("ERROR: grab block({}) NOT in relation".format(source))
+                exit(1)
+
+            top_block = tmp_relation.state_data[source].get_below()
+            if top_block is not None:
+                print("ERROR: grab block({}) NOT the top block, is below({})".format(source, top_block))
+                exit(1)
+
+            tmp_relation.grab_block(source)
+            continue
+
+        elif action == 'release':
+            # (command release block-id)
+            # The pre-conditions are
+            # 1) Block-id is currently grabbed
+            # The post-condition
+            # that it is no longer grabbed
+            cost += 1
+            if source != tmp_relation.get_grabbed_block():
+                print("ERROR: release block({}) NOT grabbed".format(source))
+                exit(1)
+
+            tmp_relation.release_block(source)
+            continue
+
+        elif action == 'slide':
+            # (command slide block-id deltaX deltaY)
+            # The pre-conditions are
+            # 1) The new location is unoccupied (Not going to verify...to expensive)
+            # 2) The block has height 0
+            # 3) No block currently grabbed
+            # The post-conditions are
+            # 1) The location of block-id is (x+deltax, y+deltay, z)
+            # 2) The blocks with the same initial X,Y are also incrementd
+            #     i.e. if blocks are stacked, the whole stack slides
+            cost += 1
+            grbd_block = tmp_relation.get_grabbed_block()
+            if grbd_block is not None:
+                print("ERROR: Can't SLIDE because block({}) is grabbed".format(grbd_block))
+                exit(1)
+
+            height = tmp_relation.state_data[source].get_height()
+            if height != 0:
+                print("ERROR: Can't SLIDE because block({}) height({}) != 0".format(grbd_block, height))
+                exit(1)
+
+            blk_x, blk_y, blk_z = tmp_relation.state_data[source].get_location()
+            new_x = blk_x + command[0].delta_x
+            new_y = blk_y + command[0].delta_y
+
+            # Find the stack before moving, moving a block detaches it from the block above
+            stack = [source]
+            top_block = tmp_relation.state_data[source].get_below()
+            while top_block is not None:
+                tblk_x, tblk_y, tblk_z = tmp_relation.state_data[top_block].get_location()
+                if tblk_x != blk_x or tblk_y != blk_y:
+                    print("ERROR - SLIDE on_top_block XY != current block XY")
+                    exit(1)
+
+                stack.append(top_block)
+                top_block = tmp_relation.state_data[top_block].get_below()
+
+            # Move the stack from the bottom up
+            for stack_block in stack:
+                tblk_x, tblk_y, tblk_z = tmp_relation.state_data[stack_block].get_location()
+                tmp_relation.move_block(stack_block, new_x, new_y, tblk_z)
+
+        elif action == 'carry':
+            # (command carry block-id deltaX deltaY deltaZ)
+            # The pre-conditions
+            # 1) block-id is currently grabbed
+            # 1) The destination location is empty (Not going to verify...to expensive)
+            # The post-conditions
+            # 1) block-id is now at (x+deltaX, y+deltaY, z+deltaZ)
+            cost += 1
+            if tmp_relation.get_grabbed_block() != source:
+                print("ERROR - CARRY: block({}) not grabbed".format(source))
+                exit(1)
+
+            blk_x, blk_y, blk_z = tmp_relation.state_data[source].get_location()
+            new_x = blk_x + command[0].delta_x
+            new_y = blk_y + command[0].delta_y
+            new_z = blk_z + command[0].delta_z
+            tmp_relation.move_block(source, new_x, new_y, new_z)
+
+    return tmp_relation, cost
+
+
+# Function used to estimate the remaining steps from state to goal
+# NOTE: This function calculates the number of incorrect blocks
+#       and assumes they can reach the correct state in one step
+# compiled_goal: goal.CompiledGoal(goal), built here if it is not provided
+def block_world_heuristic(state, goal, compiled_goal=None):
+    if compiled_goal is None:
+        compiled_goal = gl.CompiledGoal(goal)
+    goal_on_top_of = compiled_goal.on_top_of
+    goal_neighbors = compiled_goal.neighbors
+    goal_locations = compiled_goal.locations
+    dist_diff = 0
+    neighbor_diff = 0
+
+    # Same blocks must be in both input structures
+    for blk, block in state.state_data.items():
+        if block.on_top_of != goal_on_top_of[blk]:
+            neighbor_diff += 1
+
+        if block.side_by_side != goal_neighbors[blk]:
+            neighbor_diff += 1
+
+        sblk_x, sblk_y, sblk_z = block.get_location()
+        gblk_x, gblk_y, gblk_z = goal_locations[blk]
+        dist_diff += abs(gblk_x - sblk_x) + abs(gblk_y - sblk_y) + abs(gblk_z - sblk_z)
+
+    return dist_diff + neighbor_diff
+
+
+# Function to run the route planner.  The route planner finds the sequence of
+# block moves (states) from the initial state to the goal state.
+# algorithm: Search algorithm name (see search.ALGORITHMS), weight/beam_width are passed to the search
+# heuristic_cache_size: Number of heuristic values cached during the search, 0 disables the cache
+# budget: Total seconds (from start_time) for the route and low level planners, None for no budget.
+#         With a budget the route planner runs anytime weighted A* (algorithm and weight are ignored)
+#         and stops improving the route when the remaining time is needed by the low level planner.
+# low_level_planner: Low level planner that is timed to split the budget (see LOW_LEVEL_PLANNERS)
+# Returns the search result, ([states], cost)
+def route_plan(initial_state, goal_state, start_time, recursive=False, algorithm='rbfs',
+               weight=search.DEFAULT_WEIGHT, beam_width=search.DEFAULT_BEAM_WIDTH,
+               heuristic_cache_size=aStar.DEFAULT_HEURISTIC_CACHE_SIZE, budget=None, low_level_planner='grid'):
+    compiled_goal = gl.CompiledGoal(goal_state)
+    heuristic = lambda s: route_planner_heuristic(s, goal_state, compiled_goal)
+    if heuristic_cache_size > 0:
+        heuristic = aStar.HeuristicCache(heuristic, heuristic_cache_size, lambda s: s.get_state_key())
+
+    options = {}
+    if budget is not None:
+        algorithm = 'anytime'
+        weight = search.DEFAULT_ANYTIME_WEIGHT
+        segment_times = []
+
+        # Called for every improved route.  The low level search of the first route step is timed
+        # once, and enough of the budget is kept to run it for every step of the new route.
+        def route_found(states, cost):
+            if not segment_times and len(states) > 1:
+                segment_start = time.time()
+                low_level_segment(copy_relation(states[0]), states[1], states[0].grabbed_block, start_time,
+                                  planner=low_level_planner, deadline=start_time + budget)
+                segment_times.append(time.time() - segment_start)
+
+            reserve = 0.0
+            if segment_times:
+                reserve = LOW_LEVEL_BUDGET_MARGIN * segment_times[0] * (len(states) - 1)
+            if print_debug_flag:
+                print("Route found - cost({}) steps({}) time({}) low level reserve({})".format(
+                    cost, len(states), time.time() - start_time, reserve))
+            return start_time + budget - reserve
+
+        options = {'deadline': start_time + budget, 'solution_func': route_found}
+
+    if algorithm != 'rbfs':
+        path = search.search(initial_state,
+                             route_planner_actions,
+                             route_planner_take_actions,
+                             lambda s: block_world_goal_test(s, goal_state, compiled_goal),
+                             heuristic,
+                             algorithm=algorithm,
+                             return_path=True,
+                             weight=weight,
+                             beam_width=beam_width,
+                             key_func=lambda s: s.get_state_key(),
+                             **options)
+    else:
+        # Route planner - Perform the A* search and store the results
+        path = aStar.a_star_search(initial_state,
+                                   route_planner_actions,
+                                   route_planner_take_actions,
+                                   # lambda s: route_planner_goal_test(s, goal_state),
+                                   lambda s: block_world_goal_test(s, goal_state, compiled_goal),
+                                   heuristic,
+                                   start_time,
+                                   return_path=True,
+                                   recursive=recursive,
+                                   profile=search_profile)
+
+    if print_debug_flag and heuristic_cache_size > 0:
+        print("Route Planner heuristic cache - hits({}) misses({})".format(heuristic.hits, heuristic.misses))
+    return path
+
+
+# Function to determine if applying the low level actions to a state gives the goal state
+def low_level_reaches_goal(state, actions, compiled_goal):
+    for action in actions:
+        if action is not None:
+            state, cost = block_world_take_actions(state, action)
+    return compiled_goal.is_goal(state)
+
+
+# Function to solve the low level search between two consecutive route planner states.
+# grabbed_block is the block that is grabbed at the start, it is stored in 'start'.
+# planner: One of LOW_LEVEL_PLANNERS
+# deadline: time.time() value (see --budget), the search fails once it is reached.  None uses the fixed
+#           time limits of aStar.py.
+# This is a module level function so it can also run in a worker process (see parallel_low_level_segments).
+# Returns (the A* result ([actions], grabbed_block) or ("failure", inf), heuristic cache hits,
+#          heuristic cache misses)
+def low_level_segment(start, goal, grabbed_block, start_time, recursive=False, heuristic_cache_size=0,
+                      planner='grid', deadline=None):
+    start.grabbed_block = grabbed_block
+    compiled_goal = gl.CompiledGoal(goal)
+    if planner == 'grid':
+        ipath = ll.plan_segment(start, goal, deadline)
+        if ipath is not None and low_level_reaches_goal(start, ipath[0], compiled_goal):
+            return ipath, 0, 0
+        if print_debug_flag:
+            print("Low Level grid planner failed, using A*")
+
+    # Each pair of states has a different goal, so each search gets its own cache
+    heuristic = lambda s: block_world_heuristic(s, goal, compiled_goal)
+    if heuristic_cache_size > 0:
+        heuristic = aStar.HeuristicCache(heuristic, heuristic_cache_size, lambda s: s.get_state_key())
+
+    # Level 2 planner - Perform the A* search and store the results
+    ipath = aStar.a_star_search(start,
+                                block_world_actions,
+                                block_world_take_actions,
+                                lambda s: block_world_goal_test(s, goal, compiled_goal),
+                                heuristic,
+                                start_time,
+                                return_path=False,
+                                recursive=recursive,
+                                profile=search_profile,
+                                deadline=deadline)
+
+    if heuristic_cache_size > 0:
+        return ipath, heuristic.hits, heuristic.misses
+    return ipath, 0, 0
+
+
+# Function to solve the low level search between two route planner states in a worker process.
+# A worker process counts the expanded nodes (--stats) in its own copy of the counters, so the nodes
+# the search expanded are returned with the result and added to the counters of the main process.
+# Returns (low_level_segment result, [block_world_actions expansions, low_level.moves expansions])
+def counted_low_level_segment(*args):
+    counters = [block_world_actions, ll.moves]
+    before = [counter.expanded if isinstance(counter, search.ActionsCounter) else 0 for counter in counters]
+    result = low_level_segment(*args)
+    return result, [counter.expanded - expanded if isinstance(counter, search.ActionsCounter) else 0
+                    for counter, expanded in zip(counters, before)]
+
+
+# Function to add the nodes expanded by a worker process (see counted_low_level_segment) to the counters
+def add_expanded(expanded):
+    for counter, count in zip([block_world_actions, ll.moves], expanded):
+        if isinstance(counter, search.ActionsCounter):
+            counter.expanded += count
+
+
+# Function to guess which block is grabbed after the low level search between two route planner states.
+# The low level planner usually ends a route step still holding the block the step moved, when
+# a whole stack slides (more than one block moves) nothing is grabbed.
+def predict_grabbed_block(state, next_state):
+    moved_blocks = [blk for blk in state.state_data
+                    if state.state_data[blk].get_location() != next_state.state_data[blk].get_location()]
+    if len(moved_blocks) == 1:
+        return moved_blocks[0]
+    return None
+
+
+# Function to run the low level planner.  For each pair of consecutive route planner states
+# find the grab/carry/slide/release commands that move between them.
+# This is a generator, the result of a pair is yielded as soon as it is solved (in order), so the
+# commands of the first pairs can be used while the next pairs are being solved.
+# heuristic_cache_size: Number of heuristic values cached by each search, 0 disables the cache
+# jobs: Number of worker processes, more than 1 solves the pairs in parallel (see parallel_low_level_segments)
+# planner: One of LOW_LEVEL_PLANNERS
+# deadline: time.time() value (see --budget), None uses the fixed time limits of aStar.py
+# Yields the A* result, ([actions], grabbed_block), for each pair of states.  If a pair is not solved
+# before the deadline ("failure", inf) is yielded for that pair and the pairs after it are not solved.
+def low_level_segments(path, start_time, recursive=False, heuristic_cache_size=0, jobs=1, planner='grid',
+                       deadline=None):
+    if jobs > 1 and len(path) > 2:
+        yield from parallel_low_level_segments(path, start_time, recursive, heuristic_cache_size, jobs, planner,
+                                               deadline)
+        return
+
+    num_steps = len(path)
+    grabbed_block = path[0].grabbed_block
+    hits = 0
+    misses = 0
+    for i in range(0, num_steps - 1, 1):
+        ipath, ihits, imisses = low_level_segment(path[i], path[i+1], grabbed_block, start_time, recursive,
+                                                  heuristic_cache_size, planner, deadline)
+        grabbed_block = ipath[1]
+        hits += ihits
+        misses += imisses
+        yield ipath
+        if ipath[0] == "failure":
+            return
+
+    if print_debug_flag and heuristic_cache_size > 0:
+        print("Low Level heuristic cache - hits({}) misses({})".format(hits, misses))
+
+
+# Function to run the low level planner (see low_level_segments) and wait for every pair.
+# Returns a list with the A* result, ([actions], grabbed_block), for each pair of states
+def low_level_plan(path, start_time, recursive=False, heuristic_cache_size=0, jobs=1, planner='grid',
+                   deadline=None):
+    return list(low_level_segments(path, start_time, recursive, heuristic_cache_size, jobs, planner, deadline))
+
+
+# Function to run the low level planner with a pool of worker processes.
+# The only thing a pair of states needs from the previous pair is the grabbed block, so every
+# pair is solved at the same time using the grabbed block from predict_grabbed_block.
+# The results are then put back together in order, and a pair that started with the wrong
+# grabbed block is solved again with the correct one.  The plan is the same as the sequential plan.
+# Like low_level_segments, the result of a pair is yielded as soon as it and the pairs before it are done.
+# The expanded nodes (--stats) of the results that are used are added to the counters, a pair that is
+# solved again is counted by the main process.
+def parallel_low_level_segments(path, start_time, recursive, heuristic_cache_size, jobs, planner, deadline=None):
+    num_steps = len(path)
+    guesses = [path[0].grabbed_block] + [predict_grabbed_block(path[i-1], path[i]) for i in range(1, num_steps - 1)]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(counted_low_level_segment, path[i], path[i+1], guesses[i], start_time,
+                                   recursive, heuristic_cache_size, planner, deadline)
+                   for i in range(num_steps - 1)]
+
+        # Fix-up pass - the grabbed block is only known once the previous pair is solved
+        grabbed_block = path[0].grabbed_block
+        hits = 0
+        misses = 0
+        num_resolved = 0
+        for i in range(0, num_steps - 1, 1):
+            if guesses[i] == grabbed_block:
+                path[i].grabbed_block = grabbed_block
+                result, expanded = futures[i].result()
+                add_expanded(expanded)
+            else:
+                futures[i].cancel()
+                result = low_level_segment(path[i], path[i+1], grabbed_block, start_time, recursive,
+                                           heuristic_cache_size, planner, deadline)
+                num_resolved += 1
+            ipath, ihits, imisses = result
+            grabbed_block = ipath[1]
+            hits += ihits
+            misses += imisses
+            yield ipath
+            if ipath[0] == "failure":
+                for future in futures[i+1:]:
+                    future.cancel()
+                return
+
+    if print_debug_flag:
+        print("Low Level parallel search - jobs({}) pairs({}) solved again({})".format(jobs, num_steps - 1,
+                                                                                      num_resolved))
+        if heuristic_cache_size > 0:
+            print("Low Level heuristic cache - hits({}) misses({})".format(hits, misses))
+
+
+if __name__ == "__main__":
+    # Local variables to store state data
+    initial_state = r.Relation('initial_state')
+    goal_state = r.Relation('goal_state')
+
+    # Populate local variables
+    args = setup(initial_state, goal_state)
+
+    # Conditionally print debug information
+    if print_debug_flag:
+        print("-------- INITIAL STATE --------")
+        print(initial_state)
+        print("\n\n-------- GOAL STATE --------")
+        print(goal_state)
+
+    # Verify initial and goal states if flag indicates to do so
+    if validate_flag:
+        # Verify initial state
+        if not initial_state.is_valid_state():
+            exit(1)
+
+        # Verify goal state
+        if not goal_state.is_valid_state():
+            exit(1)
+
+    # The profile times every callback, the planners look the callbacks up by name so the timed
+    # callbacks replace them for this run.  The A* searches also record the depth of the expanded nodes.
+    if args.profile:
+        search_profile = profiler.SearchProfile(lambda s: s.get_state_key())
+        route_planner_actions = search_profile.wrap_actions('route_planner_actions', route_planner_actions)
+        route_planner_take_actions = search_profile.wrap_take_action('route_planner_take_actions',
+                                                                     route_planner_take_actions)
+        route_planner_heuristic = search_profile.wrap('route_planner_heuristic', route_planner_heuristic)
+        block_world_actions = search_profile.wrap_actions('block_world_actions', block_world_actions)
+        block_world_take_actions = search_profile.wrap_take_action('block_world_take_actions',
+                                                                   block_world_take_actions)
+        block_world_goal_test = search_profile.wrap('block_world_goal_test', block_world_goal_test)
+        block_world_heuristic = search_profile.wrap('block_world_heuristic', block_world_heuristic)
+        ll.moves = search_profile.wrap('low_level.moves', ll.moves)
+
+    # Every call to an actions function is one node expansion.  The planners look the actions functions
+    # (and the grid low level planner its moves function) up by name, so the counters replace them for this run.
+    if args.stats:
+        route_planner_actions = search.ActionsCounter(route_planner_actions)
+        block_world_actions = search.ActionsCounter(block_world_actions)
+        ll.moves = search.ActionsCounter(ll.moves)
+
+    code_profile = None
+    if args.pstats:
+        code_profile = cProfile.Profile()
+        code_profile.enable()
+
+    # Get current time before A*
+    start_time = time.time()
+
+    # Conditionally print debug information
+    if print_debug_flag:
+        print("\n\n-------------------------------")
+        print("Runing Route Planner")
+
+    # Route planner - Perform the A* search and store the results
+    path = route_plan(initial_state, goal_state, start_time, algorithm=args.algorithm, weight=args.weight,
+                      beam_width=args.beam_width, heuristic_cache_size=args.heuristic_cache,
+                      budget=args.budget, low_level_planner=args.low_level)
+    deadline = None if args.budget is None else start_time + args.budget
+    if path[0] == "failure":
+        if deadline is not None and time.time() > deadline:
+            print("ERROR - Route planner did not find a solution within the budget({})".format(args.budget))
+        else:
+            print("ERROR - Route planner did not find a solution")
+        exit(1)
+
+    # Conditionally print debug information
+    if print_debug_flag:
+        route_planner_time = time.time()
+        print("Route Planner Finished - steps({}) time({})".format(len(path[0]), (route_planner_time - start_time)))
+        for p in path[0]:
+            print(p)
+        print("-------------------------------")
+        print("\n\nRunning Low Level Search")
+
+    # This is the lower level search.  The commands of each pair of route planner states are printed
+    # (and flushed) as soon as the pair is solved, with debug messages every pair is solved first.
+    segments = low_level_segments(path[0], start_time, jobs=args.jobs, planner=args.low_level, deadline=deadline)
+    if print_debug_flag:
+        segments = list(segments)
+        print("Low Level search finished")
+        for lp in segments:
+            print(lp)
+        print("-------------------------------")
+        print("\nPATH")
+
+    # ALWAYS print low level commands
+    num_commands = 0
+    first_command_time = None
+    for step_path in segments:
+        if step_path[0] == "failure":
+            if deadline is not None and time.time() > deadline:
+                print("ERROR - Low Level planner did not find a solution within the budget({})".format(args.budget))
+            else:
+                print("ERROR - Low Level planner did not find a solution")
+            exit(1)
+        for steps in step_path[0]:
+            if type(steps) is list:
+                for step in steps:
+                    print(c.format_command(step[0]))
+                    num_commands += 1
+        sys.stdout.flush()
+        if first_command_time is None and num_commands > 0:
+            first_command_time = time.time()
+
+    # Get current time after low-level search
+    end_time = time.time()
+
+    if code_profile is not None:
+        code_profile.disable()
+        code_profile.dump_stats(args.pstats)
+
+    if search_profile is not None:
+        search_profile.solution_depth = num_commands
+        search_profile.write_json(args.profile, end_time - start_time)
+
+    # Conditionally print the number of expanded nodes and the total processing time
+    if args.stats:
+        print("Nodes Expanded - {}".format(route_planner_actions.expanded + block_world_actions.expanded +
+                                                ll.moves.expanded))
+        if first_command_time is not None:
+            print("First Command Time - {}".format(first_command_time - start_time))
+    if print_time_flag:
+        print("Processing Time - {}".format(end_time - start_time))
@@ -1,110 +1,316 @@
-import time
-
-
-# Maximum amount of time the program can run
-# The overall timelimit is 60 minutes (3600 seconds)
-# I'm allocating 57.5 minutes (3450 seconds) to ROUTE PLANNER
-# and the remaining 5 minutes to the LOW_LEVEL PLANNER
-# NOTE: These are total time from start of test
-MAX_TIME_IN_SEC_ROUTE_PLANNERR = 3450
-MAX_TIME_IN_SEC_LOW_LEVEL = 3600
-
-
-# A structure used to store A* search data
-class Node:
-    # Function used to initialize object
-    def __init__(self, state, start_time=None, action=None, f=0, g=0, h=0):
-        self.state = state              # A specific state in the search space
-        self.action = action            # An action used to get to this state
-        self.start_time = start_time    # time.time value for start
-        self.g = g                      # Cost to get to current state
-        self.h = h                      # Heuristic value, estimated cost to goal
-        self.f = f                      # Estimated total path cost (f = g + h)
-
-    # Function to display the contents of the structure when printed
-    def __repr__(self):
-        return "Node[" + \
-                "\n\tState " + repr(self.state) + \
-                "\n\tAction(" + repr(self.action) + ")" + \
-                "\n\tStart Time(" + repr(self.start_time) + ")" + \
-                "\n\tg(" + repr(self.g) + ")" + \
-                "\n\th(" + repr(self.h) + ")" + \
-                "\n\tf(" + repr(self.f) + ")]"
-
-
-# Defines a function to recursively process a parent node
-def a_star_recursive(parent_node, actions_func, take_action_func, goal_test_func, heuristic_func, return_path, f_max):
-    timeout = False
-    if return_path:
-        max_time = MAX_TIME_IN_SEC_ROUTE_PLANNERR
-    else:
-        max_time = MAX_TIME_IN_SEC_LOW_LEVEL
-
-    if (time.time() - parent_node.start_time) > max_time:
-        timeout = True
-        # print("****** PROGRAM TIMEOUT ******")
-
-    # Check for goal state
-    if goal_test_func(parent_node.state) or timeout:
-        if return_path:
-            return [parent_node.state], parent_node.g
-        else:
-            return [parent_node.action], parent_node.state.grabbed_block
-
-    # Get all actions for the current state
-    actions = actions_func(parent_node.state)
-
-    # Return if there are no actions for the current state
-    if not actions:
-        return "failure", float('inf')
-
-    # For each action, apply to current state, determine new path info and store
-    children = []
-    for action in actions:
-        (child_state, step_cost) = take_action_func(parent_node.state, action)
-        g = parent_node.g + step_cost
-        h = heuristic_func(child_state)
-        # f = max(h+g, parent_node.f)
-        # NOTE: This seems to work better, not sure why
-        f = h + g
-        child_node = Node(state=child_state, start_time=parent_node.start_time, action=action, f=f, g=g, h=h)
-        children.append(child_node)
-
-    # Process each child state discovered from previous step
-    while True:
-        # Sort 'children' in ascending order of estimated total path cost (f)
-        children.sort(key=lambda n: n.f)
-
-        # Get best child from sorted list
-        best_child = children[0]
-        if best_child.f > f_max:
-            return "failure", best_child.f
-
-        # Get next best child from sorted list
-        # Use 'inf' if there is not a next best child
-        next_best_child = children[1].f if len(children) > 1 else float('inf')
-
-        # Process the best child and update its estimated total path cost (f) with the result
-        result, best_child.f = a_star_recursive(best_child, actions_func, take_action_func, goal_test_func,
-                                                heuristic_func, return_path, min(f_max, next_best_child))
-        if result is not "failure":
-            if return_path:
-                result.insert(0, parent_node.state)
-            else:
-                result.insert(0, parent_node.action)
-            return result, best_child.f
-
-
-# This is the entry point for the A* search.  It bundles the input data in the format
-# expected by the recursive a* search function
-def a_star_search(start_state, actions_func, take_action_func, goal_test_func,
-                  heuristic_func, starting_time, return_path=True):
-    h = heuristic_func(start_state)
-    start_node = Node(state=start_state, start_time=starting_time, action=None, f=0+h, g=0, h=h)
-    return a_star_recursive(start_node,
-                            actions_func,
-                            take_action_func,
-                            goal_test_func,
-                            heuristic_func,
-                            return_path,
-                            float('inf'))
+import heapq
+import time
+from collections import OrderedDict
+
+
+# Maximum amount of time the program can run
+# The overall timelimit is 60 minutes (3600 seconds)
+# I'm allocating 57.5 minutes (3450 seconds) to ROUTE PLANNER
+# and the remaining 5 minutes to the LOW_LEVEL PLANNER
+# NOTE: These are total time from start of test
+MAX_TIME_IN_SEC_ROUTE_PLANNERR = 3450
+MAX_TIME_IN_SEC_LOW_LEVEL = 3600
+
+# Default number of states stored by a HeuristicCache
+DEFAULT_HEURISTIC_CACHE_SIZE = 100000
+
+
+# A structure used to store A* search data
+class Node:
+    # Function used to initialize object
+    def __init__(self, state, start_time=None, action=None, f=0, g=0, h=0):
+        self.state = state              # A specific state in the search space
+        self.action = action            # An action used to get to this state
+        self.start_time = start_time    # time.time value for start
+        self.g = g                      # Cost to get to current state
+        self.h = h                      # Heuristic value, estimated cost to goal
+        self.f = f                      # Estimated total path cost (f = g + h)
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "Node[" + \
+                "\n\tState " + repr(self.state) + \
+                "\n\tAction(" + repr(self.action) + ")" + \
+                "\n\tStart Time(" + repr(self.start_time) + ")" + \
+                "\n\tg(" + repr(self.g) + ")" + \
+                "\n\th(" + repr(self.h) + ")" + \
+                "\n\tf(" + repr(self.f) + ")]"
+
+
+# Function to determine if the time allowed for the search has expired
+# NOTE: Only used when the search has no deadline, a search with a deadline fails once it is reached
+def is_timeout(node, return_path):
+    if return_path:
+        max_time = MAX_TIME_IN_SEC_ROUTE_PLANNERR
+    else:
+        max_time = MAX_TIME_IN_SEC_LOW_LEVEL
+
+    # print("****** PROGRAM TIMEOUT ******")
+    return (time.time() - node.start_time) > max_time
+
+
+# Defines a bounded cache of heuristic values that wraps a heuristic callable.
+# RBFS regenerates the same states many times when it re-expands a subtree, the cache returns
+# the stored estimate instead of calling the heuristic again.  When the cache is full the least
+# recently used entry is removed.  Pass the cache as the heuristic of a_star_search.
+class HeuristicCache:
+    # Function used to initialize object
+    def __init__(self, heuristic_func, max_size, key_func=None):
+        self.heuristic_func = heuristic_func    # Heuristic being cached
+        self.max_size = max_size                # Maximum number of states stored in the cache
+        self.key_func = key_func                # state -> hashable key, the state itself is used if None
+        self.entries = OrderedDict()            # key -> heuristic value
+        self.hits = 0                           # Number of calls answered from the cache
+        self.misses = 0                         # Number of calls to the heuristic
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "HeuristicCache[" + \
+               "\n\tsize(" + repr(len(self.entries)) + ")" + \
+               "\n\thits(" + repr(self.hits) + ")" + \
+               "\n\tmisses(" + repr(self.misses) + ")]"
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Function to get the heuristic value of a state
+    def __call__(self, state):
+        key = state if self.key_func is None else self.key_func(state)
+        value = self.entries.get(key)
+        if value is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return value
+
+        self.misses += 1
+        value = self.heuristic_func(state)
+        self.entries[key] = value
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return value
+
+    # Function to get the fraction of calls answered from the cache
+    def hit_rate(self):
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+# Defines a function to generate the child nodes of a parent node
+# Returns None if there are no actions for the parent state.
+def generate_children(parent_node, actions_func, take_action_func, heuristic_func):
+    # Get all actions for the current state
+    actions = actions_func(parent_node.state)
+
+    # Return if there are no actions for the current state
+    if not actions:
+        return None
+
+    # For each action, apply to current state, determine new path info and store
+    children = []
+    for action in actions:
+        (child_state, step_cost) = take_action_func(parent_node.state, action)
+        g = parent_node.g + step_cost
+        h = heuristic_func(child_state)
+        # f = max(h+g, parent_node.f)
+        # NOTE: This seems to work better, not sure why
+        f = h + g
+        child_node = Node(state=child_state, start_time=parent_node.start_time, action=action, f=f, g=g, h=h)
+        children.append(child_node)
+
+    return children
+
+
+# Defines a function to recursively process a parent node
+# profile: profiler.SearchProfile that records the depth of the expanded nodes, depth is the depth of parent_node
+# deadline: time.time() value, the search fails once it is reached (None uses the fixed time limits)
+def a_star_recursive(parent_node, actions_func, take_action_func, goal_test_func, heuristic_func, return_path, f_max,
+                     profile=None, depth=0, deadline=None):
+    timeout = deadline is None and is_timeout(parent_node, return_path)
+
+    # Check for goal state
+    if goal_test_func(parent_node.state) or timeout:
+        if return_path:
+            return [parent_node.state], parent_node.g
+        else:
+            return [parent_node.action], parent_node.state.grabbed_block
+
+    if deadline is not None and time.time() > deadline:
+        return "failure", float('inf')
+
+    # Get the children of the current state
+    if profile is not None:
+        profile.record_depth(depth)
+    children = generate_children(parent_node, actions_func, take_action_func, heuristic_func)
+
+    # Return if there are no actions for the current state
+    if not children:
+        return "failure", float('inf')
+
+    # Process each child state discovered from previous step
+    while True:
+        # Sort 'children' in ascending order of estimated total path cost (f)
+        children.sort(key=lambda n: n.f)
+
+        # Get best child from sorted list
+        best_child = children[0]
+        if best_child.f > f_max:
+            return "failure", best_child.f
+
+        # Get next best child from sorted list
+        # Use 'inf' if there is not a next best child
+        next_best_child = children[1].f if len(children) > 1 else float('inf')
+
+        # Process the best child and update its estimated total path cost (f) with the result
+        result, best_child.f = a_star_recursive(best_child, actions_func, take_action_func, goal_test_func,
+                                                heuristic_func, return_path, min(f_max, next_best_child),
+                                                profile, depth + 1, deadline)
+        if result != "failure":
+            if return_path:
+                result.insert(0, parent_node.state)
+            else:
+                result.insert(0, parent_node.action)
+            return result, best_child.f
+
+        # The deadline has passed, every level fails
+        if deadline is not None and time.time() > deadline:
+            return "failure", float('inf')
+
+
+# A structure used to store one level of the iterative RBFS search.
+# This replaces a call frame of a_star_recursive.
+class Frame:
+    __slots__ = ('node', 'f_max', 'children', 'current', 'first')
+
+    # Function used to initialize object
+    def __init__(self, node, f_max, children):
+        self.node = node            # The expanded node
+        self.f_max = f_max          # Cost limit for this level
+        self.children = children    # Heap of (f, sequence number, child node)
+        self.current = None         # Child node currently being processed
+        self.first = 0              # Lowest sequence number in the heap
+
+
+# Defines a function to process the start node with an explicit stack instead of recursion.
+# This performs the same RBFS search as a_star_recursive, and returns the same results, but
+# is not limited by the interpreter recursion limit.  Each level keeps its children in a heap
+# so only the updated child is re-ordered after it is processed.
+# The heap is ordered by (f, sequence number) in the same order as the stable sort of a_star_recursive:
+# the children start with their index in the list, and a processed child is pushed back with a number
+# below every other child, so it stays ahead of the children it ties with.
+# profile: profiler.SearchProfile that records the depth of the expanded nodes (the number of levels on the stack)
+# deadline: time.time() value, the search fails once it is reached (None uses the fixed time limits)
+def a_star_iterative(start_node, actions_func, take_action_func, goal_test_func, heuristic_func, return_path,
+                     profile=None, deadline=None):
+    stack = []
+    node = start_node
+    f_max = float('inf')
+
+    while True:
+        # Process 'node'.  'result' is None while the node still has children to explore
+        result = None
+        if goal_test_func(node.state) or (deadline is None and is_timeout(node, return_path)):
+            if return_path:
+                result = [node.state]
+                value = node.g
+            else:
+                result = [node.action]
+                value = node.state.grabbed_block
+        elif deadline is not None and time.time() > deadline:
+            result = "failure"
+            value = float('inf')
+        else:
+            if profile is not None:
+                profile.record_depth(len(stack))
+            children = generate_children(node, actions_func, take_action_func, heuristic_func)
+            if not children:
+                result = "failure"
+                value = float('inf')
+            else:
+                heap = [(child.f, i, child) for i, child in enumerate(children)]
+                heapq.heapify(heap)
+                stack.append(Frame(node, f_max, heap))
+
+        # Pass results up the stack until a level selects the next child to process
+        while True:
+            if result is None:
+                frame = stack[-1]
+
+                # Get best child from the heap
+                best_child = frame.children[0][2]
+                if best_child.f > frame.f_max:
+                    stack.pop()
+                    result = "failure"
+                    value = best_child.f
+                    continue
+
+                # Get next best child from the heap
+                # Use 'inf' if there is not a next best child
+                best_child = heapq.heappop(frame.children)[2]
+                next_best_child = frame.children[0][0] if frame.children else float('inf')
+
+                # Process the best child
+                frame.current = best_child
+                node = best_child
+                f_max = min(frame.f_max, next_best_child)
+                break
+
+            # The start node has been processed
+            if not stack:
+                if result != "failure":
+                    # Path was collected from the goal back to the start
+                    result.reverse()
+                return result, value
+
+            # Update the estimated total path cost (f) of the processed child with the result
+            frame = stack[-1]
+            best_child = frame.current
+            best_child.f = value
+
+            if result != "failure":
+                if return_path:
+                    result.append(frame.node.state)
+                else:
+                    result.append(frame.node.action)
+                stack.pop()
+                continue
+
+            # The deadline has passed, every level fails
+            if deadline is not None and time.time() > deadline:
+                stack.pop()
+                value = float('inf')
+                continue
+
+            frame.first -= 1
+            heapq.heappush(frame.children, (best_child.f, frame.first, best_child))
+            result = None
+
+
+# This is the entry point for the A* search.  It bundles the input data in the format
+# expected by the a* search functions
+# recursive: Use the recursive search instead of the iterative (explicit stack) search
+# profile: profiler.SearchProfile that records the depth of the expanded nodes, None to disable
+# deadline: time.time() value, the search returns ("failure", inf) once it is reached.  Without a deadline
+#           the search stops at the fixed time limits (MAX_TIME_IN_SEC_*) and returns the current node.
+def a_star_search(start_state, actions_func, take_action_func, goal_test_func,
+                  heuristic_func, starting_time, return_path=True, recursive=False, profile=None, deadline=None):
+    h = heuristic_func(start_state)
+    start_node = Node(state=start_state, start_time=starting_time, action=None, f=0+h, g=0, h=h)
+    if not recursive:
+        return a_star_iterative(start_node,
+                                actions_func,
+                                take_action_func,
+                                goal_test_func,
+                                heuristic_func,
+                                return_path,
+                                profile,
+                                deadline=deadline)
+
+    return a_star_recursive(start_node,
+                            actions_func,
+                            take_action_func,
+                            goal_test_func,
+                            heuristic_func,
+                            return_path,
+                            float('inf'),
+                            profile,
+                            deadline=deadline)
@@ -0,0 +1,349 @@
+import argparse
+import copy
+import glob
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+import aStar
+import board as bd
+import commands as c
+import goal as gl
+import PA2
+import relation as r
+import state_cache as sc
+from constants import adjacent_moves
+
+
+# Number of blocks in the tallest tower of the --board_sizes layouts
+MAX_TOWER_HEIGHT = 3
+
+# The --board_sizes layouts only use this share of the columns, the planners need free columns to put blocks down
+MAX_COLUMN_SHARE = 0.5
+
+
+# Exception raised to stop a search once the benchmark time limit is reached
+class BudgetExhausted(Exception):
+    pass
+
+
+# Defines a wrapper around an 'actions' callback that counts expanded nodes.
+# Every call to the actions callback is one node expansion.
+class ExpansionCounter:
+    # Function used to initialize object
+    def __init__(self, actions_func, deadline):
+        self.actions_func = actions_func
+        self.deadline = deadline
+        self.expanded = 0
+
+    def __call__(self, state):
+        if time.time() > self.deadline:
+            raise BudgetExhausted()
+        self.expanded += 1
+        return self.actions_func(state)
+
+
+# Function to find the (initial state file, goal state file) pairs matching a pattern, e.g. 's*'
+def find_problems(pattern):
+    problems = []
+    for initial_file in glob.glob(pattern + '_initial.txt'):
+        goal_file = initial_file.replace('_initial.txt', '_goal.txt')
+        problems.append((initial_file, goal_file))
+
+    # Natural sort so 's10' comes after 's9'
+    return sorted(problems, key=lambda p: [int(t) if t.isdigit() else t for t in re.split(r'(\d+)', p[0])])
+
+
+# Function to load the initial and goal relations for a problem.
+# The inferred relations are cached, so repeated runs skip the inference passes.
+# Set cache_dir to None to always run the inference passes.
+def load_problem(initial_file, goal_file, board=bd.DEFAULT_BOARD, cache_dir=sc.DEFAULT_CACHE_DIR):
+    initial_state = r.Relation('initial_state', board)
+    goal_state = r.Relation('goal_state', board)
+    sc.get_states_from_files(initial_state, goal_state, initial_file, goal_file, cache_dir)
+    return initial_state, goal_state
+
+
+# Function to solve a problem with the route planner and the low level planner.
+# The expansion counters of the searches are appended to 'counters', so the caller can count the
+# expanded nodes of a search that did not finish.
+# Returns (route planner path, route planner cost, low level commands of each route step)
+def solve_problem(initial_state, goal_state, start_time, deadline, recursive, counters):
+    # Route planner
+    counter = ExpansionCounter(PA2.route_planner_actions, deadline)
+    counters.append(counter)
+    compiled_goal = gl.CompiledGoal(goal_state)
+    path = aStar.a_star_search(initial_state,
+                               counter,
+                               PA2.route_planner_take_actions,
+                               lambda s: PA2.block_world_goal_test(s, goal_state, compiled_goal),
+                               lambda s: PA2.route_planner_heuristic(s, goal_state, compiled_goal),
+                               start_time,
+                               return_path=True,
+                               recursive=recursive)
+
+    # Low level planner
+    steps = []
+    grabbed_block = path[0][0].grabbed_block
+    for i in range(len(path[0]) - 1):
+        path[0][i].grabbed_block = grabbed_block
+        counter = ExpansionCounter(PA2.block_world_actions, deadline)
+        counters.append(counter)
+        compiled_goal = gl.CompiledGoal(path[0][i+1])
+        ipath = aStar.a_star_search(path[0][i],
+                                    counter,
+                                    PA2.block_world_take_actions,
+                                    lambda s: PA2.block_world_goal_test(s, path[0][i+1], compiled_goal),
+                                    lambda s: PA2.block_world_heuristic(s, path[0][i+1], compiled_goal),
+                                    start_time,
+                                    return_path=False,
+                                    recursive=recursive)
+        steps.append(ipath[0])
+        grabbed_block = ipath[1]
+    return path[0], path[1], steps
+
+
+# Function to run the route planner and the low level planner for a problem.
+# Returns (nodes expanded, elapsed seconds, solved)
+def run_planner(initial_file, goal_file, time_limit, recursive, board=bd.DEFAULT_BOARD,
+                cache_dir=sc.DEFAULT_CACHE_DIR):
+    initial_state, goal_state = load_problem(initial_file, goal_file, board, cache_dir)
+    start_time = time.time()
+    counters = []
+    try:
+        solve_problem(initial_state, goal_state, start_time, start_time + time_limit, recursive, counters)
+        solved = True
+    except (BudgetExhausted, RecursionError):
+        solved = False
+    return sum(counter.expanded for counter in counters), time.time() - start_time, solved
+
+
+# Function to check that the recursive and the iterative RBFS engines return exactly the same
+# route, route cost and low level commands for a problem.
+# Returns 'match', 'DIFF' or 'timeout' (an engine did not finish within the time limit)
+def compare_engines(initial_file, goal_file, time_limit):
+    plans = []
+    for recursive in (True, False):
+        # The planners update the states, each engine starts from freshly loaded states
+        initial_state, goal_state = load_problem(initial_file, goal_file)
+        start_time = time.time()
+        try:
+            plans.append(solve_problem(initial_state, goal_state, start_time, start_time + time_limit, recursive,
+                                       []))
+        except (BudgetExhausted, RecursionError):
+            return 'timeout'
+    return 'match' if plans[0] == plans[1] else 'DIFF'
+
+
+# Function to get the largest number of blocks of a warehouse layout on a board
+def max_board_blocks(board):
+    size_x, size_y = board.get_size()
+    return MAX_TOWER_HEIGHT * int(size_x * size_y * MAX_COLUMN_SHARE)
+
+
+# Function to write a warehouse layout problem on a large board.
+# The blocks are stacked in towers of 1 to MAX_TOWER_HEIGHT blocks on random columns, the goal gives the
+# location of every block and moves 'moved' of the single block towers to a free column next to them.
+# num_blocks must be at most max_board_blocks(board).
+# Returns (initial state file, goal state file)
+def write_board_problem(directory, board, num_blocks, moved, seed):
+    rand = random.Random(seed)
+    max_columns = max_board_blocks(board) // MAX_TOWER_HEIGHT
+    size_x, size_y = board.get_size()
+    locations = {}
+    columns = set()
+    singles = []
+    while len(locations) < num_blocks:
+        x_pos = board.min_x + rand.randrange(size_x)
+        y_pos = board.min_y + rand.randrange(size_y)
+        if (x_pos, y_pos) in columns:
+            continue
+        columns.add((x_pos, y_pos))
+
+        # The towers are made taller when the columns would run out before every block is placed
+        remaining = num_blocks - len(locations)
+        min_height = remaining - MAX_TOWER_HEIGHT * (max_columns - len(columns))
+        height = min(max(rand.randint(1, MAX_TOWER_HEIGHT), min_height), remaining)
+        for z_pos in range(height):
+            locations['block{}'.format(len(locations) + 1)] = (x_pos, y_pos, z_pos)
+        if height == 1:
+            singles.append('block{}'.format(len(locations)))
+
+    goal_locations = dict(locations)
+    for blk in singles:
+        if moved == 0:
+            break
+        x_pos, y_pos, z_pos = locations[blk]
+        for x_move, y_move in adjacent_moves:
+            new_x = x_pos + x_move
+            new_y = y_pos + y_move
+            if board.is_on_board(new_x, new_y) and (new_x, new_y) not in columns:
+                columns.add((new_x, new_y))
+                goal_locations[blk] = (new_x, new_y, 0)
+                moved -= 1
+                break
+
+    files = []
+    for name, state in (('initial', locations), ('goal', goal_locations)):
+        file_name = os.path.join(directory, 'board_{}.txt'.format(name))
+        with open(file_name, 'w') as f:
+            for blk, (x_pos, y_pos, z_pos) in state.items():
+                f.write('(has {} location {} {} {})\n'.format(blk, x_pos, y_pos, z_pos))
+        files.append(file_name)
+    return files[0], files[1]
+
+
+# Function to time the planners on a layout with 'num_blocks' blocks on a board of 'size' by 'size' columns.
+# The same number of blocks on a larger board should take the same time, only the occupied locations
+# are stored and visited.
+# Returns (load seconds, route actions usec, route heuristic usec, low level actions usec,
+#          nodes expanded, solve seconds, solved)
+def benchmark_board(size, num_blocks, moved, time_limit, repeat, seed):
+    board = bd.Board(size, size)
+    with tempfile.TemporaryDirectory() as directory:
+        initial_file, goal_file = write_board_problem(directory, board, num_blocks, moved, seed)
+
+        start_time = time.perf_counter()
+        initial_state, goal_state = load_problem(initial_file, goal_file, board, None)
+        load = time.perf_counter() - start_time
+
+        compiled_goal = gl.CompiledGoal(goal_state)
+        timings = []
+        for func in (PA2.route_planner_actions,
+                     lambda s: PA2.route_planner_heuristic(s, goal_state, compiled_goal),
+                     PA2.block_world_actions):
+            start_time = time.perf_counter()
+            for _ in range(repeat):
+                func(initial_state)
+            timings.append(1e6 * (time.perf_counter() - start_time) / repeat)
+
+        # The generated files are not worth caching, the solve infers the relations again
+        expanded, elapsed, solved = run_planner(initial_file, goal_file, time_limit, False, board, None)
+    return (load,) + tuple(timings) + (expanded, elapsed, solved)
+
+
+# Function to time one route planner expansion and one low level expansion of the initial state.
+# Compares applying the command objects directly against formatting every command to the
+# '(command ...)' text and parsing it back, which is what the planners used to do.
+# Returns (typed seconds per expansion, text seconds per expansion)
+def benchmark_commands(initial_file, goal_file, repeat):
+    initial_state, goal_state = load_problem(initial_file, goal_file)
+    route_actions = PA2.route_planner_actions(initial_state)
+    block_actions = PA2.block_world_actions(initial_state)
+
+    start_time = time.time()
+    for _ in range(repeat):
+        for command in route_actions:
+            PA2.route_planner_take_actions(initial_state, command)
+        for actions in block_actions:
+            PA2.block_world_take_actions(initial_state, actions)
+    typed = (time.time() - start_time) / repeat
+
+    start_time = time.time()
+    for _ in range(repeat):
+        for command in route_actions:
+            PA2.route_planner_take_actions(initial_state, (c.parse_command(c.format_command(command[0])), command[1]))
+        for actions in block_actions:
+            PA2.block_world_take_actions(initial_state, [(c.parse_command(c.format_command(a[0])), a[1])
+                                                         for a in actions])
+    text = (time.time() - start_time) / repeat
+    return typed, text
+
+
+# Function to measure the memory used by the planners for a problem.
+# copy_func is used to copy the states before a command is applied (see PA2.copy_relation),
+# the search keeps every generated state, so the peak memory divided by the expanded
+# nodes is the number of bytes allocated for each expanded node.
+# Returns (nodes expanded, elapsed seconds, solved, peak bytes)
+def benchmark_memory(initial_file, goal_file, time_limit, copy_func):
+    saved_copy_func = PA2.copy_relation
+    PA2.copy_relation = copy_func
+    tracemalloc.start()
+    try:
+        expanded, elapsed, solved = run_planner(initial_file, goal_file, time_limit, False)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        PA2.copy_relation = saved_copy_func
+    return expanded, elapsed, solved, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='CS540: PA2 benchmark - recursive vs iterative RBFS')
+    parser.add_argument('-l', '--time_limit', help='Time limit in seconds for each problem', type=float,
+                        default=30.0)
+    parser.add_argument('-p', '--pattern', help="Problem file pattern, e.g. 's*' or 'b*', or a comma separated "
+                                                "list of patterns for --check", default='s*')
+    parser.add_argument('-m', '--micro', help='Only time the command handling of a single expansion',
+                        action='store_true')
+    parser.add_argument('-r', '--repeat', help='Number of expansions timed by --micro', type=int, default=20)
+    parser.add_argument('-S', '--board_sizes', help='Time the planners on a layout of --blocks blocks on boards of '
+                                                    'these sizes (columns along X and Y)', type=int, nargs='+',
+                        metavar='SIZE')
+    parser.add_argument('-n', '--blocks', help='Number of blocks of the --board_sizes layouts, at most 1.5 times the '
+                                               'number of columns of each board', type=int, default=300)
+    parser.add_argument('-k', '--moved', help='Number of blocks moved by the --board_sizes goals', type=int,
+                        default=3)
+    parser.add_argument('-M', '--memory', help='Compare the bytes allocated per expanded node when the states '
+                                               'are deep copied and when they share the unchanged blocks',
+                        action='store_true')
+    parser.add_argument('-C', '--check', help='Check that the recursive and iterative engines return the same '
+                                              'plans (exits with 1 if a plan differs)', action='store_true')
+    args = parser.parse_args()
+
+    if args.check:
+        status = 0
+        print("{:<16} {:>8}".format('problem', 'engines'))
+        for pattern in args.pattern.split(','):
+            for initial_file, goal_file in find_problems(pattern):
+                result = compare_engines(initial_file, goal_file, args.time_limit)
+                print("{:<16} {:>8}".format(initial_file, result))
+                if result == 'DIFF':
+                    status = 1
+        exit(status)
+
+    if args.board_sizes:
+        for size in args.board_sizes:
+            if args.blocks > max_board_blocks(bd.Board(size, size)):
+                print("ERROR - blocks({}) do not fit on a {}x{} board, the layouts have at most {} blocks".format(
+                    args.blocks, size, size, max_board_blocks(bd.Board(size, size))))
+                exit(1)
+
+        print("{:<10} {:>7} {:>9} {:>13} {:>13} {:>13} {:>9} {:>9} {:>7}".format(
+            'board', 'blocks', 'load s', 'actions usec', 'heur usec', 'll act usec', 'expanded', 'solve s',
+            'solved'))
+        for size in args.board_sizes:
+            load, actions, heuristic, ll_actions, expanded, elapsed, solved = benchmark_board(
+                size, args.blocks, args.moved, args.time_limit, args.repeat, 0)
+            print("{:<10} {:>7} {:>9.3f} {:>13.1f} {:>13.1f} {:>13.1f} {:>9} {:>9.3f} {:>7}".format(
+                '{}x{}'.format(size, size), args.blocks, load, actions, heuristic, ll_actions, expanded, elapsed,
+                str(solved)))
+        exit(0)
+
+    if args.memory:
+        print("{:<16} {:<10} {:>10} {:>10} {:>12} {:>10} {:>8}".format('problem', 'copy', 'expanded', 'nodes/sec',
+                                                                     'peak KB', 'bytes/node', 'solved'))
+        for initial_file, goal_file in find_problems(args.pattern):
+            for name, copy_func in (('deepcopy', copy.deepcopy), ('shared', PA2.copy_relation)):
+                expanded, elapsed, solved, peak = benchmark_memory(initial_file, goal_file, args.time_limit,
+                                                                   copy_func)
+                print("{:<16} {:<10} {:>10} {:>10.0f} {:>12.0f} {:>10.0f} {:>8}".format(
+                    initial_file, name, expanded, expanded / max(elapsed, 1e-9), peak / 1024.0,
+                    peak / max(expanded, 1), str(solved)))
+        exit(0)
+
+    if args.micro:
+        print("{:<16} {:>14} {:>14} {:>8}".format('problem', 'typed usec', 'text usec', 'saved'))
+        for initial_file, goal_file in find_problems(args.pattern):
+            typed, text = benchmark_commands(initial_file, goal_file, args.repeat)
+            print("{:<16} {:>14.1f} {:>14.1f} {:>7.0f}%".format(initial_file, typed * 1e6, text * 1e6,
+                                                                 100.0 * (text - typed) / text))
+        exit(0)
+
+    print("{:<16} {:<10} {:>10} {:>10} {:>8}".format('problem', 'engine', 'expanded', 'seconds', 'solved'))
+    for initial_file, goal_file in find_problems(args.pattern):
+        for name, recursive in (('recursive', True), ('iterative', False)):
+            expanded, elapsed, solved = run_planner(initial_file, goal_file, args.time_limit, recursive)
+            print("{:<16} {:<10} {:>10} {:>10.3f} {:>8}".format(initial_file, name, expanded, elapsed, str(solved)))
@@ -0,0 +1,37 @@
+from constants import *
+
+
+# Defines the size of the board.  The locations on the board are (x, y, z) with
+# min_x <= x <= max_x, min_y <= y <= max_y and z >= BOARD_MIN_Z.
+# The board is sparse, the relations only store the occupied locations (see Relation.occupied and
+# spatial_index.py), so the size of the board only limits where the blocks can go.  Nothing is stored
+# or visited for the empty locations, the planners scale with the number of blocks, not the board area.
+class Board:
+    # Function used to initialize object
+    # size_x, size_y: Number of columns along X and Y, the default is the 0..10 board of the assignment
+    def __init__(self, size_x=BOARD_MAX_X - BOARD_MIN_X + 1, size_y=BOARD_MAX_Y - BOARD_MIN_Y + 1):
+        self.min_x = BOARD_MIN_X
+        self.max_x = BOARD_MIN_X + int(size_x) - 1
+        self.min_y = BOARD_MIN_Y
+        self.max_y = BOARD_MIN_Y + int(size_y) - 1
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "Board[" \
+               "\tsize(" + repr(self.get_size()) + ")]"
+
+    # Function to get the number of columns along X and Y
+    def get_size(self):
+        return self.max_x - self.min_x + 1, self.max_y - self.min_y + 1
+
+    # Function to determine if a column (x, y) is on the board
+    def is_on_board(self, x_pos, y_pos):
+        return self.min_x <= x_pos <= self.max_x and self.min_y <= y_pos <= self.max_y
+
+    # Function to determine if a location (x, y, z) is on the board
+    def is_valid(self, x_pos, y_pos, z_pos):
+        return self.min_x <= x_pos <= self.max_x and self.min_y <= y_pos <= self.max_y and z_pos >= BOARD_MIN_Z
+
+
+# Board used when no size is given
+DEFAULT_BOARD = Board()
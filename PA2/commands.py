@@ -0,0 +1,88 @@
+from collections import namedtuple
+
+
+# Typed block world commands.
+# The planners create and apply these objects directly, the '(command ...)' text format
+# is only built when a plan is printed (str(command) or format_command) and only parsed
+# when a plan is read back (parse_command).
+# Each command is an immutable namedtuple, 'name' is the command name used in the text format.
+
+
+# (command move block-id x y z) - Move block-id to location (x, y, z), used by the route planner
+class Move(namedtuple('Move', ['block', 'x', 'y', 'z'])):
+    __slots__ = ()
+    name = 'move'
+
+    def __str__(self):
+        return '(command move {} {} {} {})'.format(self.block, self.x, self.y, self.z)
+
+
+# (command grab block-id) - Grab block-id
+class Grab(namedtuple('Grab', ['block'])):
+    __slots__ = ()
+    name = 'grab'
+
+    def __str__(self):
+        return '(command grab {})'.format(self.block)
+
+
+# (command release block-id) - Release the grabbed block-id
+class Release(namedtuple('Release', ['block'])):
+    __slots__ = ()
+    name = 'release'
+
+    def __str__(self):
+        return '(command release {})'.format(self.block)
+
+
+# (command slide block-id deltaX deltaY) - Slide block-id (and the blocks on top of it) on the table
+class Slide(namedtuple('Slide', ['block', 'delta_x', 'delta_y'])):
+    __slots__ = ()
+    name = 'slide'
+
+    def __str__(self):
+        return '(command slide {} {} {})'.format(self.block, self.delta_x, self.delta_y)
+
+
+# (command carry block-id deltaX deltaY deltaZ) - Carry the grabbed block-id
+class Carry(namedtuple('Carry', ['block', 'delta_x', 'delta_y', 'delta_z'])):
+    __slots__ = ()
+    name = 'carry'
+
+    def __str__(self):
+        return '(command carry {} {} {} {})'.format(self.block, self.delta_x, self.delta_y, self.delta_z)
+
+
+# Command name -> (command class, number of integer parameters at the end of the command)
+COMMANDS = {
+    Move.name: (Move, 3),
+    Grab.name: (Grab, 0),
+    Release.name: (Release, 0),
+    Slide.name: (Slide, 2),
+    Carry.name: (Carry, 3),
+}
+
+
+# Function to convert a command into the '(command ...)' text format
+def format_command(command):
+    return str(command)
+
+
+# Function to convert a '(command ...)' string into a command object
+# Returns None if the string is not a valid command
+def parse_command(text):
+    sub_string = text.replace('(', '').replace(')', '').split()
+    if len(sub_string) < 3 or sub_string[0].lower() != 'command':
+        return None
+
+    name = sub_string[1].lower()
+    if name not in COMMANDS:
+        return None
+
+    command_class, num_int_params = COMMANDS[name]
+    params = [param.lower() for param in sub_string[2:]]
+    if len(params) != len(command_class._fields):
+        return None
+    if num_int_params:
+        params[-num_int_params:] = [int(param) for param in params[-num_int_params:]]
+    return command_class(*params)
@@ -0,0 +1,75 @@
+# Defines the goal information used by the heuristics and goal tests in PA2.py.
+# The goal relation does not change during a search, so everything the heuristics need is read
+# from it once here instead of calling get_location(), get_neighbors() and is_location_valid()
+# on the goal blocks for every state.
+class CompiledGoal:
+    # Function used to initialize object
+    def __init__(self, goal):
+        self.relation = goal                                # Goal relation this object was built from
+        self.block_ids = tuple(goal.state_data)             # Goal blocks, in relation order
+        self.locations = dict()                             # Block -> goal (x, y, z), may be invalid
+        self.valid = dict()                                 # Block -> True if the goal location is valid
+        self.on_top_of = dict()                             # Block -> goal block underneath, None if table
+        self.below = dict()                                 # Block -> goal block on top, None if top block
+        self.neighbors = dict()                             # Block -> goal neighbors (list order kept)
+        self.neighbor_sets = dict()                         # Block -> goal neighbors as a frozenset
+        self.colors = dict()                                # Block -> goal color
+        self.location_fingerprint = goal.location_fingerprint  # Zobrist hash of the goal locations
+
+        for blk in self.block_ids:
+            block = goal.state_data[blk]
+            self.locations[blk] = block.get_location()
+            self.valid[blk] = block.is_location_valid()
+            self.on_top_of[blk] = block.get_on_top_of()
+            self.below[blk] = block.get_below()
+            self.neighbors[blk] = list(block.get_neighbors())
+            self.neighbor_sets[blk] = frozenset(block.get_neighbors())
+            self.colors[blk] = block.get_color()
+
+        # Every valid goal location
+        self.occupied = frozenset(self.locations[blk] for blk in self.block_ids if self.valid[blk])
+
+        # Block -> valid goal locations of its goal neighbors
+        self.neighbor_locations = dict()
+        for blk in self.block_ids:
+            self.neighbor_locations[blk] = frozenset(self.locations[neighbor] for neighbor in self.neighbors[blk]
+                                                     if self.valid[neighbor])
+
+        # One row per block with the values compared by Block.__eq__
+        self.rows = tuple((blk, self.locations[blk], self.on_top_of[blk], self.below[blk],
+                           self.neighbor_sets[blk], self.colors[blk]) for blk in self.block_ids)
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "CompiledGoal[" \
+               "\trelation_id(" + repr(self.relation.relation_id) + ")" + \
+               "\tlocations(" + repr(self.locations) + ")]\n"
+
+    # Function to determine if a block of a state is identical to the goal block (same as Block.__eq__)
+    def block_matches(self, blk, block):
+        return block.get_location() == self.locations[blk] and \
+               block.on_top_of == self.on_top_of[blk] and \
+               block.below == self.below[blk] and \
+               block.color == self.colors[blk] and \
+               set(block.side_by_side) == self.neighbor_sets[blk]
+
+    # Function to determine if a state is the goal state (same as Relation.__eq__)
+    # States with other block locations are rejected by their fingerprint without visiting the blocks
+    def is_goal(self, state):
+        if state.location_fingerprint != self.location_fingerprint:
+            return False
+
+        state_data = state.state_data
+        if len(state_data) != len(self.rows):
+            return False
+
+        for blk, location, on_top_of, below, neighbor_set, color in self.rows:
+            block = state_data.get(blk)
+            if block is None or \
+                    block.get_location() != location or \
+                    block.on_top_of != on_top_of or \
+                    block.below != below or \
+                    block.color != color or \
+                    set(block.side_by_side) != neighbor_set:
+                return False
+        return True
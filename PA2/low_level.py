@@ -0,0 +1,161 @@
+import heapq
+import itertools
+import time
+import commands as c
+from constants import *
+
+
+# Defines the low level planner for a single route planner step.
+# Between two consecutive route planner states only one block (or one stack sliding on the table)
+# moves, so instead of searching over whole relations the grab/carry/slide/release commands are
+# found with a uniform cost search over the grid positions of the moving block.  The other blocks
+# do not move and are only used for collision checks.
+# The moves follow the same rules as PA2.block_world_actions.
+
+
+# Function to find the blocks that are at a different location in 'goal'.
+# Returns a list of (block, start location, goal location)
+def moved_blocks(start, goal):
+    moved = []
+    for blk in start.state_data:
+        start_location = start.state_data[blk].get_location()
+        goal_location = goal.state_data[blk].get_location()
+        if start_location != goal_location:
+            moved.append((blk, start_location, goal_location))
+    return moved
+
+
+# Function to find the block that has to be moved between two route planner states.
+# A single block can move anywhere, several blocks must be a stack that slides on the table,
+# every block of the stack moves by the same deltaX, deltaY.
+# Returns (block, start location, goal location, moved block ids), the block is the bottom block of
+# a stack, or None if the states do not differ by a move the planner knows
+def find_moving_unit(start, goal):
+    moved = moved_blocks(start, goal)
+    if not moved:
+        return None
+
+    moved.sort(key=lambda m: m[1][2])
+    blk, (x, y, z), (goal_x, goal_y, goal_z) = moved[0]
+    if len(moved) == 1:
+        return blk, (x, y, z), (goal_x, goal_y, goal_z), {blk}
+
+    # Stack - the bottom block is on the table in both states and everything above it moves with it
+    if z != 0 or goal_z != 0:
+        return None
+    delta_x = goal_x - x
+    delta_y = goal_y - y
+    for position, (m_blk, m_start, m_goal) in enumerate(moved):
+        if m_start != (x, y, position) or m_goal != (goal_x, goal_y, position):
+            return None
+    if start.get_block_at(x, y, len(moved)) is not None:
+        return None
+    return blk, (x, y, z), (goal_x, goal_y, goal_z), {m[0] for m in moved}
+
+
+# Function to find the commands that move between two consecutive route planner states.
+# The search state is (location of the moving block, True if it is grabbed), each command costs 1.
+# deadline: time.time() value, the search gives up once it is reached (None for no limit)
+# Returns the same result as aStar.a_star_search(return_path=False), ([actions], grabbed_block),
+# or None if no plan was found (the caller should use the full search)
+def plan_segment(start, goal, deadline=None):
+    grabbed_block = start.get_grabbed_block()
+    unit = find_moving_unit(start, goal)
+    if unit is None:
+        if not moved_blocks(start, goal):
+            return [None], grabbed_block
+        return None
+    blk, start_location, goal_location, unit_blocks = unit
+    single = len(unit_blocks) == 1
+
+    # Other blocks do not move
+    occupied = {location: other for location, other in start.occupied.items() if other not in unit_blocks}
+    column_heights = {}
+    for (x, y, z) in occupied:
+        column_heights[(x, y)] = column_heights.get((x, y), 0) + 1
+
+    # A different grabbed block has to be released first
+    first_commands = []
+    if grabbed_block is not None and grabbed_block != blk:
+        first_commands.append((c.Release(grabbed_block), 1))
+        grabbed_block = None
+
+    start_node = (start_location, grabbed_block == blk)
+    counter = itertools.count()
+    open_heap = [(len(first_commands), next(counter), start_node)]
+    best_cost = {start_node: len(first_commands)}
+    parents = {start_node: (None, first_commands)}
+    while open_heap:
+        cost, sequence, node = heapq.heappop(open_heap)
+        if cost > best_cost[node]:
+            continue
+        if deadline is not None and time.time() > deadline:
+            return None
+        location, grabbed = node
+        if location == goal_location:
+            return build_plan(node, parents), blk if grabbed else None
+
+        for child, commands in moves(blk, location, grabbed, single, occupied, column_heights, start.board):
+            child_cost = cost + len(commands)
+            if child_cost < best_cost.get(child, float('inf')):
+                best_cost[child] = child_cost
+                parents[child] = (node, commands)
+                heapq.heappush(open_heap, (child_cost, next(counter), child))
+
+    return None
+
+
+# Function to rebuild the actions from the start to a node, in the a_star_search format:
+# None for the start node followed by one list of (command, cost) pairs per step
+def build_plan(node, parents):
+    steps = []
+    while node is not None:
+        node, commands = parents[node]
+        if commands:
+            steps.append(commands)
+    steps.reverse()
+    return [None] + steps
+
+
+# Function to get the moves of the moving block from a location.
+# Returns a list of ((new location, grabbed), [(command, cost)]).
+def moves(blk, location, grabbed, single, occupied, column_heights, board):
+    x, y, z = location
+    is_top = (x, y, z + 1) not in occupied
+    result = []
+    for x_move in all_moves_one_dim:
+        for y_move in all_moves_one_dim:
+            for z_move in all_moves_one_dim:
+                # Check for no change
+                if x_move == 0 and y_move == 0 and z_move == 0:
+                    continue
+
+                # Check for move off of board
+                new_x = x + x_move
+                new_y = y + y_move
+                new_z = z + z_move
+                if not board.is_valid(new_x, new_y, new_z):
+                    continue
+                new_location = (new_x, new_y, new_z)
+
+                # Same collision and stack rules as PA2.block_world_actions
+                if column_heights.get((new_x, new_y), 0) > 0:
+                    slide = False
+                    carry = new_location not in occupied and (new_x, new_y, new_z - 1) in occupied and is_top
+                else:
+                    slide = z == 0 and new_z == 0
+                    carry = is_top
+
+                # A stack can only slide, a single block must be the top block to slide alone
+                if slide and (is_top or not single):
+                    commands = [(c.Slide(blk, x_move, y_move), 1)]
+                    if grabbed:
+                        commands.insert(0, (c.Release(blk), 1))
+                    result.append(((new_location, False), commands))
+
+                if carry and single:
+                    commands = [(c.Carry(blk, x_move, y_move, z_move), 1)]
+                    if not grabbed:
+                        commands.insert(0, (c.Grab(blk), 1))
+                    result.append(((new_location, True), commands))
+    return result
@@ -0,0 +1,134 @@
+import json
+import time
+
+
+# Defines an opt-in profile of the searches (see the -p/--profile option of the planners).
+# The callbacks given to a search are wrapped so every call is counted and timed, the time of a
+# callback includes the callbacks it calls itself.  The A* engines in aStar.py also report the
+# depth of every node they expand, the other search algorithms do not (max_depth stays None).
+# Nodes expanded are the calls to the actions callback and nodes generated are the calls to the
+# take action callback.  A re-expansion is the expansion of a state that was already expanded,
+# RBFS re-expands a subtree every time it goes back to it.
+class SearchProfile:
+    # Function used to initialize object
+    def __init__(self, key_func=None):
+        self.key_func = key_func        # state -> hashable key, the state itself is used if None
+        self.callbacks = dict()         # Callback name -> [number of calls, seconds]
+        self.expanded_keys = set()      # Keys of the states expanded so far
+        self.nodes_expanded = 0         # Number of calls to the actions callbacks
+        self.nodes_generated = 0        # Number of calls to the take action callbacks
+        self.reexpansions = 0           # Expansions of a state that was already expanded
+        self.max_depth = None           # Depth of the deepest node expanded by the A* engines
+        self.solution_depth = None      # Number of actions in the solution, set by the planner
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "SearchProfile[" + \
+               "\n\tnodes_expanded(" + repr(self.nodes_expanded) + ")" + \
+               "\n\tnodes_generated(" + repr(self.nodes_generated) + ")" + \
+               "\n\treexpansions(" + repr(self.reexpansions) + ")" + \
+               "\n\tmax_depth(" + repr(self.max_depth) + ")" + \
+               "\n\tcallbacks(" + repr(self.callbacks) + ")]"
+
+    # Function to wrap a callback so its calls are counted and timed under 'name'
+    def wrap(self, name, func):
+        timing = self.callbacks.setdefault(name, [0, 0.0])
+
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                timing[0] += 1
+                timing[1] += time.perf_counter() - start
+        return timed
+
+    # Function to wrap an actions callback, every call is a node expansion
+    def wrap_actions(self, name, func):
+        timed = self.wrap(name, func)
+
+        def actions(state):
+            key = state if self.key_func is None else self.key_func(state)
+            if key in self.expanded_keys:
+                self.reexpansions += 1
+            else:
+                self.expanded_keys.add(key)
+            self.nodes_expanded += 1
+            return timed(state)
+        return actions
+
+    # Function to wrap a take action callback, every call generates a node
+    def wrap_take_action(self, name, func):
+        timed = self.wrap(name, func)
+
+        def take_action(state, action):
+            self.nodes_generated += 1
+            return timed(state, action)
+        return take_action
+
+    # Function to wrap the four callbacks of a search.
+    # Returns (actions_func, take_action_func, goal_test_func, heuristic_func)
+    def wrap_callbacks(self, actions_func, take_action_func, goal_test_func, heuristic_func):
+        return (self.wrap_actions('actions_func', actions_func),
+                self.wrap_take_action('take_action_func', take_action_func),
+                self.wrap('goal_test_func', goal_test_func),
+                self.wrap('heuristic_func', heuristic_func))
+
+    # Function called by the A* engines for every node they expand
+    def record_depth(self, depth):
+        if self.max_depth is None or depth > self.max_depth:
+            self.max_depth = depth
+
+    # Function to get the effective branching factor b*, the branching factor of a uniform tree of
+    # depth d (the solution depth) with N (nodes generated) nodes: N = b* + b*^2 + ... + b*^d
+    # Returns None until the solution depth is known
+    def effective_branching_factor(self):
+        if not self.solution_depth or self.nodes_generated == 0:
+            return None
+
+        # Number of nodes in a uniform tree, stops counting once it has more than the generated nodes
+        def tree_size(branching):
+            total = 0.0
+            level = 1.0
+            for _ in range(self.solution_depth):
+                level *= branching
+                total += level
+                if total > self.nodes_generated:
+                    break
+            return total
+
+        low = 0.0
+        high = float(max(self.nodes_generated, 1))
+        while high - low > 1e-6:
+            middle = (low + high) / 2
+            if tree_size(middle) < self.nodes_generated:
+                low = middle
+            else:
+                high = middle
+        return (low + high) / 2
+
+    # Function to build the report of the profile.
+    # seconds: Total time of the searches, used to get the share of each callback
+    def report(self, seconds):
+        callbacks = dict()
+        for name, (calls, callback_seconds) in sorted(self.callbacks.items(), key=lambda c: -c[1][1]):
+            callbacks[name] = {'calls': calls,
+                               'seconds': callback_seconds,
+                               'usec_per_call': 1e6 * callback_seconds / calls if calls else 0.0,
+                               'share': callback_seconds / seconds if seconds > 0 else 0.0}
+
+        return {'seconds': seconds,
+                'nodes_expanded': self.nodes_expanded,
+                'nodes_generated': self.nodes_generated,
+                'reexpansions': self.reexpansions,
+                'max_depth': self.max_depth,
+                'solution_depth': self.solution_depth,
+                'average_branching_factor': self.nodes_generated / self.nodes_expanded if self.nodes_expanded else 0.0,
+                'effective_branching_factor': self.effective_branching_factor(),
+                'callbacks': callbacks}
+
+    # Function to write the report to a JSON file
+    def write_json(self, file_name, seconds):
+        with open(file_name, 'w') as f:
+            json.dump(self.report(seconds), f, indent=2)
+            f.write('\n')
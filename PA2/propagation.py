@@ -0,0 +1,160 @@
+from collections import deque
+import block as b
+from constants import *
+
+
+# Defines the propagation engine used by Relation.gen_relationships.
+# The facts of a block are its location, on_top_of, below and side_by_side properties.  Each block is
+# a node of a worklist, the rules of a block only fire when it is taken from the worklist, and a block
+# is only put back on the worklist when one of the facts its rules read has changed.  The engine runs
+# until the worklist is empty (a fixpoint), so the result does not depend on how many passes are made.
+# Locations are looked up in the location index of the relation (see spatial_index.py) instead of
+# comparing every pair of blocks.
+#
+# The rules of a block are
+#   - valid location: the blocks directly above/below are on top of/under it, the adjacent blocks
+#     at the same height are its neighbors
+#   - on_top_of: the lower block has this block 'below' it, the location of one block gives the
+#     location of the other
+#   - below: the location of one block gives the location of the other
+#   - side_by_side: neighbors are symmetric, and the blocks under (or above) two neighbors are neighbors
+#
+# Facts are only added, a fact that is already set to a different value is left as is (conflicting
+# input can not make the engine loop), and a location is only set if the block has no valid location.
+class Propagation:
+    # Function used to initialize object
+    def __init__(self, relation):
+        self.relation = relation
+        self.state_data = relation.state_data
+        self.index = relation.get_spatial_index()  # Location index, kept in sync by Relation.place_block
+        self.worklist = deque()             # Blocks whose rules have to fire
+        self.queued = set()                 # Blocks in the worklist
+        self.reported = set()               # Location conflicts that were already reported
+        self.num_fired = 0                  # Number of times the rules of a block fired
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "Propagation[" \
+               "\trelation_id(" + repr(self.relation.relation_id) + ")" + \
+               "\tworklist(" + repr(list(self.worklist)) + ")" + \
+               "\tnum_fired(" + repr(self.num_fired) + ")]\n"
+
+    # Function to run the rules of every block until no fact changes
+    # Returns the number of times the rules of a block fired
+    def run(self):
+        for blk in list(self.state_data):
+            self.queue(blk)
+
+        while self.worklist:
+            blk = self.worklist.popleft()
+            self.queued.discard(blk)
+            self.num_fired += 1
+            self.fire(blk)
+        return self.num_fired
+
+    # Function to add a block to the worklist
+    def queue(self, blk):
+        if blk not in self.queued and blk in self.state_data:
+            self.queued.add(blk)
+            self.worklist.append(blk)
+
+    # Function to queue a block whose facts changed, and the blocks whose rules read its facts
+    def changed(self, blk):
+        self.queue(blk)
+        block = self.state_data[blk]
+        if block.on_top_of is not None:
+            self.queue(block.on_top_of)
+        if block.below is not None:
+            self.queue(block.below)
+        for neighbor in block.side_by_side:
+            self.queue(neighbor)
+
+    # Function to get a block, the block is created if the relation does not have it yet
+    def get_block(self, blk):
+        if blk not in self.state_data:
+            self.state_data[blk] = b.Block(blk, board=self.relation.board)
+            self.index.add(blk, self.state_data[blk])
+        return self.state_data[blk]
+
+    # Function to set the location of a block that does not have a valid location
+    def set_location(self, blk, x_pos, y_pos, z_pos):
+        if self.state_data[blk].is_location_valid() or not self.relation.place_block(blk, x_pos, y_pos, z_pos):
+            return
+        self.changed(blk)
+
+    # Function to put 'upper' on top of 'lower' (lower.below = upper)
+    def set_on_top_of(self, upper, lower):
+        upper_block = self.state_data[upper]
+        lower_block = self.state_data[lower]
+        if upper_block.on_top_of is None:
+            upper_block.set_on_top_of(lower)
+            self.changed(upper)
+        if lower_block.below is None:
+            lower_block.set_below(upper)
+            self.changed(lower)
+
+    # Function to make two blocks neighbors of each other
+    def add_neighbors(self, blk, neighbor):
+        if blk == neighbor:
+            return
+        if neighbor not in self.get_block(blk).side_by_side and self.state_data[blk].add_neighbor(neighbor):
+            self.changed(blk)
+        if blk not in self.get_block(neighbor).side_by_side and self.state_data[neighbor].add_neighbor(blk):
+            self.changed(neighbor)
+
+    # Function to fire the rules of a block
+    def fire(self, blk):
+        block = self.state_data[blk]
+        valid = block.is_location_valid()
+
+        # Location - blocks above, below and side by side
+        if valid:
+            x, y, z = block.get_location()
+            for upper in self.index.get_blocks_at(x, y, z + 1):
+                self.set_on_top_of(upper, blk)
+            for lower in self.index.get_blocks_at(x, y, z - 1):
+                self.set_on_top_of(blk, lower)
+            for move in adjacent_moves:
+                for neighbor in self.index.get_blocks_at(x + move[0], y + move[1], z):
+                    self.add_neighbors(blk, neighbor)
+
+        # on_top_of - the lower block is under this block
+        lower = block.on_top_of
+        if lower is not None:
+            lower_block = self.get_block(lower)
+            if lower_block.below is None:
+                lower_block.set_below(blk)
+                self.changed(lower)
+
+            if valid and lower_block.is_location_valid():
+                x, y, z = block.get_location()
+                if lower_block.get_location() != (x, y, z - 1) and (blk, lower) not in self.reported:
+                    self.reported.add((blk, lower))
+                    print("ERROR - propagation: Relation({}) blk location error".format(
+                        self.relation.relation_id))
+            elif valid:
+                x, y, z = block.get_location()
+                self.set_location(lower, x, y, z - 1)
+            elif lower_block.is_location_valid():
+                x, y, z = lower_block.get_location()
+                self.set_location(blk, x, y, z + 1)
+
+        # below - the upper block is on top of this block
+        upper = block.below
+        if upper is not None and upper in self.state_data:
+            upper_block = self.state_data[upper]
+            if valid and not upper_block.is_location_valid():
+                x, y, z = block.get_location()
+                self.set_location(upper, x, y, z + 1)
+            elif not valid and upper_block.is_location_valid():
+                x, y, z = upper_block.get_location()
+                self.set_location(blk, x, y, z - 1)
+
+        # side_by_side - neighbors are symmetric, and so are the blocks under and above them
+        for neighbor in list(block.side_by_side):
+            self.add_neighbors(neighbor, blk)
+            neighbor_block = self.state_data[neighbor]
+            if block.on_top_of is not None and neighbor_block.on_top_of is not None:
+                self.add_neighbors(block.on_top_of, neighbor_block.on_top_of)
+            if block.below is not None and neighbor_block.below is not None:
+                self.add_neighbors(block.below, neighbor_block.below)
@@ -0,0 +1,291 @@
+import heapq
+import itertools
+import time
+import aStar
+
+
+# Default weight used by weighted A* (f = g + weight * h)
+DEFAULT_WEIGHT = 2.0
+
+# Default number of nodes kept at each level of beam search
+DEFAULT_BEAM_WIDTH = 100
+
+# Weight of the first anytime weighted A* iteration, the weight is halved after every iteration
+DEFAULT_ANYTIME_WEIGHT = 5.0
+
+
+# A structure used to store search data for the graph search algorithms.
+# Unlike aStar.Node, each node keeps a link to its parent so the path can be rebuilt.
+class SearchNode:
+    __slots__ = ('state', 'action', 'parent', 'g', 'h')
+
+    # Function used to initialize object
+    def __init__(self, state, action=None, parent=None, g=0, h=0):
+        self.state = state      # A specific state in the search space
+        self.action = action    # An action used to get to this state
+        self.parent = parent    # The node this node was expanded from, None for the start node
+        self.g = g              # Cost to get to current state
+        self.h = h              # Heuristic value, estimated cost to goal
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "SearchNode[" + \
+                "\n\tState " + repr(self.state) + \
+                "\n\tAction(" + repr(self.action) + ")" + \
+                "\n\tg(" + repr(self.g) + ")" + \
+                "\n\th(" + repr(self.h) + ")]"
+
+
+# Function to build the search result for a goal node.
+# Returns the same values as aStar.a_star_search, the list of states (return_path=True)
+# or actions (return_path=False) from the start to the goal, and the path cost.
+def goal_result(goal_node, return_path):
+    result = []
+    node = goal_node
+    while node is not None:
+        result.append(node.state if return_path else node.action)
+        node = node.parent
+    result.reverse()
+    return result, goal_node.g
+
+
+# Function to expand a node.  Returns a list of (child state, action, cost to child)
+def expand(node, actions_func, take_action_func):
+    children = []
+    for action in actions_func(node.state):
+        (child_state, step_cost) = take_action_func(node.state, action)
+        children.append((child_state, action, node.g + step_cost))
+    return children
+
+
+# Defines a wrapper around an 'actions' callback that counts expanded nodes (see the --stats option
+# of the planners).  Every call to the actions callback is one node expansion.
+class ActionsCounter:
+    # Function used to initialize object
+    def __init__(self, actions_func):
+        self.actions_func = actions_func
+        self.expanded = 0
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "ActionsCounter[\texpanded(" + repr(self.expanded) + ")]\n"
+
+    def __call__(self, *args):
+        self.expanded += 1
+        return self.actions_func(*args)
+
+
+# Best-first graph search with an open heap and a closed set.
+# Nodes are ordered by f = g + weight * h.  With weight = 1 this is A*.
+# key_func: Function that converts a state into a hashable key, by default the state itself is used.
+# cost_bound: Nodes with g + h of cost_bound or more are not explored
+# deadline: time.time() value, the search fails once it is reached (None for no limit)
+def best_first_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                      return_path=True, key_func=None, weight=1.0, cost_bound=float('inf'), deadline=None):
+    if key_func is None:
+        key_func = lambda s: s
+
+    counter = itertools.count()
+    start_node = SearchNode(start_state, h=heuristic_func(start_state))
+    open_heap = [(weight * start_node.h, next(counter), start_node)]
+    best_g = {key_func(start_state): 0}
+    closed = set()
+
+    while open_heap:
+        f, sequence, node = heapq.heappop(open_heap)
+        key = key_func(node.state)
+        if key in closed:
+            continue
+
+        # Check for goal state
+        if goal_test_func(node.state):
+            return goal_result(node, return_path)
+        closed.add(key)
+
+        if deadline is not None and time.time() > deadline:
+            break
+
+        for child_state, action, g in expand(node, actions_func, take_action_func):
+            child_key = key_func(child_state)
+            if child_key in closed or g >= best_g.get(child_key, float('inf')):
+                continue
+            child_node = SearchNode(child_state, action, node, g, heuristic_func(child_state))
+            if g + child_node.h >= cost_bound:
+                continue
+            best_g[child_key] = g
+            heapq.heappush(open_heap, (g + weight * child_node.h, next(counter), child_node))
+
+    return "failure", float('inf')
+
+
+# A* search with an open heap and a closed set
+# cost_bound, deadline: Passed to best_first_search
+def a_star_graph_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                        return_path=True, key_func=None, cost_bound=float('inf'), deadline=None, **options):
+    return best_first_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                             return_path, key_func, 1.0, cost_bound, deadline)
+
+
+# Weighted A* search, f = g + weight * h.
+# Finds solutions faster than A*, the cost is at most 'weight' times the optimal cost
+# when the heuristic is admissible.
+# cost_bound, deadline: Passed to best_first_search
+def weighted_a_star_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                           return_path=True, key_func=None, weight=DEFAULT_WEIGHT, cost_bound=float('inf'),
+                           deadline=None, **options):
+    return best_first_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                             return_path, key_func, weight, cost_bound, deadline)
+
+
+# Anytime weighted A* search.
+# The first iteration is a weighted A* search with a large weight, which finds a complete solution
+# quickly.  Every following iteration halves the weight (down to 1, which is A*) and only explores
+# nodes with g + h lower than the cost of the best solution found so far.  The search stops when the A* iteration is
+# finished or the deadline is reached, and returns the best solution found.
+# Every iteration stops at the deadline, if the first iteration does not find a solution before the
+# deadline the search fails ("failure", inf).
+# deadline: time.time() value when the search should stop (None for no limit)
+# solution_func: Called with (result, cost) for every improved solution.  If it returns a value,
+#                that value is used as the new deadline (e.g. to keep time for the next planner).
+def anytime_weighted_a_star_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                                   return_path=True, key_func=None, weight=DEFAULT_ANYTIME_WEIGHT, deadline=None,
+                                   solution_func=None, **options):
+    best = ("failure", float('inf'))
+    weight = max(weight, 1.0)
+    while True:
+        result = best_first_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                                   return_path, key_func, weight, best[1], deadline)
+        if result[0] != "failure" and result[1] < best[1]:
+            best = result
+            if solution_func is not None:
+                new_deadline = solution_func(best[0], best[1])
+                if new_deadline is not None:
+                    deadline = new_deadline
+
+        if weight == 1.0 or best[0] == "failure" or (deadline is not None and time.time() > deadline):
+            return best
+        weight = max(weight / 2.0, 1.0)
+
+
+# Iterative deepening A* search.
+# Depth first search bounded by f = g + h, the bound is raised to the smallest f that exceeded it
+# until a goal is found.  Only the current path is stored (cycles on the path are skipped).
+def ida_star_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                    return_path=True, key_func=None, **options):
+    if key_func is None:
+        key_func = lambda s: s
+
+    start_node = SearchNode(start_state, h=heuristic_func(start_state))
+    bound = start_node.h
+    while True:
+        next_bound = float('inf')
+        on_path = {key_func(start_state)}
+
+        # Each stack entry is a node and the list of its unexplored children
+        stack = [(start_node, None)]
+        while stack:
+            node, children = stack[-1]
+            if children is None:
+                f = node.g + node.h
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                    stack.pop()
+                    on_path.discard(key_func(node.state))
+                    continue
+
+                # Check for goal state
+                if goal_test_func(node.state):
+                    return goal_result(node, return_path)
+
+                children = expand(node, actions_func, take_action_func)
+                children.reverse()
+                stack[-1] = (node, children)
+
+            if not children:
+                stack.pop()
+                if node is not start_node:
+                    on_path.discard(key_func(node.state))
+                continue
+
+            child_state, action, g = children.pop()
+            child_key = key_func(child_state)
+            if child_key in on_path:
+                continue
+            on_path.add(child_key)
+            stack.append((SearchNode(child_state, action, node, g, heuristic_func(child_state)), None))
+
+        if next_bound == float('inf'):
+            return "failure", float('inf')
+        bound = next_bound
+
+
+# Recursive best-first search, the search performed by aStar.a_star_search.
+# Additional options (e.g. transposition_size for PA1, starting_time for PA2) are passed to aStar.a_star_search.
+def rbfs_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                return_path=True, key_func=None, weight=None, beam_width=None, **options):
+    return aStar.a_star_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                               return_path=return_path, **options)
+
+
+# Beam search.
+# Breadth first search that only keeps the 'beam_width' nodes with the lowest f = g + h at each level.
+# Memory is bounded by the beam width, but the search is not complete or optimal.
+def beam_search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                return_path=True, key_func=None, beam_width=DEFAULT_BEAM_WIDTH, **options):
+    if key_func is None:
+        key_func = lambda s: s
+
+    beam = [SearchNode(start_state, h=heuristic_func(start_state))]
+    visited = {key_func(start_state)}
+    while beam:
+        # Check for goal state
+        for node in beam:
+            if goal_test_func(node.state):
+                return goal_result(node, return_path)
+
+        candidates = []
+        for node in beam:
+            for child_state, action, g in expand(node, actions_func, take_action_func):
+                child_key = key_func(child_state)
+                if child_key in visited:
+                    continue
+                visited.add(child_key)
+                candidates.append(SearchNode(child_state, action, node, g, heuristic_func(child_state)))
+
+        beam = heapq.nsmallest(beam_width, candidates, key=lambda n: n.g + n.h)
+
+    return "failure", float('inf')
+
+
+# Registry of the available search algorithms.
+# Every algorithm takes the same callbacks as aStar.a_star_search and returns the same results.
+ALGORITHMS = {
+    'astar': a_star_graph_search,
+    'idastar': ida_star_search,
+    'rbfs': rbfs_search,
+    'wastar': weighted_a_star_search,
+    'beam': beam_search,
+    'anytime': anytime_weighted_a_star_search,
+}
+
+
+# Function to add a search algorithm to the registry
+def register_algorithm(name, search_func):
+    ALGORITHMS[name] = search_func
+
+
+# This is the entry point for all search algorithms.
+# algorithm: Name of the algorithm in ALGORITHMS
+# weight: Heuristic weight used by weighted A* ('wastar') and the first anytime iteration ('anytime')
+# beam_width: Number of nodes kept at each level by beam search ('beam')
+# key_func: Function that converts a state into a hashable key (used by the graph searches)
+# options: Additional options passed to the algorithm (e.g. transposition_size or starting_time for 'rbfs')
+def search(start_state, actions_func, take_action_func, goal_test_func, heuristic_func, algorithm='rbfs',
+           return_path=True, weight=DEFAULT_WEIGHT, beam_width=DEFAULT_BEAM_WIDTH, key_func=None, **options):
+    if algorithm not in ALGORITHMS:
+        print("ERROR: search - UNKNOWN algorithm({})".format(algorithm))
+        return "failure", float('inf')
+
+    return ALGORITHMS[algorithm](start_state, actions_func, take_action_func, goal_test_func, heuristic_func,
+                                 return_path=return_path, key_func=key_func, weight=weight,
+                                 beam_width=beam_width, **options)
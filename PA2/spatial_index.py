@@ -0,0 +1,61 @@
+# Defines the location index used by the inference passes of Relation.gen_relationships.
+# The passes ask which blocks are at a location, in a column or have no location yet.  Without the
+# index every question is a loop over all the blocks, so a pass over all the blocks is quadratic.
+# The index is built once from the blocks and every location set while the relation is inferred is
+# given to it (see Relation.place_block), so the questions are dictionary lookups.
+#   cells    - location (x, y, z) -> blocks at that location, more than one only for conflicting input
+#   columns  - column (x, y) -> blocks stacked in that column
+#   unplaced - blocks without a valid location, in relation order (the values are not used)
+class SpatialIndex:
+    # Function used to initialize object
+    def __init__(self, state_data):
+        self.cells = dict()
+        self.columns = dict()
+        self.unplaced = dict()
+        for blk, block in state_data.items():
+            self.add(blk, block)
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "SpatialIndex[" \
+               "\tcells(" + repr(self.cells) + ")" + \
+               "\tunplaced(" + repr(list(self.unplaced)) + ")]\n"
+
+    # Function to add a block to the index
+    def add(self, blk, block):
+        if block.is_location_valid():
+            location = block.get_location()
+            self.cells.setdefault(location, []).append(blk)
+            self.columns.setdefault((location[0], location[1]), []).append(blk)
+        else:
+            self.unplaced[blk] = True
+
+    # Function to remove a block from the index.
+    # location: Location the block was added with, None if it had no valid location
+    def remove(self, blk, location):
+        if location is None:
+            self.unplaced.pop(blk, None)
+            return
+
+        for key, index in ((location, self.cells), ((location[0], location[1]), self.columns)):
+            blocks = index.get(key)
+            if blocks is not None and blk in blocks:
+                blocks.remove(blk)
+                if not blocks:
+                    del index[key]
+
+    # Function to get the blocks at a location
+    def get_blocks_at(self, x_pos, y_pos, z_pos):
+        return self.cells.get((x_pos, y_pos, z_pos), ())
+
+    # Function to get the blocks in a column, bottom to top is not guaranteed
+    def get_column(self, x_pos, y_pos):
+        return self.columns.get((x_pos, y_pos), ())
+
+    # Function to determine if a block other than 'blk' is at a location
+    def is_occupied(self, x_pos, y_pos, z_pos, blk=None):
+        return any(other != blk for other in self.get_blocks_at(x_pos, y_pos, z_pos))
+
+    # Function to determine if a block other than 'blk' is in a column
+    def is_column_occupied(self, x_pos, y_pos, blk=None):
+        return any(other != blk for other in self.get_column(x_pos, y_pos))
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import pickle
+import block as b
+
+
+# Directory where the inferred relations are saved, one file per (initial file, goal file) pair
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'relation_cache')
+
+# Changing the file format invalidates the saved relations
+CACHE_VERSION = 1
+
+# Source files of the inference code, changing one of them invalidates the saved relations
+CODE_FILES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+              for name in ('relation.py', 'block.py', 'board.py', 'propagation.py', 'spatial_index.py',
+                           'wildcards.py')]
+
+
+# Function to build the key used to name the cache file.
+# The key is a digest of the input files, the board size, the inference code and the cache version.
+def cache_key(initial_file, goal_file, board_size=None):
+    digest = hashlib.sha1(repr(CACHE_VERSION).encode('utf-8'))
+    digest.update(repr(board_size).encode('utf-8'))
+    for path in [initial_file, goal_file] + CODE_FILES:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+# Function to convert a relation into plain tuples, one per block (in state_data order)
+def relation_to_data(relation):
+    blocks = tuple((block.block_id, block.color, block.on_top_of, block.below, tuple(block.side_by_side),
+                    block.x_position, block.y_position, block.z_position)
+                   for block in relation.state_data.values())
+    return relation.grabbed_block, blocks
+
+
+# Function to populate a relation from the tuples built by relation_to_data
+def data_to_relation(relation, data):
+    grabbed_block, blocks = data
+    relation.state_data = {}
+    for block_id, color, on_top_of, below, side_by_side, x_pos, y_pos, z_pos in blocks:
+        block = b.Block(block_id, x_pos, y_pos, z_pos, relation.board)
+        block.color = color
+        block.on_top_of = on_top_of
+        block.below = below
+        block.side_by_side = list(side_by_side)
+        relation.state_data[block_id] = block
+    relation.grabbed_block = grabbed_block
+    relation.owned_blocks = set()
+    relation.update_occupancy()
+
+
+# Function to populate the initial and goal relations from their files.
+# Reading the goal file runs the inference passes of Relation.gen_relationships on both relations,
+# the inferred relations are saved in 'cache_dir' so the next run with the same files skips them.
+# Set cache_dir to None to disable the cache.
+# Returns True if the relations were loaded from the cache
+def get_states_from_files(initial_state, goal_state, initial_file, goal_file, cache_dir=DEFAULT_CACHE_DIR):
+    cache_file = None
+    if cache_dir is not None:
+        key = cache_key(initial_file, goal_file, initial_state.board.get_size())
+        cache_file = os.path.join(cache_dir, 'relations_{}.pickle'.format(key))
+
+    if cache_file is not None and os.path.exists(cache_file):
+        data = load(cache_file)
+        if data is not None:
+            data_to_relation(initial_state, data[0])
+            data_to_relation(goal_state, data[1])
+            return True
+
+    initial_state.get_state_from_file(initial_file)
+    goal_state.get_state_from_file(goal_file, initial_state)
+    if cache_file is not None:
+        save(cache_file, (relation_to_data(initial_state), relation_to_data(goal_state)))
+    return False
+
+
+# Function to load the saved relations, returns None if the file can not be used
+def load(cache_file):
+    try:
+        with open(cache_file, 'rb') as f:
+            version, data = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+        return None
+
+    if version != CACHE_VERSION:
+        return None
+    return data
+
+
+# Function to save the relations, the planner still works if the cache can not be written
+def save(cache_file, data):
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump((CACHE_VERSION, data), f, pickle.HIGHEST_PROTOCOL)
+    except OSError as e:
+        print("ERROR: state_cache - unable to save cache file({}): {}".format(cache_file, e))
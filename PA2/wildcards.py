@@ -0,0 +1,520 @@
+from collections import deque
+import heapq
+import itertools
+from constants import *
+
+
+# Defines the wildcard resolver used by Relation.gen_relationships.
+# A wildcard of the goal relation stands for one of the real blocks.  The bindings are solved as a
+# constraint satisfaction problem instead of scanning the blocks once per heuristic:
+#   - the compatibility of every (wildcard, block) pair is computed once from the color, location and
+#     stacking facts, the compatible blocks are the domain of the wildcard
+#   - arc consistency removes the blocks that do not fit any block of a related wildcard (on_top_of,
+#     below, side_by_side), and a block that is the only choice of a wildcard is removed from the
+#     domains of the other wildcards
+#   - the remaining choices are an assignment problem solved with the Hungarian algorithm, the weight of
+#     a pair is the estimated number of moves needed to bring the block from its initial location to
+#     the wildcard location, so the binding that leaves the least work to the planner is used
+# Ties are broken by the relation order of the blocks.
+# A wildcard that can not be bound (empty domain, or not enough blocks) is left in the relation.
+
+# Maximum number of problems split by WildcardResolver.match to improve on the first binding without conflicts
+MAX_BRANCHES = 100
+
+
+# Function to determine if a block id is a wildcard
+def is_wildcard(blk):
+    return 'wildcard' in blk.lower()
+
+
+class WildcardResolver:
+    # Function used to initialize object
+    # other_relation: Relation with the initial block locations used to estimate the move costs
+    def __init__(self, relation, other_relation=None):
+        self.relation = relation
+        self.state_data = relation.state_data
+        self.other_relation = other_relation
+        self.wildcards = [blk for blk in self.state_data if is_wildcard(blk)]
+        self.blocks = [blk for blk in self.state_data if not is_wildcard(blk)]
+        self.domains = dict()               # Wildcard -> compatible blocks (relation order)
+        self.related = dict()               # Wildcard -> wildcards named in its facts
+        self.bindings = dict()              # Wildcard -> block
+        self.names = dict()                 # Block -> blocks named in its stacking and neighbor facts
+        for blk, block in self.state_data.items():
+            self.names[blk] = frozenset([block.on_top_of, block.below] + block.side_by_side)
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "WildcardResolver[" \
+               "\trelation_id(" + repr(self.relation.relation_id) + ")" + \
+               "\tdomains(" + repr(self.domains) + ")" + \
+               "\tbindings(" + repr(self.bindings) + ")]\n"
+
+    # Function to bind the wildcards and replace them with their blocks in the relation
+    # Returns the bindings, wildcard -> block
+    def run(self):
+        if not self.wildcards:
+            return self.bindings
+
+        self.build_domains()
+        self.make_arc_consistent()
+        self.match()
+
+        # Facts that name a bound wildcard name its block from now on, so the bindings can be applied in any order
+        for block in self.state_data.values():
+            block.set_on_top_of(self.bindings.get(block.on_top_of, block.on_top_of))
+            block.set_below(self.bindings.get(block.below, block.below))
+            neighbors = []
+            for neighbor in block.side_by_side:
+                neighbor = self.bindings.get(neighbor, neighbor)
+                if neighbor not in neighbors:
+                    neighbors.append(neighbor)
+            block.side_by_side = neighbors
+
+        for wildcard in self.wildcards:
+            if wildcard in self.bindings:
+                self.relation.assign_wildcard_to_block_and_remove(wildcard, self.bindings[wildcard])
+        return self.bindings
+
+    # Function to build the domain of every wildcard
+    def build_domains(self):
+        # A location described for a wildcard that already has a real block is that block
+        locations = dict()
+        for blk in self.blocks:
+            if self.state_data[blk].is_location_valid():
+                locations[self.state_data[blk].get_location()] = blk
+
+        for wildcard in self.wildcards:
+            wild = self.state_data[wildcard]
+            if wild.is_location_valid() and wild.get_location() in locations:
+                candidates = [locations[wild.get_location()]]
+            else:
+                candidates = self.blocks
+            self.domains[wildcard] = [blk for blk in candidates if self.is_compatible(wildcard, blk)]
+
+            # Wildcards named in the facts of the wildcard (the other constraints are checked by match)
+            self.related[wildcard] = []
+            for other in [wild.on_top_of, wild.below] + wild.side_by_side:
+                if other is not None and other != wildcard and is_wildcard(other) and other in self.state_data and \
+                        other not in self.related[wildcard]:
+                    self.related[wildcard].append(other)
+
+        # Constraints are symmetric
+        for wildcard in self.wildcards:
+            for other in self.related[wildcard]:
+                if wildcard not in self.related[other]:
+                    self.related[other].append(wildcard)
+
+    # Function to determine if a wildcard can be a block, using the facts that do not name another wildcard
+    def is_compatible(self, wildcard, blk):
+        wild = self.state_data[wildcard]
+        block = self.state_data[blk]
+
+        # Color
+        if wild.color is not None and wild.color != block.color:
+            return False
+
+        # The wildcard can not be a property of the block (or the other way around)
+        if wildcard in (block.on_top_of, block.below) or wildcard in block.side_by_side:
+            return False
+        if blk in (wild.on_top_of, wild.below) or blk in wild.side_by_side:
+            return False
+
+        # The bound block can only be on top of, below or beside another block
+        for other in set([wild.on_top_of, wild.below] + wild.side_by_side):
+            if other is not None and not is_wildcard(other) and \
+                    len(self.relationships(wild, (other,)) | self.relationships(block, (other,))) > 1:
+                return False
+
+        # Location, and the stacking and neighbor facts of both of them at that location
+        if wild.is_location_valid() and block.is_location_valid() and wild.get_location() != block.get_location():
+            return False
+        location = self.bound_location(wildcard, blk)
+        if location is not None and not (self.fits_location(wild, location) and self.fits_location(block, location)):
+            return False
+
+        # Stacking - two different blocks, or two different wildcards (they can not be the same block)
+        for wild_fact, block_fact in [(wild.on_top_of, block.on_top_of), (wild.below, block.below)]:
+            if wild_fact is not None and block_fact is not None and wild_fact != block_fact and \
+                    is_wildcard(wild_fact) == is_wildcard(block_fact):
+                return False
+        return True
+
+    # Function to get the kinds of facts ('on_top_of', 'below', 'side_by_side') of a block that name one of
+    # the given blocks
+    def relationships(self, block, names):
+        kinds = set()
+        if block.on_top_of in names:
+            kinds.add('on_top_of')
+        if block.below in names:
+            kinds.add('below')
+        if any(name in block.side_by_side for name in names):
+            kinds.add('side_by_side')
+        return kinds
+
+    # Function to determine if the facts of a block hold at a location, for the facts that name a real block
+    # with a valid location
+    def fits_location(self, block, location):
+        x, y, z = location
+        for other, other_location in [(block.on_top_of, (x, y, z - 1)), (block.below, (x, y, z + 1))]:
+            if other is not None and not is_wildcard(other) and other in self.state_data and \
+                    self.state_data[other].is_location_valid() and \
+                    self.state_data[other].get_location() != other_location:
+                return False
+        for neighbor in block.side_by_side:
+            if not is_wildcard(neighbor) and neighbor in self.state_data and \
+                    self.state_data[neighbor].is_location_valid():
+                n_x, n_y, n_z = self.state_data[neighbor].get_location()
+                if n_z != z or (n_x - x, n_y - y) not in adjacent_moves:
+                    return False
+        return True
+
+    # Function to get the location a block has when it is bound to a wildcard, None if unknown
+    def bound_location(self, wildcard, blk):
+        if self.state_data[wildcard].is_location_valid():
+            return self.state_data[wildcard].get_location()
+        if self.state_data[blk].is_location_valid():
+            return self.state_data[blk].get_location()
+        return None
+
+    # Function to determine if two (wildcard, block) bindings can be used together
+    def is_consistent(self, wildcard, blk, other, other_blk):
+        if blk == other_blk:
+            return False
+
+        # Bindings whose facts do not name each other are always consistent
+        names = self.names
+        if not (other in names[wildcard] or other_blk in names[wildcard] or
+                other in names[blk] or other_blk in names[blk] or
+                wildcard in names[other] or blk in names[other] or
+                wildcard in names[other_blk] or blk in names[other_blk]):
+            return True
+
+        for w_a, b_a, w_b, b_b in [(wildcard, blk, other, other_blk), (other, other_blk, wildcard, blk)]:
+            wild = self.state_data[w_a]
+            block = self.state_data[b_a]
+            # The bound block can only be on top of, below or beside the other bound block
+            if len(self.relationships(wild, (w_b, b_b)) | self.relationships(block, (w_b, b_b))) > 1:
+                return False
+            # A stacking fact that names the other wildcard must hold once it is replaced with its block
+            if wild.on_top_of == w_b and block.on_top_of not in (None, w_b, b_b):
+                return False
+            if wild.below == w_b and block.below not in (None, w_b, b_b):
+                return False
+            if block.on_top_of == w_b and wild.on_top_of not in (None, w_b, b_b):
+                return False
+            if block.below == w_b and wild.below not in (None, w_b, b_b):
+                return False
+
+        # Stacking and neighbor facts between the two blocks, at the locations they get
+        location = self.bound_location(wildcard, blk)
+        other_location = self.bound_location(other, other_blk)
+        if location is None or other_location is None:
+            return True
+        pairs = [(wildcard, blk, location, other, other_blk, other_location),
+                 (other, other_blk, other_location, wildcard, blk, location)]
+        for w_a, b_a, (x, y, z), w_b, b_b, (o_x, o_y, o_z) in pairs:
+            for block in [self.state_data[w_a], self.state_data[b_a]]:
+                if block.on_top_of in (w_b, b_b) and (o_x, o_y, o_z) != (x, y, z - 1):
+                    return False
+                if block.below in (w_b, b_b) and (o_x, o_y, o_z) != (x, y, z + 1):
+                    return False
+                if (w_b in block.side_by_side or b_b in block.side_by_side) and \
+                        (o_z != z or (o_x - x, o_y - y) not in adjacent_moves):
+                    return False
+        return True
+
+    # Function to remove the blocks of a wildcard's domain that have no support in a related wildcard
+    # Returns True if the domain changed
+    def revise(self, wildcard, other):
+        domain = self.domains[wildcard]
+        supported = [blk for blk in domain
+                     if any(self.is_consistent(wildcard, blk, other, other_blk) for other_blk in self.domains[other])]
+        if len(supported) == len(domain):
+            return False
+        self.domains[wildcard] = supported
+        return True
+
+    # Function to reduce the domains until every related pair of wildcards is arc consistent and no block
+    # that is the only choice of a wildcard is still in the domain of another wildcard
+    # changed: wildcards whose domain changed since the domains were last made consistent, None for all
+    def make_arc_consistent(self, changed=None):
+        if changed is None:
+            changed = self.wildcards
+        arcs = deque((neighbor, wildcard) for wildcard in changed for neighbor in self.related[wildcard])
+        queued = set(arcs)
+        singles = set()
+        while True:
+            while arcs:
+                wildcard, other = arcs.popleft()
+                queued.discard((wildcard, other))
+                if self.revise(wildcard, other):
+                    for neighbor in self.related[wildcard]:
+                        if neighbor != other and (neighbor, wildcard) not in queued:
+                            queued.add((neighbor, wildcard))
+                            arcs.append((neighbor, wildcard))
+
+            # All different - a block that is the only choice of a wildcard can not be used by the others
+            changed = []
+            for wildcard in self.wildcards:
+                if len(self.domains[wildcard]) == 1 and wildcard not in singles:
+                    singles.add(wildcard)
+                    blk = self.domains[wildcard][0]
+                    for other in self.wildcards:
+                        if other != wildcard and blk in self.domains[other]:
+                            self.domains[other] = [o_blk for o_blk in self.domains[other] if o_blk != blk]
+                            changed.append(other)
+            if not changed:
+                break
+            for other in changed:
+                for neighbor in self.related[other]:
+                    if (neighbor, other) not in queued:
+                        queued.add((neighbor, other))
+                        arcs.append((neighbor, other))
+
+    # Function to estimate the number of moves needed to bring a block to the location of a wildcard.
+    # The blocks stacked on top of the block in the initial relation have to be moved first.
+    def move_cost(self, wildcard, blk):
+        if self.other_relation is None or blk not in self.other_relation.state_data:
+            return 0
+        start = self.other_relation.state_data[blk]
+        target = self.target_location(wildcard, blk)
+        if target is None or not start.is_location_valid():
+            return 0
+
+        x, y, z = start.get_location()
+        if (x, y, z) == target:
+            return 0
+        blocks_above = self.other_relation.get_column_height(x, y) - z - 1
+        return abs(target[0] - x) + abs(target[1] - y) + abs(target[2] - z) + max(blocks_above, 0)
+
+    # Function to get the goal location of a block bound to a wildcard.
+    # If neither of them has a location, the location is estimated from the stacking facts and neighbors.
+    def target_location(self, wildcard, blk):
+        location = self.bound_location(wildcard, blk)
+        if location is not None:
+            return location
+
+        wild = self.state_data[wildcard]
+        for other, delta_z in [(wild.on_top_of, 1), (wild.below, -1)]:
+            if other is not None and other in self.state_data and self.state_data[other].is_location_valid():
+                x, y, z = self.state_data[other].get_location()
+                return x, y, z + delta_z
+        for neighbor in wild.side_by_side:
+            if neighbor in self.state_data and self.state_data[neighbor].is_location_valid():
+                return self.state_data[neighbor].get_location()
+        return None
+
+    # Function to pick one block per wildcard with the lowest total move cost.
+    # The assignment problem only knows the domains, the constraints between the wildcards are added with
+    # branch and bound: a binding that breaks one is split in two problems (see below).  The cheapest
+    # problems are followed depth first until a binding without conflicts is found, after that the open
+    # problem with the lowest cost is solved next, until no open problem can be cheaper than that binding.
+    def match(self):
+        rows = [wildcard for wildcard in self.wildcards if self.domains[wildcard]]
+        if not rows:
+            return
+        used = set(blk for wildcard in rows for blk in self.domains[wildcard])
+        columns = [blk for blk in self.blocks if blk in used]
+
+        # Costs are integers: the move cost decides, the column position only breaks ties
+        scale = len(rows) * len(columns) + 1
+        costs = {(wildcard, blk): self.move_cost(wildcard, blk) * scale + column
+                 for wildcard in rows for column, blk in enumerate(columns) if blk in self.domains[wildcard]}
+
+        # One extra column per wildcard to leave it unbound, more expensive than any binding,
+        # and a cost for the incompatible pairs that is more expensive than leaving every wildcard unbound
+        unbound = len(rows) * max(costs.values()) + 1
+        incompatible = len(rows) * unbound + 1
+
+        # Row of the assignment matrix for the domain of a wildcard
+        def matrix_row(wildcard, domain):
+            domain = set(domain)
+            return [costs[(wildcard, blk)] if blk in domain else incompatible for blk in columns] + \
+                [unbound] * len(rows)
+
+        # Bindings of a solved assignment, the wildcards assigned to an extra or incompatible column are unbound
+        def get_bindings(domains, assignment):
+            bindings = dict()
+            for row, column in enumerate(assignment.get_columns()):
+                if column < len(columns) and columns[column] in domains[rows[row]]:
+                    bindings[rows[row]] = columns[column]
+            return bindings
+
+        assignment = Assignment([matrix_row(wildcard, self.domains[wildcard]) for wildcard in rows])
+        assignment.solve()
+        counter = itertools.count()
+        problem = (assignment.get_cost(), next(counter), self.domains, assignment)
+        open_problems = []
+        best = None
+        best_cost = None
+        branches = 0
+        while branches < MAX_BRANCHES:
+            if problem is None:
+                if not open_problems:
+                    break
+                problem = heapq.heappop(open_problems)
+            cost, sequence, domains, assignment = problem
+            problem = None
+            if best_cost is not None and cost >= best_cost:
+                break
+
+            bindings = get_bindings(domains, assignment)
+            conflict = self.find_conflict(bindings)
+            if conflict is None:
+                best = bindings
+                best_cost = cost
+                continue
+            if best_cost is None:
+                best = bindings
+            else:
+                branches += 1
+
+            # Either the first wildcard is not bound to its block, or it is and the second wildcard can only
+            # use the blocks that fit with it
+            (wildcard, blk), (other, other_blk) = conflict
+            without = dict(domains)
+            without[wildcard] = [d_blk for d_blk in domains[wildcard] if d_blk != blk]
+            bound = dict(domains)
+            bound[wildcard] = [blk]
+            bound[other] = [o_blk for o_blk in domains[other] if self.is_consistent(wildcard, blk, other, o_blk)]
+            children = []
+            for child_domains, changed in [(without, [wildcard]), (bound, [wildcard, other])]:
+                self.domains = child_domains
+                self.make_arc_consistent(changed)
+
+                # Only the rows of the domains that changed are assigned again
+                child = assignment.copy()
+                for row, row_wildcard in enumerate(rows):
+                    if self.domains[row_wildcard] is not domains[row_wildcard]:
+                        child.set_row(row, matrix_row(row_wildcard, self.domains[row_wildcard]))
+                child.solve()
+                children.append((child.get_cost(), next(counter), self.domains, child))
+
+            # Until a binding without conflicts is found, go on with the child that binds the first wildcard
+            # (depth first), unless that leaves more wildcards unbound
+            if best_cost is None:
+                without_child, bound_child = children
+                if len(get_bindings(bound_child[2], bound_child[3])) >= \
+                        len(get_bindings(without_child[2], without_child[3])):
+                    problem = children.pop(1)
+                else:
+                    problem = children.pop(0)
+            for child in children:
+                heapq.heappush(open_problems, child)
+
+        # The conflicts that are left are reported when the bindings are applied
+        self.bindings = best
+
+    # Function to find two bindings that can not be used together.  Arc consistency only checked the
+    # related wildcards, two blocks that are stacked or side by side in the goal can be bound to any wildcards.
+    # Returns ((wildcard, block), (other wildcard, other block)), None if there is no conflict
+    def find_conflict(self, bindings):
+        for (wildcard, blk), (other, other_blk) in itertools.combinations(bindings.items(), 2):
+            if not self.is_consistent(wildcard, blk, other, other_blk):
+                return (wildcard, blk), (other, other_blk)
+        return None
+
+
+# Defines an assignment problem solved with the Hungarian algorithm (shortest augmenting paths).
+# The matrix is made square with rows of zero cost, so every column is assigned and the potentials stay
+# optimal when the costs of a row go up: after set_row only the changed rows are assigned again instead
+# of solving the whole problem.
+class Assignment:
+    # Function used to initialize object
+    # matrix: n rows of m costs, n <= m
+    def __init__(self, matrix):
+        num_columns = len(matrix[0])
+        self.num_rows = len(matrix)
+        self.matrix = list(matrix) + [[0] * num_columns] * (num_columns - len(matrix))
+        self.row_potential = [0] * (num_columns + 1)
+        self.column_potential = [0] * (num_columns + 1)
+        self.row_column = [0] * (num_columns + 1)          # Column assigned to a row (1 based, 0 if free)
+        self.column_row = [0] * (num_columns + 1)          # Row assigned to a column (1 based, 0 if free)
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "Assignment[" \
+               "\tcolumns(" + repr(self.get_columns()) + ")" + \
+               "\tcost(" + repr(self.get_cost()) + ")]\n"
+
+    # Function to make a copy of the assignment, the rows of the matrix are shared
+    def copy(self):
+        assignment = Assignment.__new__(Assignment)
+        assignment.num_rows = self.num_rows
+        assignment.matrix = list(self.matrix)
+        assignment.row_potential = list(self.row_potential)
+        assignment.column_potential = list(self.column_potential)
+        assignment.row_column = list(self.row_column)
+        assignment.column_row = list(self.column_row)
+        return assignment
+
+    # Function to replace the costs of a row, no cost can be lower than before.
+    # The row keeps its column if the cost of that column did not change.
+    def set_row(self, row, costs):
+        column = self.row_column[row + 1]
+        if column and costs[column - 1] != self.matrix[row][column - 1]:
+            self.column_row[column] = 0
+            self.row_column[row + 1] = 0
+        self.matrix[row] = costs
+
+    # Function to get the column assigned to each row
+    def get_columns(self):
+        return [column - 1 for column in self.row_column[1:self.num_rows + 1]]
+
+    # Function to get the total cost of the assigned rows
+    def get_cost(self):
+        return sum(self.matrix[row][column - 1] for row, column in enumerate(self.row_column[1:self.num_rows + 1])
+                   if column)
+
+    # Function to assign every row that has no column
+    def solve(self):
+        for row in range(1, len(self.matrix) + 1):
+            if not self.row_column[row]:
+                self.assign(row)
+
+    # Function to assign a row, along the shortest augmenting path
+    def assign(self, row):
+        num_columns = len(self.column_potential) - 1
+        row_potential = self.row_potential
+        column_potential = self.column_potential
+        column_row = self.column_row
+        way = [0] * (num_columns + 1)                      # Previous column on the augmenting path
+        min_slack = [float('inf')] * (num_columns + 1)
+        visited = [False] * (num_columns + 1)
+
+        column_row[0] = row
+        column = 0
+        while True:
+            visited[column] = True
+            current_row = column_row[column]
+            delta = float('inf')
+            next_column = 0
+            costs = self.matrix[current_row - 1]
+            potential = row_potential[current_row]
+            for j in range(1, num_columns + 1):
+                if not visited[j]:
+                    slack = costs[j - 1] - potential - column_potential[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = column
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        next_column = j
+            for j in range(num_columns + 1):
+                if visited[j]:
+                    row_potential[column_row[j]] += delta
+                    column_potential[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            column = next_column
+            if column_row[column] == 0:
+                break
+
+        # Flip the augmenting path
+        while column:
+            previous = way[column]
+            column_row[column] = column_row[previous]
+            self.row_column[column_row[column]] = column
+            column = previous
+        column_row[0] = 0
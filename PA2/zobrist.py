@@ -0,0 +1,25 @@
+import hashlib
+
+
+# Zobrist hashing.  Every (block, property, value) item of a state gets a fixed 64-bit random key and
+# the fingerprint of a state is the XOR of the keys of its items.  When a block moves, the key of its
+# old item is XORed out and the key of its new item is XORed in, so the fingerprint of a successor
+# is updated in O(1) instead of hashing the whole state again.
+# The keys are derived from the items themselves (not drawn from a seeded generator), so every state
+# of a problem, in every process, gets the same keys and fingerprints can be compared between them.
+
+# Number of bits of a key
+KEY_BITS = 64
+
+# Keys already derived, item -> key
+keys = dict()
+
+
+# Function to get the key of an item, e.g. get_key('block1', 'location', (1, 2, 0))
+def get_key(*item):
+    key = keys.get(item)
+    if key is None:
+        digest = hashlib.blake2b(repr(item).encode(), digest_size=KEY_BITS // 8).digest()
+        key = int.from_bytes(digest, 'little')
+        keys[item] = key
+    return key
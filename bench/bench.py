@@ -0,0 +1,353 @@
+import argparse
+import csv
+import fnmatch
+import glob
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Runs every planner on every example problem of the repository and records, for each run, the wall
+# time, the number of expanded nodes, the peak memory and the plan length.  Each run is a separate
+# process (started with the planner --stats option), so runs can not change each other's caches and
+# the peak memory of a run is the peak resident memory of its process.
+# The results are written to a JSON file (and optionally a CSV file) and compared against a stored
+# baseline, a run that got worse than the baseline is reported as a regression.
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT_DIR, 'bench')
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, 'results.json')
+GREEN_TEAM_DIR = os.path.join(ROOT_DIR, 'cs540_project_green_team', 'examples')
+
+# Planners, name -> (working directory, script, arguments)
+# The green team examples are PA2 problems (the green team path planner is adapted from PA2), they
+# are solved with the PA2 planner.  PA2 always infers the relations so the cache does not hide that time.
+PLANNERS = {
+    'PA1': ('PA1', 'PA1.py', ['-s']),
+    'PA2': ('PA2', 'PA2.py', ['-s', '-n']),
+}
+
+# Modules shared by the planners.  Each assignment directory runs on its own, so PA1 and PA2 both have a copy
+# of these modules.  The copies must stay identical, make every change to both of them, the benchmark checks
+# that they match before running any problem.
+SHARED_MODULES = ['profiler.py', 'search.py', 'zobrist.py']
+
+# Problem suites, suite -> planner
+SUITES = {
+    'PA1': 'PA1',
+    'PA2': 'PA2',
+    'green': 'PA2',
+}
+
+# Fields of a result, in CSV column order
+FIELDS = ['suite', 'problem', 'planner', 'status', 'seconds', 'search_seconds', 'first_command_seconds', 'nodes',
+          'peak_kb', 'plan_length']
+
+# A run is a regression when its time, nodes or peak memory is more than this many times the baseline value
+DEFAULT_TOLERANCE = 1.5
+
+# Time differences below this many seconds are noise, they are never reported as regressions
+MIN_SECONDS = 0.25
+
+
+# Defines a single benchmark problem, an initial and goal state file solved by a planner
+class Problem:
+    # Function used to initialize object
+    def __init__(self, suite, name, initial_file, goal_file):
+        self.suite = suite                  # One of SUITES
+        self.name = name                    # Problem name, unique in the suite
+        self.planner = SUITES[suite]        # One of PLANNERS
+        self.initial_file = initial_file    # Absolute path of the initial state file
+        self.goal_file = goal_file          # Absolute path of the goal state file
+
+    # Function to display the contents of the structure when printed
+    def __repr__(self):
+        return "Problem[" \
+               "\tsuite(" + repr(self.suite) + ")" + \
+               "\tname(" + repr(self.name) + ")" + \
+               "\tplanner(" + repr(self.planner) + ")" + \
+               "\tinitial_file(" + repr(self.initial_file) + ")" + \
+               "\tgoal_file(" + repr(self.goal_file) + ")]\n"
+
+    # Function to get the key used to match a result with its baseline
+    def get_key(self):
+        return self.suite + '/' + self.name
+
+
+# Function to sort file names naturally, so 's10' comes after 's9'
+def natural_key(file_name):
+    return [int(t) if t.isdigit() else t for t in re.split(r'(\d+)', file_name)]
+
+
+# Function to find the problems of a suite.
+# Initial state files without a goal state file (or the other way around) are skipped.
+def find_problems(suite):
+    pairs = []
+    if suite == 'PA1':
+        for initial_file in glob.glob(os.path.join(ROOT_DIR, 'PA1', 'initial*.txt')):
+            goal_file = os.path.join(ROOT_DIR, 'PA1', os.path.basename(initial_file).replace('initial', 'goal'))
+            pairs.append((os.path.basename(initial_file)[:-len('.txt')], initial_file, goal_file))
+    elif suite == 'PA2':
+        for initial_file in glob.glob(os.path.join(ROOT_DIR, 'PA2', '*_initial.txt')):
+            name = os.path.basename(initial_file)[:-len('_initial.txt')]
+            pairs.append((name, initial_file, initial_file.replace('_initial.txt', '_goal.txt')))
+        pairs.append(('state', os.path.join(ROOT_DIR, 'PA2', 'initial_state.txt'),
+                      os.path.join(ROOT_DIR, 'PA2', 'goal_state.txt')))
+    elif suite == 'green':
+        # examples/initialState/<name>-start<n>.txt goes with examples/goals-PA2/<name>-goal<n>.txt
+        for initial_file in glob.glob(os.path.join(GREEN_TEAM_DIR, 'initialState', '*-start*.txt')):
+            goal_name = os.path.basename(initial_file).replace('-start', '-goal')
+            pairs.append((goal_name[:-len('.txt')].replace('-goal', ''), initial_file,
+                          os.path.join(GREEN_TEAM_DIR, 'goals-PA2', goal_name)))
+
+    return [Problem(suite, name, initial_file, goal_file)
+            for name, initial_file, goal_file in sorted(pairs, key=lambda p: natural_key(p[0]))
+            if os.path.isfile(initial_file) and os.path.isfile(goal_file)]
+
+
+# Function to copy a state file without its '//' comment lines, the planners do not parse comments.
+# Returns the name of the file to give to the planner (the original file if it has no comments)
+def strip_comments(file_name, directory):
+    with open(file_name) as f:
+        lines = f.readlines()
+    kept = [line for line in lines if not line.strip().startswith('//')]
+    if len(kept) == len(lines):
+        return file_name
+
+    stripped_file = os.path.join(directory, os.path.basename(os.path.dirname(file_name)) + '_' +
+                                 os.path.basename(file_name))
+    with open(stripped_file, 'w') as f:
+        f.writelines(kept)
+    return stripped_file
+
+
+# Function to wait for a planner process, the process is killed once the time limit is reached.
+# Returns (exit code, peak resident memory in KB), the exit code is None if the process was killed
+# and the peak memory is None where the operating system does not report it (no os.wait4)
+def wait_for_process(process, time_limit):
+    timed_out = []
+
+    def kill():
+        timed_out.append(True)
+        process.kill()
+
+    timer = threading.Timer(time_limit, kill)
+    timer.start()
+    try:
+        if not hasattr(os, 'wait4'):
+            process.wait()
+            return (None if timed_out else process.returncode), None
+
+        pid, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.WEXITSTATUS(status) if os.WIFEXITED(status) else -os.WTERMSIG(status)
+    finally:
+        timer.cancel()
+
+    # ru_maxrss is in bytes on macOS and in KB everywhere else
+    peak_kb = usage.ru_maxrss / 1024.0 if sys.platform == 'darwin' else float(usage.ru_maxrss)
+    return (None if timed_out else process.returncode), peak_kb
+
+
+# Function to run a planner on a problem.
+# planner_args: Additional planner arguments (e.g. ['-a', 'wastar'])
+# Returns the result, a dictionary with the FIELDS values
+def run_problem(problem, time_limit, planner_args, directory):
+    planner_dir, script, args = PLANNERS[problem.planner]
+    command = [sys.executable, '-W', 'ignore', script] + args + planner_args + \
+              ['-i', strip_comments(problem.initial_file, directory),
+               '-g', strip_comments(problem.goal_file, directory)]
+
+    with tempfile.TemporaryFile('w+') as output:
+        start_time = time.time()
+        process = subprocess.Popen(command, cwd=os.path.join(ROOT_DIR, planner_dir), stdout=output,
+                                   stderr=subprocess.STDOUT, universal_newlines=True)
+        returncode, peak_kb = wait_for_process(process, time_limit)
+        elapsed = time.time() - start_time
+        output.seek(0)
+        lines = output.read().splitlines()
+
+    result = dict.fromkeys(FIELDS)
+    result.update(suite=problem.suite, problem=problem.name, planner=problem.planner, seconds=round(elapsed, 3),
+                  peak_kb=peak_kb)
+    for line in lines:
+        if line.startswith('Nodes Expanded - '):
+            result['nodes'] = int(line.split(' - ')[1])
+        elif line.startswith('Processing Time - '):
+            result['search_seconds'] = round(float(line.split(' - ')[1]), 3)
+        elif line.startswith('First Command Time - '):
+            result['first_command_seconds'] = round(float(line.split(' - ')[1]), 3)
+
+    # The planners print one command per line, PA1 prints 'No solution found' when the search fails
+    if returncode is None:
+        result['status'] = 'timeout'
+    elif returncode != 0 or result['nodes'] is None or 'No solution found' in lines:
+        result['status'] = 'failed'
+    else:
+        result['status'] = 'solved'
+        result['plan_length'] = sum(1 for line in lines if line.startswith('('))
+    return result
+
+
+# Function to run all problems, 'jobs' problems at a time.
+# Runs that share the machine slow each other down, use jobs=1 for the baseline timings.
+# Returns the results in the same order as the problems
+def run_problems(problems, time_limit, planner_args, jobs):
+    directory = tempfile.mkdtemp(prefix='bench')
+    try:
+        with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+            futures = [executor.submit(run_problem, problem, time_limit, planner_args.get(problem.planner, []),
+                                       directory)
+                       for problem in problems]
+            results = []
+            for future in futures:
+                result = future.result()
+                print_result(result)
+                results.append(result)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+# Function to print a result line, the header is printed when result is None
+def print_result(result):
+    if result is None:
+        print("{:<20} {:<8} {:>10} {:>10} {:>10} {:>10}".format('problem', 'status', 'seconds', 'nodes',
+                                                              'peak KB', 'plan'))
+        return
+
+    def text(value, spec):
+        return '-' if value is None else spec.format(value)
+
+    print("{:<20} {:<8} {:>10} {:>10} {:>10} {:>10}".format(result['suite'] + '/' + result['problem'],
+                                                            result['status'],
+                                                            text(result['seconds'], '{:.3f}'),
+                                                            text(result['nodes'], '{}'),
+                                                            text(result['peak_kb'], '{:.0f}'),
+                                                            text(result['plan_length'], '{}')))
+    sys.stdout.flush()
+
+
+# Function to compare the results with the baseline results.
+# Returns a list of (problem key, description) for every regression
+def find_regressions(results, baseline, tolerance):
+    baseline = {result['suite'] + '/' + result['problem']: result for result in baseline}
+    regressions = []
+    for result in results:
+        key = result['suite'] + '/' + result['problem']
+        base = baseline.get(key)
+        if base is None or base['status'] != 'solved':
+            continue
+        if result['status'] != 'solved':
+            regressions.append((key, "{} (was solved)".format(result['status'])))
+            continue
+        if result['plan_length'] > base['plan_length']:
+            regressions.append((key, "plan length {} (was {})".format(result['plan_length'], base['plan_length'])))
+        if base['nodes'] and result['nodes'] > tolerance * base['nodes']:
+            regressions.append((key, "nodes {} (was {})".format(result['nodes'], base['nodes'])))
+        if result['seconds'] > tolerance * base['seconds'] and result['seconds'] - base['seconds'] > MIN_SECONDS:
+            regressions.append((key, "seconds {:.3f} (was {:.3f})".format(result['seconds'], base['seconds'])))
+        if base['peak_kb'] and result['peak_kb'] and result['peak_kb'] > tolerance * base['peak_kb']:
+            regressions.append((key, "peak KB {:.0f} (was {:.0f})".format(result['peak_kb'], base['peak_kb'])))
+    return regressions
+
+
+# Function to write the results to a JSON file
+def write_json(file_name, results, settings):
+    with open(file_name, 'w') as f:
+        json.dump({'settings': settings, 'results': results}, f, indent=2)
+        f.write('\n')
+
+
+# Function to write the results to a CSV file, one row per run
+def write_csv(file_name, results):
+    with open(file_name, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+# Function to find the shared modules (see SHARED_MODULES) whose PA1 and PA2 copies differ
+def find_different_shared_modules():
+    different = []
+    for name in SHARED_MODULES:
+        copies = []
+        for planner in sorted(PLANNERS):
+            with open(os.path.join(ROOT_DIR, PLANNERS[planner][0], name), 'rb') as f:
+                copies.append(f.read().replace(b'\r\n', b'\n'))
+        if any(copy != copies[0] for copy in copies):
+            different.append(name)
+    return different
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='CS540: Benchmark the PA1 and PA2 planners on the example problems')
+    parser.add_argument('-s', '--suite', help='Problem suite, can be given more than once (default: all suites)',
+                        choices=sorted(SUITES), action='append')
+    parser.add_argument('-p', '--pattern', help="Only run the problems matching this pattern, e.g. 'PA2/s*'",
+                        default='*')
+    parser.add_argument('-l', '--time_limit', help='Time limit in seconds for each run', type=float, default=60.0)
+    parser.add_argument('-j', '--jobs', help='Number of runs at the same time (1 gives the most stable timings)',
+                        type=int, default=1)
+    parser.add_argument('--pa1_args', help="Additional PA1 planner arguments, e.g. --pa1_args='-a wastar'",
+                        default='')
+    parser.add_argument('--pa2_args', help="Additional PA2 planner arguments, e.g. --pa2_args='-a wastar'",
+                        default='')
+    parser.add_argument('-o', '--json', help='JSON results file', default=DEFAULT_RESULTS)
+    parser.add_argument('-c', '--csv', help='CSV results file (not written by default)')
+    parser.add_argument('-b', '--baseline', help='Baseline results file (a JSON results file)',
+                        default=DEFAULT_BASELINE)
+    parser.add_argument('-t', '--tolerance', help='A time, nodes or memory value more than this many times the '
+                                                  'baseline value is a regression', type=float,
+                        default=DEFAULT_TOLERANCE)
+    parser.add_argument('-u', '--update_baseline', help='Write the results to the baseline file', action='store_true')
+    args = parser.parse_args()
+
+    problems = [problem for suite in (args.suite or sorted(SUITES)) for problem in find_problems(suite)
+                if fnmatch.fnmatch(problem.get_key(), args.pattern)]
+    if not problems:
+        print("ERROR - No problems match the pattern({})".format(args.pattern))
+        exit(1)
+
+    # A fix made to only one copy of a shared module would make the planners behave differently
+    different = find_different_shared_modules()
+    for name in different:
+        print("ERROR - The PA1 and PA2 copies of the shared module({}) are different".format(name))
+    if different:
+        exit(1)
+
+    planner_args = {'PA1': shlex.split(args.pa1_args), 'PA2': shlex.split(args.pa2_args)}
+    settings = {'time_limit': args.time_limit, 'jobs': args.jobs, 'pa1_args': args.pa1_args,
+                'pa2_args': args.pa2_args, 'python': sys.version.split()[0]}
+
+    print_result(None)
+    results = run_problems(problems, args.time_limit, planner_args, args.jobs)
+    write_json(args.json, results, settings)
+    if args.csv:
+        write_csv(args.csv, results)
+
+    if args.update_baseline:
+        write_json(args.baseline, results, settings)
+        print("Baseline updated - {}".format(args.baseline))
+        exit(0)
+
+    if not os.path.isfile(args.baseline):
+        print("No baseline - {}, use --update_baseline to create it".format(args.baseline))
+        exit(0)
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline['results'], args.tolerance)
+    for key, description in regressions:
+        print("REGRESSION - {}: {}".format(key, description))
+    if regressions:
+        exit(1)
+    print("No regressions against the baseline - {}".format(args.baseline))
@@ -1,4 +1,5 @@
 from PathPlanner.Block import Block
+from PathPlanner.Zobrist import getKey
 import copy
 
 class State:
@@ -6,6 +7,7 @@ class State:
 		self.blocks = {}			# key: block ID; value: block
 		self.relations = set()
 		self.xyzIdx = {}
+		self.fingerprint = 0		# Zobrist hash of the block locations, properties and grabbed blocks
 		
 	def __str__(self):
 		out = ""
@@ -14,22 +16,13 @@ class State:
 		return out
 		
 	def __hash__(self):
-		l = []
-		for id in sorted(list(self.blocks.keys())):
-			block = self.blocks[id]
-			l.append(id)
-			l.extend(frozenset(block.properties.items()))
-			l.append(block.x)
-			l.append(block.y)
-			l.append(block.z)
-			l.append(block.isGrabbed())
-		return hash(frozenset(l))
+		return self.fingerprint
 		
 	def __lt__(self, other):
 		return len(self.relations) < len(other.relations)
 		
 	def __eq__(self, other):
-		return self.relations == other.relations
+		return self.fingerprint == other.fingerprint and self.relations == other.relations
 		
 	def add(self, blockid):
 		"""
@@ -42,7 +35,9 @@ class State:
 			None
 		"""
 		if blockid not in self.blocks:
-			self.blocks[blockid] = Block(blockid)
+			block = Block(blockid)
+			self.blocks[blockid] = block
+			self.fingerprint ^= getKey(blockid, "at", (block.x, block.y, block.z))
 			
 	def spaceIsLegal(self, x,y,z,b):
 		"""
@@ -125,7 +120,9 @@ class State:
 		"""
 		block = self.blocks[blockid]
 		self.xyzIdx.pop((block.x, block.y, block.z), None)
+		self.fingerprint ^= getKey(blockid, "at", (block.x, block.y, block.z))
 		block.setLocation(x,y,z)
+		self.fingerprint ^= getKey(blockid, "at", (block.x, block.y, block.z))
 		self.xyzIdx[(block.x, block.y, block.z)] = block
 		#self.removeBlockRelations(blockid)
 		#self.inferBlockRelations(blockid)
@@ -144,7 +141,11 @@ class State:
 		Returns:
 			None
 		"""
-		self.blocks[blockid].setProperty(prop,val)
+		block = self.blocks[blockid]
+		if prop in block.properties:
+			self.fingerprint ^= getKey(blockid, "has", prop, block.properties[prop])
+		block.setProperty(prop,val)
+		self.fingerprint ^= getKey(blockid, "has", prop, val)
 		self.relations.add(blockid+" has "+prop+" "+val)
 		
 	def removeBlockRelations(self, b):
@@ -482,6 +483,8 @@ class State:
 		"""
 		b = self.blocks[b]
 		self.relations.add(b.id+" grabbed")
+		if not b.isGrabbed():
+			self.fingerprint ^= getKey(b.id, "grabbed")
 		b.grab()
 		
 	def drop(self, b):
@@ -496,6 +499,8 @@ class State:
 		"""
 		b = self.blocks[b]
 		self.relations.remove(b.id+" grabbed")
+		if b.isGrabbed():
+			self.fingerprint ^= getKey(b.id, "grabbed")
 		b.drop()
 		
 	def isGrabbed(self, b):
@@ -0,0 +1,24 @@
+import hashlib
+
+KEY_BITS = 64		# Number of bits of a key
+keys = {}			# key: item; value: key of the item
+
+def getKey(*item):
+	"""
+	Gets the Zobrist key of a single item of a state, e.g. getKey("block1", "at", (1,2,0))
+	The fingerprint of a state is the XOR of the keys of its items, so when an item changes
+	the fingerprint is updated by XORing out the old key and XORing in the new one.
+	The keys are derived from the items themselves, so every state gets the same keys
+	
+	Args:
+		param1: The parts of the item
+		
+	Returns:
+		A 64 bit integer key
+	"""
+	key = keys.get(item)
+	if key is None:
+		digest = hashlib.blake2b(repr(item).encode(), digest_size=KEY_BITS // 8).digest()
+		key = int.from_bytes(digest, 'little')
+		keys[item] = key
+	return key